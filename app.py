@@ -3,461 +3,449 @@ BIST Swing Trader - Emre'nin Kişisel Borsa Uygulaması
 Teknik + Temel Analiz ile En İyi 5 Hisseyi Puanlar
 """
 
-import streamlit as st
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import plotly.express as px
+import time
 import warnings
+from dataclasses import asdict
+
+import streamlit as st
+
+# pandas/numpy/plotly/yfinance ve tarama hattı yalnızca tarama veya grafik gerektiğinde
+# import edilir; boş karşılama sayfası bunları yüklemez.
+from metrics import NULL_METRICS, ScanMetrics
+from results import DEFAULT_CONFIG, RELATIVE_CONFIG, Criteria, ScoreConfig
+from scanner import scan_universe, DEFAULT_WORKERS, DEFAULT_TIMEOUT
+from shared_cache import shared_cache
+from snapshot import (Snapshot, format_age, latest_shared_id, latest_snapshot_path, load_shared_metrics,
+                      load_shared_snapshot, load_snapshot, publish_snapshot)
+from universe import BIST100_TICKERS, prefilter
 warnings.filterwarnings("ignore")
 
+LIVE_REFRESH_SECONDS = 60   # Canlı modda sıralamanın yenilenme aralığı
+
 # ─────────────────────────────────────────────
-# BIST 100 HİSSE LİSTESİ
+# SABİT HTML / CSS
 # ─────────────────────────────────────────────
-BIST100_TICKERS = [
-    "ACSEL","ADEL","ADNAC","AKBNK","AKCNS","AKFGY","AKFYE","AKSA","AKSEN","AKSGY",
-    "AKTAE","ALARK","ALBRK","ALFAS","ALGYO","ALKIM","ALKLC","ANELE","ANHYT","ARCLK",
-    "ARDYZ","ASELS","ASGYO","ASTOR","ATAKP","ATATP","AYDEM","AYGAZ","BAGFS","BANVT",
-    "BERA","BIENY","BIMAS","BIZIM","BJKAS","BKENT","BRISA","BRYAT","BSOKE","BTCIM",
-    "BUCIM","CANTE","CCOLA","CEMTS","CIMSA","CLEBI","CWENE","DESA","DOHOL","DYOBY",
-    "ECILC","EGEEN","EGERB","EKGYO","ENERU","ENJSA","ENKAI","EREGL","ESCOM","EUPWR",
-    "EUREN","FENER","FLAP","FMIZP","FROTO","GARAN","GENIL","GESAN","GLYHO","GOLTS",
-    "GUBRF","GWIND","HALKB","HATEK","HEKTS","HLGYO","HRKET","HTTBT","HUNER","ICBCT",
-    "IHLGM","IHLAS","ISGSY","ISCTR","ISKUR","ISMEN","ISYAT","IZFAS","IZMDC","JANTS",
-    "KAPLM","KAREL","KARSN","KATMR","KCAER","KCHOL","KENT","KLNMA","KMPUR","KNFRT",
-    "KONYA","KORDS","KOZAA","KOZAL","KRDMD","KRGYO","KRONT","KSTUR","KTLEV","KUTPO",
-    "LOGO","LKMNH","MAALT","MAVI","MEPET","MGROS","MIATK","MIPAZ","MPARK","NETAS",
-    "NTHOL","NTTUR","NUGYO","NUHCM","ODAS","ONCSM","ORCAY","OTKAR","OYAKC","OYLUM",
-    "OZGYO","OZKGY","PAPIL","PARSN","PCILT","PEKGY","PENGD","PETKM","PGSUS","PINSU",
-    "PKENT","POLHO","PRKAB","PRKME","PTOFS","RAYSG","RODRG","ROYAL","RTALB","RYSAS",
-    "SAHOL","SASA","SELEC","SELGD","SISE","SKBNK","SMART","SMRTG","SNPAM","SOKM",
-    "SUMAS","SUNTK","SUPRS","TAVHL","TBMAN","TCELL","TGSAS","THYAO","TKFEN","TKNSA",
-    "TOASO","TRGYO","TRILC","TSKB","TTKOM","TTRAK","TUKAS","TUPRS","TURSG","ULUFA",
-    "ULUSE","UNCRD","UYUM","VAKBN","VAKFN","VERUS","VESBE","VESTL","VKGYO","VRGYO",
-    "YKBNK","YATAS","YEOTK","YKSLN","YUNSA","ZOREN","ZRGYO"
-]
+
+APP_CSS = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=DM+Sans:wght@400;500;700&display=swap');
+
+:root {
+    --bg: #0a0e1a;
+    --card: #111827;
+    --border: #1f2937;
+    --accent: #00d4aa;
+    --accent2: #f59e0b;
+    --red: #ef4444;
+    --text: #e5e7eb;
+    --muted: #6b7280;
+}
+
+.stApp { background: var(--bg); color: var(--text); font-family: 'DM Sans', sans-serif; }
+
+.main-title {
+    font-family: 'Space Mono', monospace;
+    font-size: 2.2rem;
+    font-weight: 700;
+    background: linear-gradient(135deg, #00d4aa, #f59e0b);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    margin-bottom: 0;
+}
+.subtitle { color: var(--muted); font-size: 0.9rem; margin-bottom: 2rem; }
+
+.score-card {
+    background: var(--card);
+    border: 1px solid var(--border);
+    border-radius: 12px;
+    padding: 1.2rem;
+    margin-bottom: 0.8rem;
+    transition: border-color 0.2s;
+}
+.score-card:hover { border-color: var(--accent); }
+
+.ticker-name {
+    font-family: 'Space Mono', monospace;
+    font-size: 1.1rem;
+    font-weight: 700;
+    color: var(--accent);
+}
+.company-name { color: var(--muted); font-size: 0.8rem; }
+
+.score-badge {
+    font-family: 'Space Mono', monospace;
+    font-size: 1.4rem;
+    font-weight: 700;
+}
+.score-high  { color: #00d4aa; }
+.score-mid   { color: #f59e0b; }
+.score-low   { color: #ef4444; }
+
+.progress-bar {
+    background: var(--border);
+    border-radius: 99px;
+    height: 6px;
+    margin-top: 4px;
+}
+.progress-fill {
+    border-radius: 99px;
+    height: 6px;
+    background: linear-gradient(90deg, #00d4aa, #f59e0b);
+}
+
+.tag {
+    display: inline-block;
+    background: #1f2937;
+    color: var(--muted);
+    border-radius: 6px;
+    padding: 2px 8px;
+    font-size: 0.75rem;
+    margin-right: 4px;
+}
+.tag-green { color: #00d4aa; background: #00d4aa15; }
+.tag-red   { color: #ef4444; background: #ef444415; }
+
+[data-testid="stSidebar"] { background: var(--card); border-right: 1px solid var(--border); }
+.stButton>button {
+    background: linear-gradient(135deg, #00d4aa22, #00d4aa44);
+    border: 1px solid var(--accent);
+    color: var(--accent);
+    font-family: 'Space Mono', monospace;
+    border-radius: 8px;
+    width: 100%;
+    padding: 0.6rem;
+    font-weight: 700;
+    letter-spacing: 1px;
+    transition: all 0.2s;
+}
+.stButton>button:hover { background: var(--accent); color: #000; }
+
+.metric-row {
+    display: flex;
+    gap: 1rem;
+    margin-top: 0.5rem;
+}
+.metric-item { text-align: center; }
+.metric-val { font-family: 'Space Mono', monospace; font-size: 0.95rem; font-weight: 700; }
+.metric-lbl { color: var(--muted); font-size: 0.7rem; }
+
+.detail-row {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    padding: 4px 0;
+    border-bottom: 1px solid var(--border);
+    font-size: 0.82rem;
+}
+.check-yes { color: #00d4aa; }
+.check-no  { color: #ef4444; }
+
+.stSelectbox label, .stSlider label, .stMultiSelect label {
+    color: var(--muted) !important; font-size: 0.8rem;
+}
+.landing {
+    display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;
+}
+</style>
+"""
+
+LANDING_HTML = """
+<div class='landing'>
+    <div class='score-card' style='text-align:center; padding: 2rem'>
+        <div style='font-size:2.5rem'>🔍</div>
+        <div style='font-family: Space Mono, monospace; color:#00d4aa; margin-top:0.5rem'>Sol menüden</div>
+        <div style='color:#6b7280; font-size:0.85rem'>tarama başlat</div>
+    </div>
+    <div class='score-card' style='text-align:center; padding: 2rem'>
+        <div style='font-size:2.5rem'>📊</div>
+        <div style='font-family: Space Mono, monospace; color:#f59e0b; margin-top:0.5rem'>100 puanlık</div>
+        <div style='color:#6b7280; font-size:0.85rem'>skorlama sistemi</div>
+    </div>
+    <div class='score-card' style='text-align:center; padding: 2rem'>
+        <div style='font-size:2.5rem'>🎯</div>
+        <div style='font-family: Space Mono, monospace; color:#00d4aa; margin-top:0.5rem'>En iyi 5 hisse</div>
+        <div style='color:#6b7280; font-size:0.85rem'>swing için seçilir</div>
+    </div>
+</div>"""
 
 # ─────────────────────────────────────────────
 # VERİ ÇEKME FONKSİYONLARI
 # ─────────────────────────────────────────────
 
-@st.cache_data(ttl=3600)
-def get_price_data(ticker: str, period: str = "1y") -> pd.DataFrame:
-    """Fiyat verisi çeker."""
-    try:
-        t = ticker if ticker.endswith(".IS") else ticker + ".IS"
-        df = yf.download(t, period=period, progress=False, auto_adjust=True)
-        if df.empty or len(df) < 60:
-            return pd.DataFrame()
-        # MultiIndex düzeltmesi
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        return df
-    except Exception:
-        return pd.DataFrame()
+@st.cache_resource
+def get_price_store() -> "PriceStore":
+    """Disk üzerindeki fiyat deposu (süreç başına tek örnek)."""
+    from price_store import PriceStore
+    return PriceStore()
+
+def fetch_price_data(ticker: str, period: str = "1y") -> "pd.DataFrame":
+    import pandas as pd
+    from data_sources import load_price_frames
+    frames = load_price_frames([ticker], period=period, store=get_price_store())
+    return frames.get(ticker, pd.DataFrame())
 
 @st.cache_data(ttl=3600)
-def get_fundamental_data(ticker: str) -> dict:
-    """Temel analiz verisini çeker."""
-    try:
-        t = ticker if ticker.endswith(".IS") else ticker + ".IS"
-        info = yf.Ticker(t).info
-        return {
-            "pb": info.get("priceToBook", None),
-            "pe": info.get("trailingPE", None),
-            "market_cap": info.get("marketCap", None),
-            "sector": info.get("sector", "Bilinmiyor"),
-            "name": info.get("longName", ticker)
-        }
-    except Exception:
-        return {"pb": None, "pe": None, "market_cap": None, "sector": "Bilinmiyor", "name": ticker}
+def _local_price_data(ticker: str, period: str) -> "pd.DataFrame":
+    return fetch_price_data(ticker, period)
 
-# ─────────────────────────────────────────────
-# TEKNİK İNDİKATÖRLER
-# ─────────────────────────────────────────────
+def get_price_data(ticker: str, period: str = "1y") -> "pd.DataFrame":
+    """
+    Tek hisse için fiyat verisi çeker. BIST_CACHE_BACKEND tanımlıysa tüm kopyalar ortak
+    önbelleği kullanır (aynı hisse için tek indirme), değilse süreç içi st.cache_data.
+    """
+    cache = shared_cache()
+    if cache is None:
+        return _local_price_data(ticker, period)
+
+    import pandas as pd
+    from shared_cache import PRICE_TTL, decode_frame, encode_frame
+    df = cache.get_or_load(f"prices:{ticker}:{period}", lambda: fetch_price_data(ticker, period),
+                           PRICE_TTL, encode=encode_frame, decode=decode_frame, keep=lambda df: not df.empty)
+    return df if df is not None else pd.DataFrame()
+
+@st.cache_resource
+def get_fundamentals_cache() -> "FundamentalsCache":
+    """Disk üzerindeki temel veri önbelleği (süreç başına tek örnek)."""
+    from fundamentals import FundamentalsCache
+    return FundamentalsCache()
+
+def get_fundamental_data(ticker: str, metrics: ScanMetrics = NULL_METRICS) -> dict:
+    """
+    Temel analiz verisini çeker (alan bazlı TTL ile disk önbelleğinden).
+    Paylaşılan önbellek tanımlıysa önce ona bakılır; boş kayıtlar paylaşılmaz.
+    """
+    from data_sources import default_source
 
-def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """EMA, RSI, MACD, ATR hesaplar."""
-    df = df.copy()
-    close = df["Close"]
-
-    # EMA
-    df["EMA50"]  = close.ewm(span=50, adjust=False).mean()
-    df["EMA200"] = close.ewm(span=200, adjust=False).mean()
-
-    # RSI
-    delta = close.diff()
-    gain  = delta.clip(lower=0).rolling(14).mean()
-    loss  = (-delta.clip(upper=0)).rolling(14).mean()
-    rs    = gain / loss.replace(0, np.nan)
-    df["RSI"] = 100 - (100 / (1 + rs))
-
-    # MACD
-    ema12 = close.ewm(span=12, adjust=False).mean()
-    ema26 = close.ewm(span=26, adjust=False).mean()
-    df["MACD"]        = ema12 - ema26
-    df["MACD_Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
-    df["MACD_Hist"]   = df["MACD"] - df["MACD_Signal"]
-
-    # ATR
-    high, low = df["High"], df["Low"]
-    tr = pd.concat([high - low,
-                    (high - close.shift()).abs(),
-                    (low  - close.shift()).abs()], axis=1).max(axis=1)
-    df["ATR"] = tr.rolling(14).mean()
-
-    # Hacim ortalaması
-    df["Vol_MA5"] = df["Volume"].rolling(5).mean()
-
-    return df
+    def load() -> dict:
+        return get_fundamentals_cache().get(ticker, default_source().fetch_fundamentals, metrics)
 
-# ─────────────────────────────────────────────
-# PUANLAMA SİSTEMİ (100 PUAN)
-# ─────────────────────────────────────────────
+    cache = shared_cache()
+    if cache is None:
+        return load()
+
+    from shared_cache import FUNDAMENTALS_TTL
+    return cache.get_or_load(f"fundamentals:{ticker}", load, FUNDAMENTALS_TTL, metrics=metrics,
+                             keep=lambda f: any(f.get(k) is not None for k in ("pb", "pe", "market_cap")))
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_snapshot(path: str, mtime: float) -> Snapshot | None:
+    return load_snapshot(path)
 
-def score_ticker(ticker: str) -> dict | None:
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_shared_snapshot(snapshot_id: str) -> Snapshot | None:
+    return load_shared_snapshot(shared_cache(), snapshot_id)
+
+def get_latest_snapshot() -> Snapshot | None:
     """
-    Teknik (60p) + Temel (40p) = 100p
+    En yeni snapshot (değişmedikçe yeniden okunmaz). Paylaşılan önbellek tanımlıysa
+    herhangi bir kopyanın yayımladığı snapshot, değilse diskteki kullanılır.
     """
-    df = get_price_data(ticker)
-    if df.empty:
+    cache = shared_cache()
+    if cache is not None:
+        snapshot_id = latest_shared_id(cache)
+        if snapshot_id is not None:
+            return _load_shared_snapshot(snapshot_id)
+
+    path = latest_snapshot_path()
+    if path is None:
         return None
+    return _load_snapshot(str(path), path.stat().st_mtime)
 
-    df = calculate_indicators(df)
-    last = df.iloc[-1]
-    prev = df.iloc[-2] if len(df) > 1 else last
-
-    score  = 0
-    detail = {}
-
-    # ── TEKNİK (60p) ──────────────────────────
-    # 1. Golden Cross bölgesi: EMA50 > EMA200 (15p)
-    ema_cross = bool(last["EMA50"] > last["EMA200"])
-    pts = 15 if ema_cross else 0
-    score += pts
-    detail["EMA Golden Cross"] = (pts, 15, ema_cross)
-
-    # 2. Fiyat her iki EMA'nın üzerinde (10p)
-    price_above = bool(last["Close"] > last["EMA50"] and last["Close"] > last["EMA200"])
-    pts = 10 if price_above else 0
-    score += pts
-    detail["Fiyat > EMA50/200"] = (pts, 10, price_above)
-
-    # 3. RSI 40-60 bandı (10p)
-    rsi_val = float(last["RSI"])
-    rsi_band = 40 <= rsi_val <= 65
-    pts = 10 if rsi_band else 0
-    score += pts
-    detail[f"RSI Bandı (şu an: {rsi_val:.1f})"] = (pts, 10, rsi_band)
-
-    # 4. RSI yukarı yönlü 40'ı kesti (15p) — momentum başlangıcı
-    rsi_cross = bool(float(prev["RSI"]) < 40 and rsi_val >= 40)
-    # Eğer son 5 barda kestiyse de puan ver
-    if not rsi_cross and len(df) >= 6:
-        window = df.iloc[-6:-1]["RSI"].values
-        for i in range(len(window)-1):
-            if window[i] < 40 <= window[i+1]:
-                rsi_cross = True
-                break
-    pts = 15 if rsi_cross else 0
-    score += pts
-    detail["RSI 40 Kesimi (Momentum)"] = (pts, 15, rsi_cross)
-
-    # 5. MACD histogram pozitife döndü (10p)
-    macd_turn = bool(float(last["MACD_Hist"]) > 0 and float(prev["MACD_Hist"]) <= 0)
-    if not macd_turn:
-        macd_turn = bool(float(last["MACD_Hist"]) > 0 and float(last["MACD"]) > float(last["MACD_Signal"]))
-    pts = 10 if macd_turn else 0
-    score += pts
-    detail["MACD Pozitif Dönüş"] = (pts, 10, macd_turn)
-
-    # ── TEMEL (40p) ───────────────────────────
-    fund = get_fundamental_data(ticker)
-
-    # 6. PD/DD < 1.5 (15p)
-    pb   = fund["pb"]
-    pb_ok = pb is not None and 0 < pb < 1.5
-    pts  = 15 if pb_ok else 0
-    score += pts
-    pb_str = f"{pb:.2f}" if pb else "N/A"
-    detail[f"PD/DD < 1.5 (şu an: {pb_str})"] = (pts, 15, pb_ok)
-
-    # 7. F/K < 15 (15p)
-    pe   = fund["pe"]
-    pe_ok = pe is not None and 0 < pe < 15
-    pts  = 15 if pe_ok else 0
-    score += pts
-    pe_str = f"{pe:.1f}" if pe else "N/A"
-    detail[f"F/K < 15 (şu an: {pe_str})"] = (pts, 15, pe_ok)
-
-    # 8. Piyasa değeri > 1 milyar TL (10p)
-    mc   = fund["market_cap"]
-    mc_ok = mc is not None and mc > 1_000_000_000
-    pts  = 10 if mc_ok else 0
-    score += pts
-    detail[f"Piyasa Değeri > 1B TL"] = (pts, 10, mc_ok)
-
-    return {
-        "ticker":     ticker,
-        "name":       fund["name"],
-        "sector":     fund["sector"],
-        "score":      score,
-        "score_pct":  round(score, 1),
-        "detail":     detail,
-        "last_price": float(last["Close"]),
-        "rsi":        round(rsi_val, 1),
-        "ema50":      float(last["EMA50"]),
-        "ema200":     float(last["EMA200"]),
-        "macd_hist":  float(last["MACD_Hist"]),
-        "pb":         pb,
-        "pe":         pe,
-        "df":         df
-    }
+def get_candidates() -> list[str]:
+    """
+    Likidite ön elemesini geçen hisseler, hacme göre sıralı: son snapshot'ı üreten taramanın
+    evreni (ön eleme TARA ile çalışır). Snapshot yoksa tüm liste - karşılama sayfası fiyat
+    deposunu açmaz, pandas/numpy yüklemez. "Taranacak hisse sayısı" en likit N hisseyi alır.
+    """
+    snapshot = get_latest_snapshot()
+    return list(snapshot.universe) if snapshot is not None else list(BIST100_TICKERS)
 
-# ─────────────────────────────────────────────
-# STREAMLIT ARAYÜZÜ
-# ─────────────────────────────────────────────
+def refresh_snapshot(max_workers: int, timeout: float, config: ScoreConfig = DEFAULT_CONFIG) -> Snapshot:
+    """Tüm evreni tarar, yeni snapshot'ı kaydeder."""
+    progress_bar = st.progress(0)
+    status_text  = st.empty()
 
-def main():
-    st.set_page_config(
-        page_title="BIST Swing Trader",
-        page_icon="📈",
-        layout="wide",
-        initial_sidebar_state="expanded"
+    status_text.markdown("<span style='color:#6b7280; font-size:0.8rem'>📥 Fiyat verileri indiriliyor...</span>",
+                         unsafe_allow_html=True)
+
+    def on_progress(done: int, total: int, ticker: str):
+        status_text.markdown(f"<span style='color:#6b7280; font-size:0.8rem'>🔍 {ticker} tamamlandı... ({done}/{total})</span>",
+                             unsafe_allow_html=True)
+        progress_bar.progress(done / total)
+
+    metrics  = ScanMetrics()
+    with metrics.timer("prefilter"):
+        universe = prefilter(list(BIST100_TICKERS), store=get_price_store(),
+                             fundamentals=get_fundamentals_cache(), metrics=metrics)
+    scanned = scan_universe(
+        universe, store=get_price_store(),
+        get_fundamentals=lambda t: get_fundamental_data(t, metrics), config=config,
+        max_workers=max_workers, timeout=timeout, on_progress=on_progress, metrics=metrics
     )
+    get_fundamentals_cache().flush()
 
-    # CSS
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&family=DM+Sans:wght@400;500;700&display=swap');
-    
-    :root {
-        --bg: #0a0e1a;
-        --card: #111827;
-        --border: #1f2937;
-        --accent: #00d4aa;
-        --accent2: #f59e0b;
-        --red: #ef4444;
-        --text: #e5e7eb;
-        --muted: #6b7280;
-    }
-
-    .stApp { background: var(--bg); color: var(--text); font-family: 'DM Sans', sans-serif; }
-    
-    .main-title {
-        font-family: 'Space Mono', monospace;
-        font-size: 2.2rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #00d4aa, #f59e0b);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 0;
-    }
-    .subtitle { color: var(--muted); font-size: 0.9rem; margin-bottom: 2rem; }
-
-    .score-card {
-        background: var(--card);
-        border: 1px solid var(--border);
-        border-radius: 12px;
-        padding: 1.2rem;
-        margin-bottom: 0.8rem;
-        transition: border-color 0.2s;
-    }
-    .score-card:hover { border-color: var(--accent); }
-
-    .ticker-name {
-        font-family: 'Space Mono', monospace;
-        font-size: 1.1rem;
-        font-weight: 700;
-        color: var(--accent);
-    }
-    .company-name { color: var(--muted); font-size: 0.8rem; }
-
-    .score-badge {
-        font-family: 'Space Mono', monospace;
-        font-size: 1.4rem;
-        font-weight: 700;
-    }
-    .score-high  { color: #00d4aa; }
-    .score-mid   { color: #f59e0b; }
-    .score-low   { color: #ef4444; }
-
-    .progress-bar {
-        background: var(--border);
-        border-radius: 99px;
-        height: 6px;
-        margin-top: 4px;
-    }
-    .progress-fill {
-        border-radius: 99px;
-        height: 6px;
-        background: linear-gradient(90deg, #00d4aa, #f59e0b);
-    }
-
-    .tag {
-        display: inline-block;
-        background: #1f2937;
-        color: var(--muted);
-        border-radius: 6px;
-        padding: 2px 8px;
-        font-size: 0.75rem;
-        margin-right: 4px;
-    }
-    .tag-green { color: #00d4aa; background: #00d4aa15; }
-    .tag-red   { color: #ef4444; background: #ef444415; }
-
-    [data-testid="stSidebar"] { background: var(--card); border-right: 1px solid var(--border); }
-    .stButton>button {
-        background: linear-gradient(135deg, #00d4aa22, #00d4aa44);
-        border: 1px solid var(--accent);
-        color: var(--accent);
-        font-family: 'Space Mono', monospace;
-        border-radius: 8px;
-        width: 100%;
-        padding: 0.6rem;
-        font-weight: 700;
-        letter-spacing: 1px;
-        transition: all 0.2s;
-    }
-    .stButton>button:hover { background: var(--accent); color: #000; }
-
-    .metric-row {
-        display: flex;
-        gap: 1rem;
-        margin-top: 0.5rem;
-    }
-    .metric-item { text-align: center; }
-    .metric-val { font-family: 'Space Mono', monospace; font-size: 0.95rem; font-weight: 700; }
-    .metric-lbl { color: var(--muted); font-size: 0.7rem; }
-
-    .detail-row {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 4px 0;
-        border-bottom: 1px solid var(--border);
-        font-size: 0.82rem;
-    }
-    .check-yes { color: #00d4aa; }
-    .check-no  { color: #ef4444; }
-
-    .stSelectbox label, .stSlider label, .stMultiSelect label {
-        color: var(--muted) !important; font-size: 0.8rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    snapshot = Snapshot(created_at=time.time(), universe=universe, results=scanned,
+                        config=asdict(config) if config != DEFAULT_CONFIG else None)
+    snapshot.save()
+    snapshot.save_metrics(metrics)
+    cache = shared_cache()
+    if cache is not None:
+        publish_snapshot(snapshot, cache, metrics)
 
-    # Başlık
-    st.markdown('<div class="main-title">📈 BIST SWING TRADER</div>', unsafe_allow_html=True)
-    st.markdown('<div class="subtitle">Teknik + Temel Analiz · 100 Puanlık Skorlama · En İyi 5 Hisse</div>', unsafe_allow_html=True)
+    progress_bar.empty()
+    status_text.empty()
+    return snapshot
 
-    # Sidebar
-    with st.sidebar:
-        st.markdown("### ⚙️ Ayarlar")
-        
-        num_stocks = st.slider("Taranacak hisse sayısı", 20, len(BIST100_TICKERS), 50,
-                               help="Fazla hisse = daha uzun süre")
-        top_n = st.slider("Gösterilecek en iyi hisse", 3, 10, 5)
+def load_chart_frame(ticker: str, bars: int) -> "pd.DataFrame":
+    """
+    Grafik verisi - snapshot'ı üreten taramanın depoya yazdığı fiyatlardan okunur
+    (hisse başına ağ isteği yok); depoda yoksa indirilir.
+    """
+    from data_sources import trim_period
+    from indicators import calculate_indicators
 
-        st.markdown("---")
-        st.markdown("### 🎯 Filtreler")
-        min_score = st.slider("Min. skor (%)", 0, 80, 30)
-        
-        st.markdown("---")
-        st.markdown("### 📊 Teknik Kriter Ağırlıkları")
-        st.caption("Puanlar kodda ayarlıdır. Güncel kriter özeti:")
-        st.markdown("""
-        <div style='font-size:0.75rem; color:#6b7280; line-height:1.8'>
-        • EMA Golden Cross: <b style='color:#00d4aa'>15p</b><br>
-        • Fiyat > EMA50/200: <b style='color:#00d4aa'>10p</b><br>
-        • RSI 40-65 Bandı: <b style='color:#00d4aa'>10p</b><br>
-        • RSI 40 Momentum Kesimi: <b style='color:#f59e0b'>15p</b><br>
-        • MACD Pozitif Dönüş: <b style='color:#00d4aa'>10p</b><br>
-        • PD/DD < 1.5: <b style='color:#f59e0b'>15p</b><br>
-        • F/K < 15: <b style='color:#f59e0b'>15p</b><br>
-        • Piyasa Değeri > 1B: <b style='color:#00d4aa'>10p</b>
-        </div>
-        """, unsafe_allow_html=True)
+    df = get_price_store().read(ticker)
+    df = trim_period(df, "1y") if len(df) else get_price_data(ticker)
+    if df.empty:
+        return df
+    return calculate_indicators(df)[["Close", "EMA50", "EMA200"]].tail(bars)
 
-        st.markdown("---")
-        scan_btn = st.button("🔍 TARA", use_container_width=True)
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_chart_figure(ticker: str, snapshot_id: str) -> dict | None:
+    """Seyreltilmiş mini grafik figürü; hisse ve snapshot başına bir kez kurulur."""
+    from charts import CHART_BARS, price_figure
 
-    # Ana içerik
-    if not scan_btn:
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown("""
-            <div class='score-card' style='text-align:center; padding: 2rem'>
-                <div style='font-size:2.5rem'>🔍</div>
-                <div style='font-family: Space Mono, monospace; color:#00d4aa; margin-top:0.5rem'>Sol menüden</div>
-                <div style='color:#6b7280; font-size:0.85rem'>tarama başlat</div>
-            </div>""", unsafe_allow_html=True)
-        with col2:
-            st.markdown("""
-            <div class='score-card' style='text-align:center; padding: 2rem'>
-                <div style='font-size:2.5rem'>📊</div>
-                <div style='font-family: Space Mono, monospace; color:#f59e0b; margin-top:0.5rem'>100 puanlık</div>
-                <div style='color:#6b7280; font-size:0.85rem'>skorlama sistemi</div>
-            </div>""", unsafe_allow_html=True)
-        with col3:
-            st.markdown("""
-            <div class='score-card' style='text-align:center; padding: 2rem'>
-                <div style='font-size:2.5rem'>🎯</div>
-                <div style='font-family: Space Mono, monospace; color:#00d4aa; margin-top:0.5rem'>En iyi 5 hisse</div>
-                <div style='color:#6b7280; font-size:0.85rem'>swing için seçilir</div>
-            </div>""", unsafe_allow_html=True)
-        return
+    # Gövde yalnızca ıskada ve çağıran oturumun script thread'inde çalışır; sayaç oturuma özel
+    st.session_state["chart_builds"] = st.session_state.get("chart_builds", 0) + 1
+    df = load_chart_frame(ticker, CHART_BARS)
+    return price_figure(df) if not df.empty else None
 
-    # Tarama
-    tickers_to_scan = BIST100_TICKERS[:num_stocks]
-    
-    progress_bar = st.progress(0)
-    status_text  = st.empty()
-    results      = []
+def get_live_session() -> "LiveSession":
+    """
+    Tarayıcı oturumuna özel canlı oturum ve bar kaynağı. İlk çağrıda günlük geçmiş
+    depodan okunup indikatör durumları kurulur; sonraki yenilemeler yalnızca yeni barları işler.
+    """
+    from data_sources import load_price_frames
+    from live import LiveSession, default_bar_source
+
+    if "live_session" not in st.session_state:
+        metrics = ScanMetrics()
+        with st.spinner("Canlı mod için geçmiş yükleniyor..."):
+            frames = load_price_frames(get_candidates(), store=get_price_store(), metrics=metrics)
+            st.session_state.live_session = LiveSession.from_frames(
+                frames, lambda t: get_fundamental_data(t, metrics), DEFAULT_CONFIG, metrics)
+        st.session_state.live_source = default_bar_source(metrics)
+    return st.session_state.live_session
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_screen_table(snapshot_id: str, _snapshot: Snapshot) -> "ScreenTable":
+    """Snapshot'ın indeksli sorgu tablosu (snapshot başına bir kez kurulur)."""
+    from screener import ScreenTable
+    return ScreenTable(_snapshot.results)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_risk_model(snapshot_id: str, _snapshot: Snapshot) -> "RiskModel":
+    """
+    Snapshot'taki tüm hisselerin getiri korelasyon/kovaryans matrisi (snapshot başına bir kez).
+    Fiyatlar önce yerel depodan okunur; depoda olmayanlar (snapshot'ı başka bir kopya
+    üretmişse) paylaşılan önbellekten, o da yoksa tek toplu indirmeyle alınır.
+    """
+    from data_sources import load_price_frames
+    from portfolio import RETURN_BARS, risk_model, store_frames
+
+    tickers = [r.ticker for r in _snapshot.results]
+    frames = store_frames(get_price_store(), tickers)
+    missing = [t for t in tickers if t not in frames]
+    if missing:
+        if shared_cache() is not None:
+            fetched = {t: get_price_data(t) for t in missing}
+        else:
+            fetched = load_price_frames(missing, store=get_price_store())
+        frames.update({t: df.tail(RETURN_BARS + 1) for t, df in fetched.items() if len(df) > 1})
+    return risk_model(frames)
 
-    for i, ticker in enumerate(tickers_to_scan):
-        status_text.markdown(f"<span style='color:#6b7280; font-size:0.8rem'>🔍 {ticker} taranıyor... ({i+1}/{len(tickers_to_scan)})</span>",
-                             unsafe_allow_html=True)
-        progress_bar.progress((i+1) / len(tickers_to_scan))
-        
-        result = score_ticker(ticker)
-        if result and result["score_pct"] >= min_score:
-            results.append(result)
+# ─────────────────────────────────────────────
+# STREAMLIT ARAYÜZÜ
+# ─────────────────────────────────────────────
 
-    progress_bar.empty()
-    status_text.empty()
+def criteria_summary_html(config: ScoreConfig) -> str:
+    """Kenar çubuğundaki kriter/ağırlık özeti."""
+    highlight = {Criteria.RSI_CROSS, Criteria.PB_LOW, Criteria.PE_LOW}
+    lines = []
+    for criterion, label in config.labels().items():
+        color = "#f59e0b" if criterion in highlight else "#00d4aa"
+        lines.append(f"• {label}: <b style='color:{color}'>{config.points[criterion]}p</b>")
+    return ("<div style='font-size:0.75rem; color:#6b7280; line-height:1.8'>"
+            + "<br>".join(lines) + "</div>")
+
+def query_builder(table: "ScreenTable", config: ScoreConfig) -> list:
+    """Kenar çubuğundaki sorgu oluşturucu; seçimleri Condition listesine çevirir."""
+    from screener import Condition, QueryError, parse_query
+
+    conditions = []
+    with st.sidebar.expander("🧮 Sorgu oluşturucu"):
+        sectors = st.multiselect("Sektör", table.values("sector"))
+        if sectors:
+            conditions.append(Condition("sector", "in", tuple(sectors)))
+        rsi_lo, rsi_hi = st.slider("RSI aralığı", 0, 100, (0, 100))
+        if (rsi_lo, rsi_hi) != (0, 100):
+            conditions.append(Condition("rsi", "in", (rsi_lo, rsi_hi)))
+        pb_max = st.number_input("PD/DD üst sınır (0 = yok)", 0.0, 50.0, 0.0, step=0.1)
+        if pb_max:
+            conditions.append(Condition("pb", "<", pb_max))
+        pe_max = st.number_input("F/K üst sınır (0 = yok)", 0.0, 200.0, 0.0, step=1.0)
+        if pe_max:
+            conditions.append(Condition("pe", "<", pe_max))
+        labels = config.labels()
+        required = st.multiselect("Sağlanan kriterler", list(labels), format_func=labels.get)
+        conditions += [Condition(c.name, "flag", True) for c in required]
+        text = st.text_input("Serbest sorgu", placeholder="rsi in 40..50, price > ema200, pb < 1",
+                             help="Virgülle ayrılmış koşullar; kriter adları (EMA_CROSS, !MACD_TURN) da kullanılabilir")
+        if text:
+            try:
+                conditions += parse_query(text)
+            except QueryError as exc:
+                st.error(str(exc))
+    return conditions
+
+def render_results(results: list, scanned: int, top_n: int, snapshot_id: str, metrics: ScanMetrics,
+                   config: ScoreConfig = DEFAULT_CONFIG):
+    """Özet metrikler, hisse kartları, özet tablo ve skor grafiği."""
+    import pandas as pd
+    from charts import score_figure
 
     if not results:
         st.warning("Kriterlere uyan hisse bulunamadı. Min. skoru düşürün.")
         return
 
-    results_sorted = sorted(results, key=lambda x: x["score_pct"], reverse=True)[:top_n]
+    results_sorted = results[:top_n]
 
     # Özet metrikler
     st.markdown("---")
     m1, m2, m3, m4 = st.columns(4)
-    m1.metric("Taranan Hisse",     len(tickers_to_scan))
+    m1.metric("Taranan Hisse",     scanned)
     m2.metric("Kritere Uyan",      len(results))
-    m3.metric("En Yüksek Skor",    f"{results_sorted[0]['score_pct']}%")
-    m4.metric("Ort. Skor",         f"{np.mean([r['score_pct'] for r in results_sorted]):.1f}%")
+    m3.metric("En Yüksek Skor",    f"{results_sorted[0].score_pct}%")
+    m4.metric("Ort. Skor",         f"{sum(r.score_pct for r in results_sorted) / len(results_sorted):.1f}%")
     st.markdown("---")
 
     # Üst 5 hisse kartları
     st.markdown(f"### 🏆 En İyi {top_n} Swing Adayı")
     
     for rank, res in enumerate(results_sorted):
-        s = res["score_pct"]
+        s = res.score_pct
         score_class = "score-high" if s >= 70 else ("score-mid" if s >= 50 else "score-low")
         medal = ["🥇","🥈","🥉","4️⃣","5️⃣","6️⃣","7️⃣","8️⃣","9️⃣","🔟"][rank]
         
-        with st.expander(f"{medal} **{res['ticker']}** — {res['name'][:40]}  |  Skor: **{s}%**", expanded=(rank < 3)):
+        # Açılış/kapanış rerun tetikler; kapalı kartların grafiği hiç kurulmaz
+        card = st.expander(f"{medal} **{res.ticker}** — {res.name[:40]}  |  Skor: **{s}%**",
+                           expanded=(rank < 3), key=f"card-{res.ticker}", on_change="rerun")
+        with card:
             col_left, col_right = st.columns([3,2])
             
             with col_left:
                 st.markdown("**Kriter Detayları**")
-                for crit, (earned, max_pts, ok) in res["detail"].items():
+                for crit, (earned, max_pts, ok) in res.details(config).items():
                     icon = "✅" if ok else "❌"
                     bar = f"<span style='color:#00d4aa'>{earned}/{max_pts}p</span>" if ok else f"<span style='color:#6b7280'>0/{max_pts}p</span>"
                     st.markdown(f"<div class='detail-row'><span>{icon} {crit}</span>{bar}</div>",
@@ -479,36 +467,27 @@ def main():
             with col_right:
                 st.markdown("**Anlık Değerler**")
                 vals = {
-                    "Fiyat (TL)": f"{res['last_price']:.2f}",
-                    "RSI":        f"{res['rsi']}",
-                    "EMA50":      f"{res['ema50']:.2f}",
-                    "EMA200":     f"{res['ema200']:.2f}",
-                    "PD/DD":      f"{res['pb']:.2f}" if res['pb'] else "N/A",
-                    "F/K":        f"{res['pe']:.1f}"  if res['pe'] else "N/A",
+                    "Fiyat (TL)": f"{res.last_price:.2f}",
+                    "RSI":        f"{res.rsi}",
+                    "EMA50":      f"{res.ema50:.2f}",
+                    "EMA200":     f"{res.ema200:.2f}",
+                    "PD/DD":      f"{res.pb:.2f}" if res.pb else "N/A",
+                    "F/K":        f"{res.pe:.1f}"  if res.pe else "N/A",
                 }
                 for k, v in vals.items():
                     st.markdown(f"<div class='detail-row'><span style='color:#6b7280'>{k}</span><span style='font-family:Space Mono,monospace'>{v}</span></div>",
                                unsafe_allow_html=True)
                 
                 # Mini fiyat grafiği
-                df_plot = res["df"].tail(60).copy()
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=df_plot.index, y=df_plot["Close"],
-                    line=dict(color="#00d4aa", width=1.5), name="Fiyat", showlegend=False))
-                fig.add_trace(go.Scatter(
-                    x=df_plot.index, y=df_plot["EMA50"],
-                    line=dict(color="#f59e0b", width=1, dash="dot"), name="EMA50", showlegend=False))
-                fig.add_trace(go.Scatter(
-                    x=df_plot.index, y=df_plot["EMA200"],
-                    line=dict(color="#ef4444", width=1, dash="dot"), name="EMA200", showlegend=False))
-                fig.update_layout(
-                    height=180, margin=dict(l=0,r=0,t=0,b=0),
-                    paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                    xaxis=dict(showgrid=False, showticklabels=False),
-                    yaxis=dict(showgrid=False, tickfont=dict(size=8, color="#6b7280"))
-                )
-                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+                if card.open:
+                    with metrics.timer("chart", res.ticker):
+                        before = st.session_state.get("chart_builds", 0)
+                        figure = get_chart_figure(res.ticker, snapshot_id)
+                        built = st.session_state.get("chart_builds", 0) != before
+                        metrics.count("cache_requests", cache="chart", result="miss" if built else "hit")
+                        if figure is not None:
+                            st.plotly_chart(figure, width="stretch",
+                                            config={"displayModeBar": False})
 
     # Karşılaştırma tablosu
     st.markdown("---")
@@ -517,42 +496,266 @@ def main():
     table_data = []
     for res in results_sorted:
         table_data.append({
-            "Hisse": res["ticker"],
-            "Şirket": res["name"][:30],
-            "Skor (%)": res["score_pct"],
-            "Fiyat (TL)": round(res["last_price"], 2),
-            "RSI": res["rsi"],
-            "EMA50": round(res["ema50"], 2),
-            "EMA200": round(res["ema200"], 2),
-            "PD/DD": round(res["pb"], 2) if res["pb"] else "N/A",
-            "F/K": round(res["pe"], 1) if res["pe"] else "N/A",
+            "Hisse": res.ticker,
+            "Şirket": res.name[:30],
+            "Skor (%)": res.score_pct,
+            "Fiyat (TL)": round(res.last_price, 2),
+            "RSI": res.rsi,
+            "EMA50": round(res.ema50, 2),
+            "EMA200": round(res.ema200, 2),
+            "PD/DD": round(res.pb, 2) if res.pb else "N/A",
+            "F/K": round(res.pe, 1) if res.pe else "N/A",
         })
     
-    df_table = pd.DataFrame(table_data)
-    st.dataframe(df_table, use_container_width=True, hide_index=True)
+    with metrics.timer("table"):
+        df_table = pd.DataFrame(table_data)
+        st.dataframe(df_table, width="stretch", hide_index=True)
     
     # Skor dağılım grafiği
     st.markdown("---")
     st.markdown("### 📊 Skor Dağılımı")
-    fig2 = px.bar(
-        df_table, x="Hisse", y="Skor (%)",
-        color="Skor (%)",
-        color_continuous_scale=["#ef4444","#f59e0b","#00d4aa"],
-        range_color=[0,100]
-    )
-    fig2.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-        font_color="#e5e7eb", height=300,
-        xaxis=dict(showgrid=False), yaxis=dict(showgrid=False, range=[0,100]),
-        coloraxis_showscale=False,
-        margin=dict(l=0,r=0,t=20,b=0)
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    with metrics.timer("score_chart"):
+        st.plotly_chart(score_figure([r.ticker for r in results_sorted],
+                                     [r.score_pct for r in results_sorted]),
+                        width="stretch")
 
     st.markdown("""
     <div style='text-align:center; color:#374151; font-size:0.75rem; margin-top:2rem; font-family: Space Mono, monospace;'>
     ⚠️ Bu uygulama yatırım tavsiyesi değildir. Karar vermek sana aittir.
     </div>""", unsafe_allow_html=True)
 
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live(tickers: list[str], top_n: int, min_score: float):
+    """
+    Canlı sıralama - yalnızca bu parça periyodik olarak yeniden çalışır (sayfanın geri kalanı
+    yeniden çizilmez). Seans kapalıysa yoklama yapılmaz, son sıralama gösterilir.
+    """
+    import pandas as pd
+    from live import ReplayBarSource, market_open
+
+    session = get_live_session()
+    source  = st.session_state.live_source
+    changed = set()
+    if market_open() or isinstance(source, ReplayBarSource):
+        changed = session.step(source)
+    else:
+        st.caption("🌙 Seans kapalı - son sıralama gösteriliyor.")
+
+    results = session.top(top_n, min_score=min_score, tickers=tickers)
+    if not results:
+        st.warning("Kriterlere uyan hisse bulunamadı. Min. skoru düşürün.")
+        return
+
+    updated = time.strftime("%H:%M:%S", time.localtime(session.updated_at)) if session.updated_at else "-"
+    st.markdown(f"### 🔴 Canlı İlk {top_n}")
+    st.caption(f"Son güncelleme: {updated} · yeniden puanlanan: {len(changed)} hisse "
+               f"· her {LIVE_REFRESH_SECONDS} sn")
+    st.dataframe(pd.DataFrame([{
+        "Hisse":      ("● " if res.ticker in changed else "") + res.ticker,
+        "Şirket":     res.name[:30],
+        "Skor (%)":   res.score_pct,
+        "Fiyat (TL)": round(res.last_price, 2),
+        "RSI":        res.rsi,
+        "MACD Hist":  round(res.macd_hist, 3),
+    } for res in results]), width="stretch", hide_index=True)
+
+def render_portfolio(results: list, model: "RiskModel", sizing: "SizingConfig", metrics: ScanMetrics):
+    """
+    Sıralamadan sonra pozisyon önerisi: ATR stopuna göre adet, korelasyon sınırını aşan
+    adaylar elenip sıradaki adayla değiştirilir. Sıralı listenin tamamı aday olabilir.
+    """
+    import pandas as pd
+    from portfolio import RETURN_BARS, portfolio_volatility, size_positions
+
+    if not results:
+        return
+    with metrics.timer("sizing"):
+        positions = size_positions(results, model, sizing)
+    taken = [p for p in positions if p.skipped is None]
+    uncovered = [p.ticker for p in positions if p.ticker not in model]
+
+    st.markdown("---")
+    st.markdown("### 🧮 Pozisyon Önerisi")
+    invested = sum(p.value for p in taken)
+    vol = portfolio_volatility(positions, model)
+    p1, p2, p3, p4 = st.columns(4)
+    p1.metric("Pozisyon",          f"{len(taken)}/{sizing.max_positions}")
+    p2.metric("Yatırılan (TL)",    f"{invested:,.0f}")
+    p3.metric("Toplam Risk (TL)",  f"{sum(p.risk for p in taken):,.0f}")
+    p4.metric("Yıllık Oynaklık",   f"%{vol * 100:.1f}" if vol is not None else "N/A")
+    if uncovered:
+        st.warning(f"{len(uncovered)} aday için getiri geçmişi bulunamadı, korelasyon sınırı "
+                   f"uygulanamadığından önerilmedi: {', '.join(uncovered)}")
+
+    st.dataframe(pd.DataFrame([{
+        "Hisse":       p.ticker,
+        "Skor (%)":    p.score,
+        "Fiyat (TL)":  round(p.price, 2),
+        "Stop (TL)":   p.stop,
+        "Adet":        p.shares,
+        "Tutar (TL)":  p.value,
+        "Ağırlık (%)": round(p.weight * 100, 1),
+        "Risk (TL)":   p.risk,
+        "Maks. ρ":     f"{p.max_corr:.2f} ({p.peer})" if p.max_corr is not None else "-",
+        "Durum":       p.skipped or "✅",
+    } for p in positions]), width="stretch", hide_index=True)
+    st.caption(f"Stop = fiyat - {sizing.stop_atr:g}×ATR · pozisyon başına risk "
+               f"%{sizing.risk_per_trade * 100:g} · seçilenlerle korelasyon ≤ {sizing.max_corr:g} "
+               f"· korelasyon son {RETURN_BARS} günlük getiriden")
+
+def render_diagnostics(snapshot: Snapshot, render_metrics: ScanMetrics):
+    """Son taramanın ve bu sayfa çiziminin ölçümleri; JSON/Prometheus olarak indirilebilir."""
+    import pandas as pd
+
+    from data_sources import default_source
+
+    data = snapshot.load_metrics()
+    if data is None and shared_cache() is not None:
+        data = load_shared_metrics(shared_cache(), snapshot.id)   # Başka bir kopyanın taraması
+    scan_metrics = ScanMetrics.from_dict(data) if data else ScanMetrics()
+    # Dayanıklı kaynağın süreç boyunca biriken sayaçları (yeniden deneme, devre kesici...)
+    source_metrics = getattr(default_source(), "metrics", ScanMetrics())
+    groups = (("tarama", scan_metrics), ("arayüz", render_metrics), ("kaynak", source_metrics))
+    with st.expander("🩺 Tanılama", expanded=True):
+        if data is None:
+            st.caption("Bu snapshot için tarama ölçümü yok (ölçümsüz üretilmiş olabilir).")
+
+        rows = []
+        for source, m in groups:
+            for stage, stat in m.stages.items():
+                rows.append({"Kaynak": source, "Aşama": stage, "Adet": stat.count,
+                             "Toplam (ms)": round(stat.total * 1000, 1),
+                             "Ort. (ms)": round(stat.mean * 1000, 2),
+                             "Maks. (ms)": round(stat.max * 1000, 1)})
+        st.markdown("**Aşama süreleri**")
+        st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
+
+        col_left, col_right = st.columns(2)
+        with col_left:
+            st.markdown("**Sayaçlar**")
+            counters = [
+                {"Kaynak": source, "Sayaç": c["name"],
+                 "Etiketler": ", ".join(f"{k}={v}" for k, v in c["labels"].items()), "Değer": c["value"]}
+                for source, m in groups
+                for c in m.to_dict()["counters"]
+            ]
+            st.dataframe(pd.DataFrame(counters), width="stretch", hide_index=True)
+        with col_right:
+            st.markdown("**En yavaş hisseler** (puanlama + temel veri)")
+            slow = [{"Hisse": t, "Süre (ms)": round(sec * 1000, 1)} for t, sec in scan_metrics.slowest(10)]
+            st.dataframe(pd.DataFrame(slow), width="stretch", hide_index=True)
+
+        d1, d2 = st.columns(2)
+        d1.download_button("⬇️ JSON", scan_metrics.to_json(indent=2),
+                           file_name=f"metrics-{snapshot.id}.json", mime="application/json")
+        d2.download_button("⬇️ Prometheus", scan_metrics.to_prometheus(),
+                           file_name=f"metrics-{snapshot.id}.prom", mime="text/plain")
+
+def main():
+    st.set_page_config(
+        page_title="BIST Swing Trader",
+        page_icon="📈",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # CSS ve karşılama kartları modül sabitidir; her rerun'da yeniden kurulmaz
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+
+    # Başlık
+    st.markdown('<div class="main-title">📈 BIST SWING TRADER</div>', unsafe_allow_html=True)
+    st.markdown('<div class="subtitle">Teknik + Temel Analiz · 100 Puanlık Skorlama · En İyi 5 Hisse</div>', unsafe_allow_html=True)
+
+    # Sidebar
+    with st.sidebar:
+        st.markdown("### ⚙️ Ayarlar")
+        
+        candidates = get_candidates()
+        if not candidates:
+            st.warning("Likidite ön elemesini geçen hisse yok. Eşikleri veya üyelik dosyasını kontrol edin.")
+            st.stop()
+        num_stocks = st.slider("Taranacak hisse sayısı", 1, max(len(candidates), 2), min(50, len(candidates)),
+                               help="Likidite ön elemesini geçen hisselerden en likit N tanesi")
+        st.caption(f"Ön elemede {len(BIST100_TICKERS) - len(candidates)}/{len(BIST100_TICKERS)} hisse "
+                   f"elendi (hacim/piyasa değeri eşiği; 7 günden eski veri elemez)")
+        top_n = st.slider("Gösterilecek en iyi hisse", 3, 10, 5)
+
+        st.markdown("---")
+        st.markdown("### 🎯 Filtreler")
+        min_score = st.slider("Min. skor (%)", 0, 80, 30)
+
+        with st.expander("⚡ Performans"):
+            max_workers  = st.slider("Paralel istek sayısı", 1, 32, DEFAULT_WORKERS)
+            scan_timeout = st.slider("Hisse başına zaman aşımı (sn)", 5, 120, int(DEFAULT_TIMEOUT))
+
+        with st.expander("🧮 Pozisyon boyutlama"):
+            capital    = st.number_input("Sermaye (TL)", 1_000, 100_000_000, 100_000, step=10_000)
+            risk_pct   = st.slider("İşlem başına risk (%)", 0.25, 5.0, 1.0, step=0.25)
+            stop_atr   = st.slider("Stop mesafesi (×ATR)", 0.5, 5.0, 2.0, step=0.5)
+            max_corr   = st.slider("Azami korelasyon", 0.0, 1.0, 0.7, step=0.05,
+                                   help="Seçilmiş bir pozisyonla korelasyonu bunu aşan aday elenir")
+            max_weight = st.slider("Pozisyon başına azami ağırlık (%)", 5, 100, 25, step=5)
+        
+        st.markdown("---")
+        st.markdown("### 📊 Teknik Kriter Ağırlıkları")
+        relative = st.toggle("Sektöre göre göreli puanlama", value=False,
+                             help="PD/DD, F/K ve piyasa değeri sektör içi yüzdeliğe göre, "
+                                  "göreli güç evren içi sıraya göre puanlanır (TARA ile uygulanır)")
+        scan_config = RELATIVE_CONFIG if relative else DEFAULT_CONFIG
+        st.caption("Puanlar ScoreConfig'ten okunur. Güncel kriter özeti:")
+        st.markdown(criteria_summary_html(scan_config), unsafe_allow_html=True)
+
+        st.markdown("---")
+        scan_btn = st.button("🔍 TARA", width="stretch",
+                             help="Tüm evreni yeniden puanlar; filtreler mevcut snapshot'ı dilimler")
+        snapshot_info = st.empty()
+        live_mode = st.toggle("🔴 Canlı mod", value=False,
+                              help="Seans sırasında gün içi barlarla sıralamayı yerinde günceller")
+        show_portfolio = st.toggle("🧮 Pozisyon önerisi", value=False,
+                                   help="İlk N aday için ATR stopu ve korelasyon sınırıyla pozisyon boyutları")
+        show_diagnostics = st.toggle("🩺 Tanılama paneli", value=False,
+                                     help="Aşama süreleri, önbellek isabetleri ve hata sayıları")
+
+    if live_mode:
+        render_live(candidates[:num_stocks], top_n, min_score)
+        return
+
+    snapshot = refresh_snapshot(max_workers, scan_timeout, scan_config) if scan_btn else get_latest_snapshot()
+
+    # Ana içerik
+    if snapshot is None:
+        st.markdown(LANDING_HTML, unsafe_allow_html=True)
+        return
+
+    age = f"🕒 Snapshot yaşı: {format_age(snapshot.age)}"
+    if snapshot.is_stale:
+        age += " · yenilemek için TARA"
+    snapshot_info.caption(age)
+
+    # Snapshot dilimleme - filtreler indeksli tablo üzerinde çalışır, yeniden tarama yok
+    from screener import Condition
+
+    tickers_to_scan = snapshot.universe[:num_stocks]   # TARA sonrası yeni evren
+    table = get_screen_table(snapshot.id, snapshot)
+    conditions = query_builder(table, snapshot.score_config) + [Condition("score", ">=", min_score)]
+
+    render_metrics = ScanMetrics()
+    with render_metrics.timer("query"):
+        results = table.query(conditions, tickers=tickers_to_scan)
+    with render_metrics.timer("render"):
+        render_results(results, len(tickers_to_scan), top_n, snapshot.id, render_metrics,
+                       snapshot.score_config)
+    if show_portfolio:
+        from portfolio import SizingConfig
+
+        sizing = SizingConfig(capital=capital, risk_per_trade=risk_pct / 100, stop_atr=stop_atr,
+                              max_corr=max_corr, max_weight=max_weight / 100, max_positions=top_n)
+        with render_metrics.timer("risk_model"):
+            model = get_risk_model(snapshot.id, snapshot)
+        render_portfolio(results, model, sizing, render_metrics)
+
+    if show_diagnostics:
+        render_diagnostics(snapshot, render_metrics)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,280 @@
+"""
+Vektörel geçmiş testi - 100 puanlık skorun teknik kısmını her tarih ve her hisse
+için boolean matrislerle hesaplar, en iyi N hisseye swing girişleri simüle eder.
+
+Kullanım:  python backtest.py --years 3 --top-n 5 --hold 10
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from indicators import build_panel, panel_arrays
+from results import DEFAULT_CONFIG, Criteria, ScoreConfig
+
+WARMUP_BARS = 200   # EMA200 oturana kadar sinyal üretilmez
+TRADING_DAYS = 252
+
+
+@dataclass
+class BacktestData:
+    """Hizalanmış fiyat ve indikatör matrisleri (tarih × hisse)."""
+    dates:   pd.DatetimeIndex
+    tickers: list[str]
+    open:    np.ndarray
+    high:    np.ndarray
+    low:     np.ndarray
+    close:   np.ndarray
+    ind:     dict[str, np.ndarray]
+    fund:    dict[str, np.ndarray] | None = None   # pb, pe, market_cap (hisse başına)
+
+
+@dataclass
+class BacktestResult:
+    trades: pd.DataFrame
+    equity: pd.Series
+    stats:  dict
+
+
+def prepare_data(frames: dict[str, pd.DataFrame], fundamentals: dict[str, dict] | None = None) -> BacktestData:
+    """Hisse DataFrame'lerinden panel kurar, indikatörleri tek geçişte hesaplar."""
+    panel = build_panel(frames)
+    close = panel["Close"]
+    opens = pd.DataFrame({t: df["Open"] for t, df in frames.items()}).reindex_like(close)
+    fund = None
+    if fundamentals is not None:
+        fund = {
+            key: np.array([_num(fundamentals.get(t, {}).get(key)) for t in close.columns])
+            for key in ("pb", "pe", "market_cap")
+        }
+    return BacktestData(
+        dates   = close.index,
+        tickers = list(close.columns),
+        open    = opens.to_numpy(dtype="f8"),
+        high    = panel["High"].to_numpy(dtype="f8"),
+        low     = panel["Low"].to_numpy(dtype="f8"),
+        close   = close.to_numpy(dtype="f8"),
+        ind     = panel_arrays(close, panel["High"], panel["Low"], panel["Volume"]),
+        fund    = fund,
+    )
+
+
+def _num(value) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def _shift(x: np.ndarray, n: int = 1) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    out[n:] = x[:-n]
+    return out
+
+
+def criteria_flags(data: BacktestData, config: ScoreConfig = DEFAULT_CONFIG) -> dict[Criteria, np.ndarray]:
+    """
+    score_ticker kurallarının tüm tarihler için boolean matrisleri (yalnızca eşikler kullanılır).
+    Panelde boşluk olan hisselerde "önceki bar" bir önceki takvim satırıdır.
+    """
+    c, ind = data.close, data.ind
+    rsi, prev_rsi = ind["RSI"], _shift(ind["RSI"])
+    hist, prev_hist = ind["MACD_Hist"], _shift(ind["MACD_Hist"])
+
+    with np.errstate(invalid="ignore"):
+        level = config.rsi_cross_level
+        cross = (prev_rsi < level) & (rsi >= level)
+        # Son bar veya önceki 4 bar içinde seviye kesimi
+        rsi_cross = cross.copy()
+        for n in range(1, 5):
+            rsi_cross[n:] |= cross[:-n]
+
+        flags = {
+            Criteria.EMA_CROSS:   ind["EMA50"] > ind["EMA200"],
+            Criteria.PRICE_ABOVE: (c > ind["EMA50"]) & (c > ind["EMA200"]),
+            Criteria.RSI_BAND:    (rsi >= config.rsi_low) & (rsi <= config.rsi_high),
+            Criteria.RSI_CROSS:   rsi_cross,
+            Criteria.MACD_TURN:   (hist > 0) & ((prev_hist <= 0) | (ind["MACD"] > ind["MACD_Signal"])),
+        }
+
+        if data.fund is not None:
+            # Güncel temel veriler tüm tarihlere uygulanır (ileriye bakma yanlılığı içerir)
+            shape = c.shape
+            pb, pe, mc = data.fund["pb"], data.fund["pe"], data.fund["market_cap"]
+            flags[Criteria.PB_LOW]    = np.broadcast_to((pb > 0) & (pb < config.pb_max), shape)
+            flags[Criteria.PE_LOW]    = np.broadcast_to((pe > 0) & (pe < config.pe_max), shape)
+            flags[Criteria.MCAP_HIGH] = np.broadcast_to(mc > config.mcap_min, shape)
+    return flags
+
+
+def score_matrix(flags: dict[Criteria, np.ndarray], config: ScoreConfig = DEFAULT_CONFIG) -> np.ndarray:
+    """Kriter matrislerinin ağırlıklı toplamı (tarih × hisse)."""
+    points = config.points
+    score = np.zeros(next(iter(flags.values())).shape)
+    for criterion, flag in flags.items():
+        score += points.get(criterion, 0) * flag
+    return score
+
+
+def simulate(data: BacktestData, score: np.ndarray, top_n: int = 5, min_score: float = 30,
+             hold_days: int = 10, stop_atr: float = 2.0, target_atr: float = 3.0,
+             cost: float = 0.002) -> BacktestResult:
+    """
+    Her hold_days barda bir, skoru min_score üstündeki en iyi top_n hisseye eşit ağırlıkla
+    ertesi günün açılışından girilir. Pozisyon; giriş - stop_atr×ATR stopunda,
+    giriş + target_atr×ATR hedefinde ya da hold_days sonunda kapanışta kapanır.
+    Aynı gün hem stop hem hedef görülürse stop varsayılır. cost gidiş-dönüş masraf oranıdır.
+    """
+    T, N = score.shape
+    atr = data.ind["ATR"]
+    valid = ~np.isnan(data.close)
+
+    rebal = np.arange(WARMUP_BARS, T - hold_days - 1, hold_days)
+    if len(rebal) == 0:
+        raise ValueError("Geçmiş test için yeterli bar yok")
+
+    s = np.where(valid[rebal], score[rebal], -np.inf)
+    picks = np.argsort(-s, axis=1, kind="stable")[:, :top_n]            # R × top_n
+    pick_score = np.take_along_axis(s, picks, axis=1)
+
+    rows = np.repeat(rebal, picks.shape[1])
+    cols = picks.ravel()
+    entry = data.open[rows + 1, cols]
+    atr_at = atr[rows, cols]
+    ok = (pick_score.ravel() >= min_score) & ~np.isnan(entry) & ~np.isnan(atr_at)
+    rows, cols, entry, atr_at = rows[ok], cols[ok], entry[ok], atr_at[ok]
+
+    stop   = entry - stop_atr * atr_at
+    target = entry + target_atr * atr_at
+
+    # Tutma penceresi: giriş günü dahil hold_days bar (K × H)
+    window = rows[:, None] + 1 + np.arange(hold_days)[None, :]
+    lows   = data.low[window, cols[:, None]]
+    highs  = data.high[window, cols[:, None]]
+    opens  = data.open[window, cols[:, None]]
+    closes = data.close[window, cols[:, None]]
+
+    with np.errstate(invalid="ignore"):
+        hit_stop   = lows <= stop[:, None]
+        hit_target = highs >= target[:, None]
+    H = hold_days
+    first_stop   = np.where(hit_stop.any(axis=1), hit_stop.argmax(axis=1), H)
+    first_target = np.where(hit_target.any(axis=1), hit_target.argmax(axis=1), H)
+
+    k = np.arange(len(rows))
+    last_close = pd.DataFrame(closes).ffill(axis=1).to_numpy()[:, -1]
+    exit_price = last_close.copy()
+    exit_day   = np.full(len(rows), H - 1)
+    reason     = np.full(len(rows), "süre", dtype=object)
+
+    by_target = first_target < first_stop
+    by_stop   = (first_stop <= first_target) & (first_stop < H)
+    # Boşlukla açılışta stop/hedef aşıldıysa açılış fiyatından çıkılır
+    stop_open   = opens[k, np.minimum(first_stop, H - 1)]
+    target_open = opens[k, np.minimum(first_target, H - 1)]
+    exit_price = np.where(by_stop, np.fmin(stop, stop_open), exit_price)
+    exit_price = np.where(by_target, np.fmax(target, target_open), exit_price)
+    exit_day   = np.where(by_stop, first_stop, np.where(by_target, first_target, exit_day))
+    reason[by_stop]   = "stop"
+    reason[by_target] = "hedef"
+
+    ret = exit_price / entry - 1 - cost
+    done = ~np.isnan(ret)   # Tutma süresinde işlem görmeyi bırakan hisseler sayılmaz
+    rows, cols, entry, exit_price, exit_day, reason, ret = (
+        rows[done], cols[done], entry[done], exit_price[done], exit_day[done], reason[done], ret[done])
+
+    trades = pd.DataFrame({
+        "entry_date": data.dates[rows + 1],
+        "exit_date":  data.dates[rows + 1 + exit_day],
+        "ticker":     np.asarray(data.tickers)[cols],
+        "score":      score[rows, cols],
+        "entry":      entry,
+        "exit":       exit_price,
+        "return":     ret,
+        "reason":     reason,
+    })
+
+    # Her dönem eşit ağırlıklı; boş slotlar nakitte bekler
+    period_ret = np.zeros(len(rebal))
+    np.add.at(period_ret, np.searchsorted(rebal, rows), ret / top_n)
+    equity = pd.Series(np.cumprod(1 + period_ret), index=data.dates[rebal + 1], name="equity")
+
+    return BacktestResult(trades=trades, equity=equity, stats=summary_stats(equity, ret, hold_days))
+
+
+def summary_stats(equity: pd.Series, trade_returns: np.ndarray, hold_days: int) -> dict:
+    drawdown = equity / np.maximum.accumulate(equity.to_numpy()) - 1
+    periods_per_year = TRADING_DAYS / hold_days
+    period_ret = equity.pct_change().fillna(equity.iloc[0] - 1).to_numpy()
+    years = len(equity) / periods_per_year
+    std = period_ret.std()
+    return {
+        "total_return": float(equity.iloc[-1] - 1),
+        "cagr":         float(equity.iloc[-1] ** (1 / years) - 1) if years > 0 else 0.0,
+        "max_drawdown": float(drawdown.min()),
+        "sharpe":       float(period_ret.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0,
+        "trades":       int(len(trade_returns)),
+        "hit_rate":     float((trade_returns > 0).mean()) if len(trade_returns) else 0.0,
+        "avg_trade":    float(trade_returns.mean()) if len(trade_returns) else 0.0,
+    }
+
+
+def run_backtest(frames: dict[str, pd.DataFrame], fundamentals: dict[str, dict] | None = None,
+                 config: ScoreConfig = DEFAULT_CONFIG, **params) -> BacktestResult:
+    data = prepare_data(frames, fundamentals)
+    return simulate(data, score_matrix(criteria_flags(data, config), config), **params)
+
+
+def load_history(years: int = 3, with_fundamentals: bool = False) -> BacktestData:
+    """Fiyat deposunu tazeler, son years yıl (+ ısınma) için BacktestData kurar."""
+    from fundamentals import FundamentalsCache
+    from price_store import PriceStore
+    from data_sources import default_source
+    from universe import BIST100_TICKERS
+
+    store = PriceStore()
+    source = default_source()
+    store.refresh(BIST100_TICKERS, source)
+    start = pd.Timestamp.today() - pd.DateOffset(years=years) - pd.DateOffset(days=int(WARMUP_BARS * 1.5))
+    frames = {}
+    for t in BIST100_TICKERS:
+        df = store.read(t)
+        df = df[df.index >= start]
+        if len(df) > WARMUP_BARS:
+            frames[t] = df
+
+    fundamentals = None
+    if with_fundamentals:
+        cache = FundamentalsCache()
+        fundamentals = {t: cache.get(t, source.fetch_fundamentals) for t in frames}
+        cache.flush()
+    return prepare_data(frames, fundamentals)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="100 puanlık skor için geçmiş test")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--min-score", type=float, default=30)
+    parser.add_argument("--hold", type=int, default=10, help="Tutma süresi (bar)")
+    parser.add_argument("--stop-atr", type=float, default=2.0)
+    parser.add_argument("--target-atr", type=float, default=3.0)
+    parser.add_argument("--cost", type=float, default=0.002)
+    parser.add_argument("--with-fundamentals", action="store_true",
+                        help="Güncel PD/DD, F/K ve piyasa değerini de kullan (ileriye bakma yanlılığı)")
+    parser.add_argument("--trades", help="İşlem listesini CSV olarak yaz")
+    args = parser.parse_args(argv)
+
+    data = load_history(args.years, args.with_fundamentals)
+    result = simulate(data, score_matrix(criteria_flags(data)), top_n=args.top_n,
+                      min_score=args.min_score, hold_days=args.hold, stop_atr=args.stop_atr,
+                      target_atr=args.target_atr, cost=args.cost)
+    for key, value in result.stats.items():
+        print(f"{key:<14}{value:>12.4f}" if isinstance(value, float) else f"{key:<14}{value:>12}")
+    if args.trades:
+        result.trades.to_csv(args.trades, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Grafik benchmark'ı - sonuç sayfasındaki mini grafiklerin eski yolu (her kart için
+go.Figure + 3 Scatter, tüm barlar) ile seyreltilmiş sözlük figürleri karşılaştırır.
+Süre, st.plotly_chart'ın yaptığı doğrulama + JSON serileştirmeyi içerir.
+
+Kullanım:  python benchmarks/bench_charts.py --top-n 10 --bars 250   (varsayılan: CHART_BARS)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import plotly.graph_objects as go  # noqa: E402
+import plotly.io as pio  # noqa: E402
+import plotly.tools  # noqa: E402
+
+from bench_indicators import synthetic_frames  # noqa: E402
+from charts import CHART_BARS, CHART_POINTS, price_figure  # noqa: E402
+from indicators import calculate_indicators  # noqa: E402
+
+
+def legacy_figure(df) -> go.Figure:
+    fig = go.Figure()
+    for col, color, width, dash in (("Close", "#00d4aa", 1.5, None), ("EMA50", "#f59e0b", 1, "dot"),
+                                    ("EMA200", "#ef4444", 1, "dot")):
+        fig.add_trace(go.Scatter(x=df.index, y=df[col], name=col, showlegend=False,
+                                 line=dict(color=color, width=width, dash=dash)))
+    fig.update_layout(height=180, margin=dict(l=0, r=0, t=0, b=0),
+                      paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                      xaxis=dict(showgrid=False, showticklabels=False),
+                      yaxis=dict(showgrid=False, tickfont=dict(size=8, color="#6b7280")))
+    return fig
+
+
+def serialize(figure_or_data) -> str:
+    """st.plotly_chart'ın figür başına yaptığı iş."""
+    figure = plotly.tools.return_figure_from_figure_or_data(figure_or_data, validate_figure=True)
+    return pio.to_json(figure, validate=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--open", type=int, default=3, help="Açık kart sayısı")
+    parser.add_argument("--bars", type=int, default=CHART_BARS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.top_n, 2)
+    charts = [calculate_indicators(df)[["Close", "EMA50", "EMA200"]].tail(args.bars) for df in frames.values()]
+
+    def run_legacy():
+        return [serialize(legacy_figure(df)) for df in charts]
+
+    cached = [price_figure(df) for df in charts[:args.open]]   # snapshot başına önbellekte
+
+    def run_new():
+        return [serialize(fig) for fig in cached]
+
+    results = {}
+    for name, fn in (("eski (tüm kartlar)", run_legacy), ("yeni (açık kartlar)", run_new)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            payloads = fn()
+            best = min(best, time.perf_counter() - start)
+        results[name] = (best, sum(len(p) for p in payloads))
+
+    start = time.perf_counter()
+    for df in charts:
+        price_figure(df)
+    build = (time.perf_counter() - start) / len(charts)
+
+    print(f"{args.top_n} kart, {args.open} açık, {args.bars} bar -> en fazla {CHART_POINTS} nokta")
+    for name, (sec, size) in results.items():
+        print(f"  {name:<24}: {sec * 1000:8.1f} ms  {size / 1024:8.1f} KB")
+    print(f"  Figür kurulumu (ıskada) : {build * 1000:8.2f} ms/hisse")
+    old, new = results["eski (tüm kartlar)"], results["yeni (açık kartlar)"]
+    print(f"  Hızlanma                : {old[0] / new[0]:8.1f}x, veri {old[1] / max(new[1], 1):.1f}x daha az")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
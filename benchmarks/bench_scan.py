@@ -0,0 +1,213 @@
+"""
+Tarama benchmark'ı - sentetik OHLCV ve temel veri üzerinde calculate_indicators, score_ticker
+ve uçtan uca tarama (scan_universe) maliyetini ölçer. Veri FakeSource'tan gelir; ağ gecikmesi
+--latency ile taklit edilir. Evren gerçek BIST listesiyle başlar, fazlası sentetik sembollerle
+doldurulur (ör. --tickers 2000). Uçtan uca tarama iki yığınla ölçülür: "scan" çıplak kaynak,
+"scan_resilient" üretimdeki ResilientSource sarmalı (hız sınırı, yeniden deneme); hız sınırı
+gerilemeleri ikincisinde görünür. --stack ile yalnızca biri seçilebilir.
+
+Her çalışma geçmiş dosyasına (JSON satırı, commit ile) eklenir ve aynı parametrelerle yapılmış
+bir önceki çalışmayla karşılaştırılır; verim --max-regression yüzdesinden fazla düşerse
+çıkış kodu 1 olur.
+
+Kullanım:  python benchmarks/bench_scan.py --tickers 197 --years 5 --latency 0.05
+           python benchmarks/bench_scan.py --tickers 2000 --compare abc1234
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from data_sources import FakeSource, resilient, to_yf_symbol  # noqa: E402
+from indicators import annotate_frames, calculate_indicators  # noqa: E402
+from metrics import ScanMetrics  # noqa: E402
+from scanner import DEFAULT_WORKERS, scan_universe  # noqa: E402
+from scoring import score_ticker  # noqa: E402
+from universe import BIST100_TICKERS  # noqa: E402
+
+HISTORY = ROOT / "benchmarks" / "results" / "bench_scan.jsonl"
+
+
+def universe(n: int) -> list[str]:
+    """İlk n hisse gerçek listeden, kalanı SYN0001... sentetik sembolleri."""
+    tickers = list(BIST100_TICKERS[:n])
+    tickers += [f"SYN{i:04d}" for i in range(1, n - len(tickers) + 1)]
+    return tickers
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def summarize(latencies: list[float], wall: float) -> dict:
+    """Hisse başına süreler (sn) ve duvar saati süresinden özet."""
+    arr = np.asarray(latencies)
+    return {
+        "tickers":    len(arr),
+        "wall_s":     wall,
+        "throughput": len(arr) / wall if wall else 0.0,   # hisse/sn
+        "p50_ms":     float(np.percentile(arr, 50)) * 1000 if len(arr) else 0.0,
+        "p99_ms":     float(np.percentile(arr, 99)) * 1000 if len(arr) else 0.0,
+    }
+
+
+def bench_indicators(frames: dict) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for df in frames.values():
+        t0 = time.perf_counter()
+        calculate_indicators(df)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def bench_score(frames: dict, fundamentals: dict) -> dict:
+    annotated = annotate_frames(frames)
+    latencies = []
+    start = time.perf_counter()
+    for ticker, df in annotated.items():
+        t0 = time.perf_counter()
+        score_ticker(ticker, df, fundamentals.get)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def bench_scan(tickers: list[str], source: FakeSource, workers: int) -> dict:
+    """Uçtan uca tarama; hisse başı süre = puanlama + temel veri (ScanMetrics'ten)."""
+    metrics = ScanMetrics()
+    fetch = lambda t: source.fetch_fundamentals(to_yf_symbol(t))  # noqa: E731
+    start = time.perf_counter()
+    scan_universe(tickers, source=source, get_fundamentals=fetch, max_workers=workers, metrics=metrics)
+    wall = time.perf_counter() - start
+    result = summarize([sec for _, sec in metrics.slowest(len(tickers))], wall)
+    result["stages_ms"] = {k: round(v.total * 1000, 1) for k, v in metrics.stages.items()}
+    return result
+
+
+def peak_memory(fn) -> float:
+    """fn çalışırken Python (NumPy dahil) ayırmalarının tepe değeri (MB)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def find_reference(history: list[dict], params: dict, commit: str | None) -> dict | None:
+    """Aynı parametreli en son kayıt (commit verilirse o commit'e ait olan)."""
+    for record in reversed(history):
+        if record["params"] == params and (commit is None or record["commit"].startswith(commit)):
+            return record
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=len(BIST100_TICKERS))
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="Sahte kaynak istek gecikmesi (sn)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stack", choices=("raw", "resilient", "both"), default="both",
+                        help="Uçtan uca taramada kullanılacak kaynak yığını")
+    parser.add_argument("--no-memory", action="store_true", help="Tepe bellek ölçümünü atla")
+    parser.add_argument("--history", type=Path, default=HISTORY, help="Sonuç geçmişi (JSON satırları)")
+    parser.add_argument("--compare", metavar="COMMIT", help="Karşılaştırılacak commit (varsayılan: son kayıt)")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="Tarama veriminde izin verilen azami düşüş (%%)")
+    parser.add_argument("--no-save", action="store_true", help="Sonucu geçmişe ekleme")
+    args = parser.parse_args()
+
+    tickers = universe(args.tickers)
+    params = {"tickers": args.tickers, "years": args.years, "latency": args.latency,
+              "workers": args.workers, "seed": args.seed}
+    if args.stack != "both":
+        params["stack"] = args.stack
+
+    # Fiyat ve temel veriler önceden üretilir; ölçülen süreye veri üretimi girmez
+    def make_source(latency: float) -> FakeSource:
+        source = FakeSource(latency=latency, seed=args.seed, bars=252 * args.years)
+        source.fetch_prices([to_yf_symbol(t) for t in tickers])
+        return source
+
+    source = make_source(0.0)
+    raw = source.fetch_prices([to_yf_symbol(t) for t in tickers], period="max")
+    frames = {t: raw[to_yf_symbol(t)] for t in tickers}
+    fundamentals = {t: source.fetch_fundamentals(to_yf_symbol(t)) for t in tickers}
+
+    results = {
+        "indicators": bench_indicators(frames),
+        "score":      bench_score(frames, fundamentals),
+    }
+    if args.stack in ("raw", "both"):
+        results["scan"] = bench_scan(tickers, make_source(args.latency), args.workers)
+    if args.stack in ("resilient", "both"):
+        results["scan_resilient"] = bench_scan(tickers, resilient(make_source(args.latency)), args.workers)
+    if not args.no_memory and "scan" in results:
+        # tracemalloc işi yavaşlattığı için bellek ayrı bir taramada ölçülür
+        mem_source = make_source(args.latency)
+        results["scan"]["peak_mb"] = peak_memory(lambda: bench_scan(tickers, mem_source, args.workers))
+
+    record = {"commit": git_commit(), "date": datetime.now().isoformat(timespec="seconds"),
+              "params": params, "results": results}
+
+    print(f"Evren: {args.tickers} hisse × {args.years} yıl, gecikme {args.latency * 1000:.0f} ms, "
+          f"{args.workers} işçi  [{record['commit']}]")
+    for name, r in results.items():
+        line = (f"  {name:<14}: {r['wall_s'] * 1000:9.1f} ms  {r['throughput']:8.1f} hisse/sn  "
+                f"p50 {r['p50_ms']:7.2f} ms  p99 {r['p99_ms']:7.2f} ms")
+        if "peak_mb" in r:
+            line += f"  tepe {r['peak_mb']:.1f} MB"
+        print(line)
+
+    history = load_history(args.history)
+    reference = find_reference(history, params, args.compare)
+    status = 0
+    if reference is not None:
+        print(f"Karşılaştırma: {reference['commit']} ({reference['date']})")
+        for name, r in results.items():
+            old = reference["results"].get(name)
+            if old and old["throughput"]:
+                change = (r["throughput"] / old["throughput"] - 1) * 100
+                print(f"  {name:<14}: verim {change:+6.1f}%   p99 {old['p99_ms']:.2f} → {r['p99_ms']:.2f} ms")
+        for name in ("scan", "scan_resilient"):
+            old = reference["results"].get(name, {}).get("throughput")
+            if old and name in results and results[name]["throughput"] < old * (1 - args.max_regression / 100):
+                print(f"GERİLEME: {name} verimi %{args.max_regression:g}'den fazla düştü", file=sys.stderr)
+                status = 1
+    elif args.compare:
+        print(f"{args.compare} için aynı parametreli kayıt yok", file=sys.stderr)
+
+    if not args.no_save:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Açılış benchmark'ı - app.py'nin soğuk import süresini ve Streamlit rerun sürelerini ölçer.
+Karşılama sayfası (snapshot yok) ile sonuç sayfası (sentetik fixture üzerinde tarama)
+ayrı ölçülür; süre bütçesi aşılırsa çıkış kodu 1 olur.
+
+Bütçe uygulamanın kendi maliyetine uygulanır: çıplak `import streamlit` süresi ve boş bir
+sayfanın AppTest ile ilk çalışması taban olarak ölçülüp çıkarılır. Sunucu Streamlit'i
+oturumlardan önce bir kez yükler; bu süre uygulama kodunun değiştirebileceği bir şey değildir.
+
+Kullanım:  python benchmarks/bench_startup.py --repeat 5 --budget 1.0
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+# İlk ekranda yüklenmemesi gereken modüller
+HEAVY_MODULES = ("pandas", "numpy", "yfinance", "plotly.express", "scipy")
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import %s
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+BLANK_PAGE = "import streamlit as st\nst.title('BIST')"
+
+
+def measure_import(module: str, repeat: int, env: dict) -> tuple[list[float], list[str]]:
+    """Her ölçüm ayrı bir süreçte yapılır (modül önbelleği paylaşılmaz)."""
+    probe = IMPORT_PROBE % (module, HEAVY_MODULES)
+    times, loaded = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        times.append(result["seconds"])
+        loaded = result["loaded"]
+    return times, loaded
+
+
+def write_fixtures(directory: Path, tickers: list[str], years: int):
+    from bench_indicators import synthetic_frames
+
+    frames = synthetic_frames(len(tickers), years)
+    fundamentals = {}
+    for ticker, df in zip(tickers, frames.values()):
+        df.rename_axis("Date").to_csv(directory / f"{ticker}.csv")
+        fundamentals[ticker] = {"pb": 1.2, "pe": 9.0, "market_cap": 5e9,
+                                "sector": "Industrials", "name": f"{ticker} A.S."}
+    (directory / "fundamentals.json").write_text(json.dumps(fundamentals), encoding="utf-8")
+
+
+def timed_run(action) -> float:
+    start = time.perf_counter()
+    at = action()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - start
+
+
+def measure_reruns(repeat: int) -> dict[str, float]:
+    """
+    AppTest ile karşılama, tarama ve filtre değişimi sonrası rerun süreleri (sn).
+    Çalışma zamanının süreç başına ilk kurulumu boş sayfayla ısıtılır; ardından boş sayfanın
+    yeni bir AppTest'teki ilk çalışması taban ("blank_first") olarak ölçülür.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    timed_run(AppTest.from_string(BLANK_PAGE).run)
+    timings = {"blank_first": statistics.median(timed_run(AppTest.from_string(BLANK_PAGE).run)
+                                                for _ in range(repeat))}
+
+    app_path = str(ROOT / "app.py")
+    at = AppTest.from_file(app_path, default_timeout=300)
+    timings["landing_first"] = timed_run(at.run)
+    timings["landing_rerun"] = statistics.median(timed_run(at.run) for _ in range(repeat))
+
+    timings["scan"] = timed_run(lambda: at.button[0].click().run())
+    slider_times = []
+    for i in range(repeat):
+        min_score = at.slider[2]
+        slider_times.append(timed_run(lambda: min_score.set_value(40 + 10 * (i % 3)).run()))
+    timings["filter_rerun"] = statistics.median(slider_times)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--years", type=int, default=1, help="Sentetik fiyat geçmişi (yıl)")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="Uygulamanın kendi soğuk import + ilk karşılama süresi için azami süre "
+                             "(Streamlit tabanı hariç, sn)")
+    args = parser.parse_args()
+
+    from universe import BIST100_TICKERS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures, cache = Path(tmp) / "fixtures", Path(tmp) / "cache"
+        fixtures.mkdir()
+        write_fixtures(fixtures, BIST100_TICKERS, args.years)
+        os.environ["BIST_FIXTURE_DIR"] = str(fixtures)
+        os.environ["BIST_CACHE_DIR"]   = str(cache)
+
+        base_times, _ = measure_import("streamlit", args.repeat, dict(os.environ))
+        import_times, loaded = measure_import("app", args.repeat, dict(os.environ))
+        reruns = measure_reruns(args.repeat)
+
+    base, cold = statistics.median(base_times), statistics.median(import_times)
+    print(f"{f'import streamlit (medyan/{args.repeat})':<30}: {base * 1000:8.1f} ms  (taban)")
+    print(f"{f'Soğuk import (medyan/{args.repeat})':<30}: {cold * 1000:8.1f} ms  (en iyi {min(import_times) * 1000:.1f} ms)")
+    print(f"  Yüklenen ağır modüller      : {', '.join(loaded) or '-'}")
+    print(f"Boş sayfa ilk çalışma         : {reruns['blank_first'] * 1000:8.1f} ms  (taban)")
+    print(f"Karşılama sayfası ilk çalışma : {reruns['landing_first'] * 1000:8.1f} ms")
+    print(f"Karşılama sayfası rerun       : {reruns['landing_rerun'] * 1000:8.1f} ms")
+    print(f"{f'Tarama ({len(BIST100_TICKERS)} hisse)':<30}: {reruns['scan'] * 1000:8.1f} ms")
+    print(f"Filtre değişimi rerun         : {reruns['filter_rerun'] * 1000:8.1f} ms")
+
+    own = max(cold - base, 0.0) + max(reruns["landing_first"] - reruns["blank_first"], 0.0)
+    print(f"Karşılama (Streamlit hariç)   : {own * 1000:8.1f} ms  / bütçe {args.budget * 1000:.0f} ms")
+    if loaded:
+        print(f"AĞIR MODÜL YÜKLENDİ: {', '.join(loaded)}", file=sys.stderr)
+        return 1
+    if own > args.budget:
+        print(f"BÜTÇE AŞILDI: {own:.2f} sn > {args.budget:.2f} sn", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Grafik verisi - Plotly figürleri go.Figure nesnesi yerine sade sözlük olarak kurulur.
+Uzun seriler LTTB (Largest-Triangle-Three-Buckets) ile seyreltilir; tarihler ISO metin,
+fiyatlar yuvarlanmış listelerdir, böylece tarayıcıya giden JSON küçük kalır.
+Bu modül Plotly import etmez.
+"""
+
+import numpy as np
+import pandas as pd
+
+CHART_BARS   = 60    # Mini grafikte gösterilen geçmiş (≈ 3 ay)
+CHART_POINTS = 90    # Seyreltme sonrası azami nokta sayısı; daha uzun seriler seyreltilir
+
+PRICE_LINES = (      # kolon, renk, genişlik, çizgi tipi
+    ("Close",  "#00d4aa", 1.5, "solid"),
+    ("EMA50",  "#f59e0b", 1.0, "dot"),
+    ("EMA200", "#ef4444", 1.0, "dot"),
+)
+SCORE_COLORSCALE = [[0.0, "#ef4444"], [0.5, "#f59e0b"], [1.0, "#00d4aa"]]
+
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Eşit aralıklı seride görsel şekli koruyan n_out noktanın indeksleri.
+    İlk ve son nokta her zaman tutulur; aradaki her kovadan, bir önceki seçilen nokta ve
+    sonraki kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)   # n_out - 2 iç kova
+    x = np.arange(n, dtype="f8")
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        # Üçgen alanının iki katı (sabit çarpan seçimi etkilemez)
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev])
+                      - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        out[b + 1] = prev
+    return out
+
+
+def downsample(df: pd.DataFrame, max_points: int = CHART_POINTS, column: str = "Close") -> pd.DataFrame:
+    """column üzerinden LTTB ile seçilen satırlar; diğer kolonlar aynı satırlardan alınır."""
+    if len(df) <= max_points:
+        return df
+    y = df[column].ffill().bfill().to_numpy(dtype="f8")
+    return df.iloc[lttb_indices(y, max_points)]
+
+
+def _values(series: pd.Series, decimals: int = 2) -> list:
+    return [None if np.isnan(v) else v for v in np.round(series.to_numpy(dtype="f8"), decimals)]
+
+
+def price_figure(df: pd.DataFrame, max_points: int = CHART_POINTS) -> dict:
+    """Kart içindeki mini fiyat grafiği (fiyat + EMA50/200) için figür sözlüğü."""
+    df = downsample(df, max_points)
+    dates = df.index.strftime("%Y-%m-%d").tolist()
+    traces = [
+        {"type": "scatter", "mode": "lines", "x": dates, "y": _values(df[col]), "name": col,
+         "showlegend": False, "line": {"color": color, "width": width, "dash": dash}}
+        for col, color, width, dash in PRICE_LINES
+    ]
+    return {
+        "data": traces,
+        "layout": {
+            "height": 180, "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+            "paper_bgcolor": "rgba(0,0,0,0)", "plot_bgcolor": "rgba(0,0,0,0)",
+            "xaxis": {"showgrid": False, "showticklabels": False},
+            "yaxis": {"showgrid": False, "tickfont": {"size": 8, "color": "#6b7280"}},
+        },
+    }
+
+
+def score_figure(tickers: list[str], scores: list[float]) -> dict:
+    """Özet tablodaki hisselerin skor çubukları (renk skora göre kırmızı→yeşil)."""
+    return {
+        "data": [{
+            "type": "bar", "x": tickers, "y": scores,
+            "marker": {"color": scores, "colorscale": SCORE_COLORSCALE, "cmin": 0, "cmax": 100},
+            "hovertemplate": "%{x}: %{y}%<extra></extra>",
+        }],
+        "layout": {
+            "paper_bgcolor": "rgba(0,0,0,0)", "plot_bgcolor": "rgba(0,0,0,0)",
+            "font": {"color": "#e5e7eb"}, "height": 300,
+            "xaxis": {"showgrid": False}, "yaxis": {"showgrid": False, "range": [0, 100]},
+            "margin": {"l": 0, "r": 0, "t": 20, "b": 0},
+        },
+    }
@@ -0,0 +1,287 @@
+"""
+Veri kaynakları - fiyat verisini toplu (çok sembollü) olarak çeker.
+yfinance dışında yerel fixture dizininden okuyan bir kaynak da vardır.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from metrics import NULL_METRICS
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+FUNDAMENTAL_KEYS = {              # Uygulamadaki alan -> yfinance .info anahtarı
+    "pb":         "priceToBook",
+    "pe":         "trailingPE",
+    "market_cap": "marketCap",
+    "sector":     "sector",
+    "name":       "longName",
+}
+MIN_BARS      = 60   # Bundan kısa geçmişi olan hisseler elenir
+CHUNK_SIZE    = 50   # Tek istekte indirilecek sembol sayısı
+
+
+def to_yf_symbol(ticker: str) -> str:
+    """BIST kodunu Yahoo sembolüne çevirir (AKBNK -> AKBNK.IS)."""
+    return ticker if ticker.endswith(".IS") else ticker + ".IS"
+
+
+def split_multi_frame(raw: pd.DataFrame, symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """Çok sembollü yf.download çıktısını sembol başına DataFrame'lere ayırır."""
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Tek sembol indirildiyse kolonlar düz gelir
+        if len(symbols) == 1:
+            frames[symbols[0]] = raw
+        return frames
+
+    # group_by="ticker" -> (sembol, alan); eski/yeni sürümlerde (alan, sembol) da olabilir
+    level = 0 if set(symbols) & set(raw.columns.get_level_values(0)) else 1
+    available = set(raw.columns.get_level_values(level))
+    for sym in symbols:
+        if sym in available:
+            frames[sym] = raw.xs(sym, axis=1, level=level)
+    return frames
+
+
+class YFinanceSource:
+    """Yahoo Finance kaynağı. Her parça tek bir yf.download isteğiyle gelir."""
+
+    def fetch_prices(self, symbols: list[str], period: str = "1y",
+                     start: str | None = None, interval: str = "1d") -> dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        span = {"start": start} if start else {"period": period}
+        raw = yf.download(symbols, group_by="ticker", auto_adjust=True, interval=interval,
+                          progress=False, threads=True, **span)
+        return split_multi_frame(raw, symbols)
+
+    def fetch_fundamentals(self, symbol: str) -> dict:
+        import yfinance as yf
+
+        info = yf.Ticker(symbol).info or {}
+        return {field: info.get(key) for field, key in FUNDAMENTAL_KEYS.items()}
+
+
+class FixtureSource:
+    """
+    Yerel dizinden okuyan kaynak (testler için).
+    Her hisse için <HİSSE>.csv dosyası beklenir: Date, Open, High, Low, Close, Volume
+    Temel veriler fundamentals.json içinde {"HİSSE": {"pb": .., "pe": .., ...}} olarak durur.
+    Yalnızca günlük bar vardır; interval yok sayılır.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+
+    def fetch_prices(self, symbols: list[str], period: str = "1y",
+                     start: str | None = None, interval: str = "1d") -> dict[str, pd.DataFrame]:
+        frames = {}
+        for sym in symbols:
+            path = self.directory / f"{sym.removesuffix('.IS')}.csv"
+            if not path.exists():
+                continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            frames[sym] = df[df.index >= pd.Timestamp(start)] if start else trim_period(df, period)
+        return frames
+
+    def fetch_fundamentals(self, symbol: str) -> dict:
+        path = self.directory / "fundamentals.json"
+        data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        entry = data.get(symbol.removesuffix(".IS"), {})
+        return {field: entry.get(field) for field in FUNDAMENTAL_KEYS}
+
+
+class FakeSource:
+    """
+    Yerel sahte sağlayıcı - gecikme ve hata enjeksiyonuyla dayanıklılık denemeleri için.
+    Her sembol için sembolden türetilen tohumla deterministik rastgele yürüyüş üretir.
+    error_rate oranında ConnectionError fırlatır, empty_rate oranında boş yanıt döner
+    (Yahoo kısıtlamasının tipik belirtisi). Yalnızca günlük bar üretir; interval yok sayılır.
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, empty_rate: float = 0.0,
+                 seed: int = 0, bars: int = 1300):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.empty_rate = empty_rate
+        self.seed = seed
+        self.bars = bars
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._frames: dict[str, pd.DataFrame] = {}
+
+    def _inject(self) -> bool:
+        """Gecikme uygular; hata fırlatır ya da boş yanıt gerekiyorsa True döner."""
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+        if self.latency:
+            time.sleep(self.latency)
+        if roll < self.error_rate:
+            raise ConnectionError("fake: bağlantı hatası")
+        return roll < self.error_rate + self.empty_rate
+
+    def _frame(self, sym: str) -> pd.DataFrame:
+        with self._lock:
+            if sym not in self._frames:
+                rng = np.random.default_rng([self.seed, zlib.crc32(sym.encode())])
+                index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=self.bars, name="Date")
+                close = 20 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, self.bars)))
+                self._frames[sym] = pd.DataFrame({
+                    "Open":   close * (1 + rng.normal(0, 0.005, self.bars)),
+                    "High":   close * (1 + rng.uniform(0, 0.02, self.bars)),
+                    "Low":    close * (1 - rng.uniform(0, 0.02, self.bars)),
+                    "Close":  close,
+                    "Volume": rng.integers(100_000, 10_000_000, self.bars).astype(float),
+                }, index=index)
+            return self._frames[sym]
+
+    def fetch_prices(self, symbols: list[str], period: str = "1y",
+                     start: str | None = None, interval: str = "1d") -> dict[str, pd.DataFrame]:
+        if self._inject():
+            return {}
+        frames = {}
+        for sym in symbols:
+            df = self._frame(sym)
+            frames[sym] = df[df.index >= pd.Timestamp(start)] if start else trim_period(df, period)
+        return frames
+
+    def fetch_fundamentals(self, symbol: str) -> dict:
+        if self._inject():
+            return {field: None for field in FUNDAMENTAL_KEYS}
+        rng = random.Random(zlib.crc32(symbol.encode()) ^ self.seed)
+        return {
+            "pb":         round(rng.uniform(0.3, 4.0), 2),
+            "pe":         round(rng.uniform(2.0, 40.0), 1),
+            "market_cap": rng.uniform(1e8, 1e11),
+            "sector":     rng.choice(["Financial Services", "Industrials", "Energy", "Technology"]),
+            "name":       f"{symbol.removesuffix('.IS')} A.S.",
+        }
+
+
+def trim_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """"1y", "6mo", "5d" gibi yfinance periyotlarını tarih aralığına çevirir."""
+    if df.empty or period == "max":
+        return df
+    units = {"d": "days", "mo": "months", "y": "years"}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            start = df.index[-1] - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+            return df[df.index > start]
+    return df
+
+
+def parse_fake_spec(spec: str) -> dict:
+    """ "latency=0.2,error_rate=0.3" -> FakeSource parametreleri."""
+    params = {}
+    for item in filter(None, (p.strip() for p in spec.split(","))):
+        key, _, value = item.partition("=")
+        params[key.strip()] = int(value) if key.strip() in ("seed", "bars") else float(value)
+    return params
+
+
+def resilient(source):
+    """Ağ kaynağını üretimdeki gibi sarar: ResilientSource + ortamdan okunan hız sınırları."""
+    from fetch import (FUNDAMENTALS_BURST, FUNDAMENTALS_RATE, PRICE_BURST, PRICE_RATE,
+                       ResilientSource, rate_from_env)
+
+    rate, burst = rate_from_env("BIST_PRICE_RATE", PRICE_RATE, PRICE_BURST)
+    f_rate, f_burst = rate_from_env("BIST_FUNDAMENTALS_RATE", FUNDAMENTALS_RATE, FUNDAMENTALS_BURST)
+    return ResilientSource(source, rate, burst, fundamentals_rate=f_rate, fundamentals_burst=f_burst)
+
+
+@lru_cache(maxsize=None)
+def _shared_source(fixture_dir: str | None, fake_spec: str | None):
+    if fixture_dir:
+        return FixtureSource(fixture_dir)
+    return resilient(FakeSource(**parse_fake_spec(fake_spec)) if fake_spec is not None else YFinanceSource())
+
+
+def default_source():
+    """
+    BIST_FIXTURE_DIR tanımlıysa yerel fixture, BIST_FAKE_SOURCE tanımlıysa
+    (ör. "latency=0.2,error_rate=0.3") hata enjekte eden sahte kaynak, değilse Yahoo Finance.
+    Ağ kaynakları ResilientSource ile sarılır; hız sınırı ve devre kesicinin süreç içinde
+    paylaşılması için aynı ayarlarla hep aynı örnek döner. Hız sınırları BIST_PRICE_RATE ve
+    BIST_FUNDAMENTALS_RATE ile değiştirilebilir (ör. "10:20" = 10 istek/sn, 20 ani istek).
+    """
+    return _shared_source(os.environ.get("BIST_FIXTURE_DIR"), os.environ.get("BIST_FAKE_SOURCE"))
+
+
+def clean_price_frame(df: pd.DataFrame | None) -> pd.DataFrame:
+    """Boş satırları atar; yetersiz geçmişte boş DataFrame döner."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    df = df[[c for c in PRICE_COLUMNS if c in df.columns]].dropna(subset=["Close"])
+    if len(df) < MIN_BARS:
+        return pd.DataFrame()
+    return df
+
+
+def fetch_chunked(symbols: list[str], source, chunk_size: int = CHUNK_SIZE,
+                  metrics=NULL_METRICS, **kwargs) -> dict[str, pd.DataFrame]:
+    """Sembolleri parçalara bölüp her parçayı tek istekle çeker; hatalı parçalar atlanır ve sayılır."""
+    frames = {}
+    for i in range(0, len(symbols), chunk_size):
+        chunk = symbols[i:i + chunk_size]
+        try:
+            with metrics.timer("fetch_prices"):
+                frames.update(source.fetch_prices(chunk, **kwargs))
+        except Exception:
+            metrics.count("failures", len(chunk), stage="fetch_prices")
+            continue
+    return frames
+
+
+def load_price_frames(tickers: list[str], source=None, period: str = "1y",
+                      chunk_size: int = CHUNK_SIZE, store=None,
+                      metrics=NULL_METRICS) -> dict[str, pd.DataFrame]:
+    """
+    Tüm evreni parça parça, çok sembollü isteklerle indirir.
+    store verilirse önce diskteki geçmiş güncellenir (yalnızca yeni barlar indirilir;
+    BIST_CACHE_BACKEND tanımlıysa başka kopyanın yayımladığı geçmiş kullanılır),
+    veri diskten okunur ve period kadarına kırpılır.
+    Dönen sözlük verilen hisse kodlarıyla anahtarlanır; eksik/kısa geçmişli hisseler yer almaz.
+    """
+    source = source or default_source()
+
+    if store is not None:
+        from shared_cache import refresh_store, shared_cache
+
+        cache = shared_cache()
+        with metrics.timer("store_refresh"):
+            if cache is not None:   # Kopyalar evreni bir kez indirir, geçmişi önbellekten paylaşır
+                stats = refresh_store(cache, store, tickers, source, chunk_size, metrics)
+            else:
+                stats = store.refresh(tickers, source, chunk_size=chunk_size, metrics=metrics)
+        for result, n in stats.items():
+            metrics.count("cache_requests", n, cache="price", result=result)
+        with metrics.timer("store_read"):
+            fetched = {t: trim_period(store.read(t), period) for t in tickers}
+    else:
+        symbols = {to_yf_symbol(t): t for t in tickers}
+        raw = fetch_chunked(list(symbols), source, chunk_size, metrics=metrics, period=period)
+        fetched = {symbols[sym]: df for sym, df in raw.items()}
+        metrics.count("cache_requests", len(tickers), cache="price", result="miss")
+
+    frames = {}
+    for ticker, df in fetched.items():
+        df = clean_price_frame(df)
+        if not df.empty:
+            frames[ticker] = df
+    # İndirilemeyen veya geçmişi yetersiz olan hisseler
+    metrics.count("failures", len(tickers) - len(frames), stage="prices")
+    return frames
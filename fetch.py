@@ -0,0 +1,259 @@
+"""
+Dayanıklı veri çekme katmanı - herhangi bir kaynağı (YFinanceSource, FakeSource...)
+token-bucket hız sınırı, üstel geri çekilmeli yeniden deneme ve devre kesici ile sarar.
+İstek başarısız olursa son başarılı veri (bayat) döner; o da yoksa FetchError fırlatılır,
+hata sessizce boş sonuca dönüşmez.
+
+Fiyat (çok sembollü parça istekleri) ve temel veri (hisse başına .info) ayrı jeton
+kovalarını kullanır. Sınırlar BIST_PRICE_RATE / BIST_FUNDAMENTALS_RATE ile "hız" veya
+"hız:ani" (ör. "10:20") biçiminde değiştirilebilir.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from metrics import ScanMetrics
+
+PRICE_RATE          = 2.0    # istek/sn - her istek CHUNK_SIZE sembol taşır
+PRICE_BURST         = 5
+FUNDAMENTALS_RATE   = 10.0   # istek/sn - hisse başına bir .info çağrısı
+FUNDAMENTALS_BURST  = 20
+STALE_PRICE_ENTRIES = 1024   # Bayat yedek olarak tutulan (sembol, istek) sonucu sayısı
+
+
+def rate_from_env(name: str, rate: float, burst: float) -> tuple[float, float]:
+    """ "10" veya "10:20" biçimindeki ortam değişkeninden (hız, ani); tanımsızsa varsayılanlar."""
+    spec = os.environ.get(name, "").strip()
+    if not spec:
+        return rate, burst
+    value, _, extra = spec.partition(":")
+    return float(value), float(extra) if extra else max(burst, float(value))
+
+
+class FetchError(Exception):
+    """Yeniden denemelere rağmen veri alınamadı."""
+
+
+class CircuitOpenError(FetchError):
+    """Devre kesici açık; kaynak bir süre sorgulanmıyor."""
+
+
+# ─────────────────────────────────────────────
+# HIZ SINIRI
+# ─────────────────────────────────────────────
+
+class TokenBucket:
+    """Saniyede rate istek, en fazla capacity kadar ani istek (thread-safe)."""
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Jeton alınabildiyse 0, alınamadıysa beklenmesi gereken süreyi döner."""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: float | None = None) -> float:
+        """Jeton alınana kadar bekler; beklenen toplam süreyi döner. Süre aşılırsa FetchError."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise FetchError("Hız sınırı beklemesi zaman aşımına uğradı")
+            self._sleep(wait)
+            waited += wait
+
+
+# ─────────────────────────────────────────────
+# YENİDEN DENEME VE DEVRE KESİCİ
+# ─────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts:   int   = 4      # İlk deneme dahil
+    base_delay: float = 0.5    # sn; her denemede iki katına çıkar
+    max_delay:  float = 8.0
+    jitter:     float = 0.2    # Gecikmeye ±oran kadar rastgelelik
+
+    def delay(self, attempt: int, rng: random.Random | None = None) -> float:
+        """attempt. yeniden denemeden önceki bekleme (attempt >= 1)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            delay *= 1 + (rng or random).uniform(-self.jitter, self.jitter)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Art arda failure_threshold hatada açılır, reset_timeout boyunca istek geçirmez.
+    Süre dolunca tek bir deneme isteğine izin verir (yarı açık); başarılıysa kapanır.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(self._clock())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state(self._clock())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._trial = False
+
+
+# ─────────────────────────────────────────────
+# DAYANIKLI KAYNAK
+# ─────────────────────────────────────────────
+
+class ResilientSource:
+    """
+    Kaynak sarmalayıcı. Tamamen boş fiyat yanıtı (tipik kısıtlama belirtisi) hata sayılıp
+    yeniden denenir; kısmi yanıtta eksik semboller için son başarılı veri kullanılır.
+    Sayaçlar ve bekleme süreleri self.metrics'e (süreç boyunca birikimli) yazılır.
+    """
+
+    def __init__(self, source, rate: float = PRICE_RATE, burst: float = PRICE_BURST,
+                 fundamentals_rate: float = FUNDAMENTALS_RATE,
+                 fundamentals_burst: float = FUNDAMENTALS_BURST,
+                 retry: RetryPolicy = RetryPolicy(),
+                 breaker: CircuitBreaker | None = None,
+                 metrics: ScanMetrics | None = None,
+                 sleep=time.sleep):
+        self.source = source
+        self.buckets = {
+            "prices":       TokenBucket(rate, burst, sleep=sleep),
+            "fundamentals": TokenBucket(fundamentals_rate, fundamentals_burst, sleep=sleep),
+        }
+        self.retry = retry
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or ScanMetrics()
+        self._sleep = sleep
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        self._last_prices: OrderedDict[tuple, object] = OrderedDict()   # LRU, en fazla STALE_PRICE_ENTRIES
+        self._last_fundamentals: dict[str, dict] = {}
+
+    def _call(self, kind: str, fn, *args, **kwargs):
+        """fn'i hız sınırı, yeniden deneme ve devre kesici altında çağırır."""
+        last_error: Exception | None = None
+        for attempt in range(self.retry.attempts):
+            if attempt:
+                self.metrics.count("retries", source=kind)
+                self._sleep(self.retry.delay(attempt, self._rng))
+            if not self.breaker.allow():
+                self.metrics.count("circuit_open", source=kind)
+                raise CircuitOpenError(f"{kind}: kaynak geçici olarak devre dışı") from last_error
+            waited = self.buckets[kind].acquire()
+            if waited:
+                self.metrics.record(f"rate_limit_wait_{kind}", waited)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:   # Sağlayıcı hataları tiplenmemiş gelebilir
+                last_error = exc
+                self.breaker.record_failure()
+                self.metrics.count("upstream_errors", source=kind, error=type(exc).__name__)
+                continue
+            if kind == "prices" and not result:
+                last_error = FetchError("Boş fiyat yanıtı")
+                self.breaker.record_failure()
+                self.metrics.count("upstream_errors", source=kind, error="empty")
+                continue
+            self.breaker.record_success()
+            return result
+        raise FetchError(f"{kind}: {self.retry.attempts} denemede alınamadı") from last_error
+
+    def fetch_prices(self, symbols: list[str], **kwargs) -> dict:
+        span = tuple(sorted(kwargs.items()))
+        try:
+            raw = self._call("prices", self.source.fetch_prices, symbols, **kwargs)
+            frames = {s: df for s, df in raw.items() if df is not None and not df.empty}
+        except FetchError:
+            frames = {}
+            if not any((s, span) in self._last_prices for s in symbols):
+                raise
+
+        with self._lock:
+            for sym in symbols:
+                key = (sym, span)
+                if sym in frames:
+                    self._last_prices[key] = frames[sym]
+                elif key in self._last_prices:
+                    frames[sym] = self._last_prices[key]
+                    self.metrics.count("stale_served", source="prices")
+                else:
+                    continue
+                self._last_prices.move_to_end(key)
+            # Delta indirmelerinin start= değeri her gün değişir; eski anahtarlar düşer
+            while len(self._last_prices) > STALE_PRICE_ENTRIES:
+                self._last_prices.popitem(last=False)
+        return frames
+
+    def fetch_fundamentals(self, symbol: str) -> dict:
+        try:
+            info = self._call("fundamentals", self.source.fetch_fundamentals, symbol)
+        except FetchError:
+            with self._lock:
+                stale = self._last_fundamentals.get(symbol)
+            if stale is None:
+                raise
+            self.metrics.count("stale_served", source="fundamentals")
+            return stale
+        if info and any(v is not None for v in info.values()):
+            with self._lock:
+                self._last_fundamentals[symbol] = info
+        return info
@@ -0,0 +1,149 @@
+"""
+Temel veri önbelleği - diske yazılır, her alanın kendi TTL'i vardır.
+Sektör ve şirket adı pratikte kalıcıdır; çarpanlar günde bir yenilenir.
+Veri dönmeyen hisseler de (negatif sonuç) bir süre tekrar sorulmaz; istek hataları
+(kısıtlama, devre kesici) geçici sayılır ve negatif önbelleğe yazılmaz.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from data_sources import FUNDAMENTAL_KEYS, to_yf_symbol
+from metrics import NULL_METRICS
+from paths import cache_dir
+
+DAY = 86400
+FIELD_TTL = {              # saniye; None = süresiz
+    "pb":         DAY,
+    "pe":         DAY,
+    "market_cap": DAY,
+    "sector":     None,
+    "name":       None,
+}
+NEGATIVE_TTL = 6 * 3600    # Başarısız hisseler bu süre tekrar denenmez
+
+
+def placeholder(ticker: str) -> dict:
+    """Veri yokken kullanılan boş kayıt."""
+    return {"pb": None, "pe": None, "market_cap": None, "sector": "Bilinmiyor", "name": ticker}
+
+
+class FundamentalsCache:
+    """
+    Hisse başına temel veri kaydı: {"values": {...}, "fetched": {alan: zaman}, "failed_at": zaman,
+    "missing": {kalıcı alan: boş geldiği zaman}}
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None,
+                 field_ttl: dict[str, float | None] | None = None,
+                 negative_ttl: float = NEGATIVE_TTL):
+        self.path = Path(path) if path else cache_dir() / "fundamentals.json"
+        self.field_ttl = {**FIELD_TTL, **(field_ttl or {})}
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _stale_fields(self, entry: dict, now: float) -> list[str]:
+        fetched = entry.get("fetched", {})
+        missing = entry.get("missing", {})
+        stale = []
+        for field, ttl in self.field_ttl.items():
+            ts = fetched.get(field)
+            if ts is None:
+                # Kalıcı alan hiç dolmadıysa boş gelişi negatif sonuç gibi bir süre geçerlidir
+                ts, ttl = missing.get(field), self.negative_ttl
+            if ts is None or (ttl is not None and now - ts > ttl):
+                stale.append(field)
+        return stale
+
+    def _values(self, ticker: str, entry: dict | None) -> dict:
+        values = placeholder(ticker)
+        if entry:
+            values.update({k: v for k, v in entry.get("values", {}).items() if v is not None})
+        return values
+
+    def peek(self, ticker: str, max_age: float | None = None) -> dict | None:
+        """
+        Önbellekteki değerler (bayat olsa da); hiç kayıt yoksa None. İstek atmaz.
+        max_age verilirse süreli alanlardan bundan eski olanlar None döner.
+        """
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if not entry:
+                return None
+            values = self._values(ticker, entry)
+            if max_age is not None:
+                fetched, now = entry.get("fetched", {}), time.time()
+                for field, ttl in self.field_ttl.items():
+                    ts = fetched.get(field)
+                    if ttl is not None and (ts is None or now - ts > max_age):
+                        values[field] = None
+            return values
+
+    def get(self, ticker: str, fetch: Callable[[str], dict], metrics=NULL_METRICS) -> dict:
+        """
+        Önbellekten döner; bayat alan varsa fetch(yahoo_sembolü) ile yeniler.
+        fetch başarısız olursa eldeki (bayat) değerler veya boş kayıt döner (hata sayılır).
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None:
+                if not self._stale_fields(entry, now):
+                    metrics.count("cache_requests", cache="fundamentals", result="hit")
+                    return self._values(ticker, entry)
+                failed_at = entry.get("failed_at")
+                if failed_at and now - failed_at < self.negative_ttl:
+                    metrics.count("cache_requests", cache="fundamentals", result="negative")
+                    return self._values(ticker, entry)
+
+        metrics.count("cache_requests", cache="fundamentals", result="miss")
+        try:
+            raw, reason = fetch(to_yf_symbol(ticker)) or {}, "empty"
+        except Exception:
+            raw, reason = {}, "error"
+        ok = any(raw.get(field) is not None for field in FUNDAMENTAL_KEYS)
+        if not ok:
+            metrics.count("failures", stage="fundamentals", reason=reason)
+
+        with self._lock:
+            entry = self._entries.setdefault(ticker, {"values": {}, "fetched": {}})
+            if ok:
+                missing = entry.setdefault("missing", {})
+                for field in FUNDAMENTAL_KEYS:
+                    value = raw.get(field)
+                    # Kalıcı alanlar boş gelirse eski değer korunur; hiç değer yoksa boş
+                    # geliş zamanı yazılır ki alan her taramada yeniden istenmesin
+                    if value is None and self.field_ttl.get(field) is None:
+                        if field not in entry["fetched"]:
+                            missing[field] = now
+                        continue
+                    entry["values"][field] = value
+                    entry["fetched"][field] = now
+                    missing.pop(field, None)
+                if not missing:
+                    del entry["missing"]
+                entry.pop("failed_at", None)
+            elif reason == "empty":
+                entry["failed_at"] = now
+            self._dirty = True
+            return self._values(ticker, entry)
+
+    def flush(self):
+        """Değişiklik varsa önbelleği atomik olarak diske yazar."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._entries, ensure_ascii=False)
+            self._dirty = False
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,403 @@
+"""
+Teknik indikatörler - tek hisse (DataFrame) ve panel (tarih × hisse matrisi) modları.
+Panel modu tüm evreni tek bir NumPy geçişinde hesaplar; sonuçlar hisse bazında
+calculate_indicators ile birebir aynıdır (pandas'ın ewm/rolling algoritmaları
+aynı işlem sırasıyla uygulanır).
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+INDICATOR_COLUMNS = ["EMA50", "EMA200", "RSI", "MACD", "MACD_Signal", "MACD_Hist", "ATR", "Vol_MA5"]
+
+
+def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """EMA, RSI, MACD, ATR hesaplar."""
+    df = df.copy()
+    close = df["Close"]
+
+    # EMA
+    df["EMA50"]  = close.ewm(span=50, adjust=False).mean()
+    df["EMA200"] = close.ewm(span=200, adjust=False).mean()
+
+    # RSI
+    delta = close.diff()
+    gain  = delta.clip(lower=0).rolling(14).mean()
+    loss  = (-delta.clip(upper=0)).rolling(14).mean()
+    rs    = gain / loss.replace(0, np.nan)
+    df["RSI"] = 100 - (100 / (1 + rs))
+
+    # MACD
+    ema12 = close.ewm(span=12, adjust=False).mean()
+    ema26 = close.ewm(span=26, adjust=False).mean()
+    df["MACD"]        = ema12 - ema26
+    df["MACD_Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
+    df["MACD_Hist"]   = df["MACD"] - df["MACD_Signal"]
+
+    # ATR
+    high, low = df["High"], df["Low"]
+    tr = pd.concat([high - low,
+                    (high - close.shift()).abs(),
+                    (low  - close.shift()).abs()], axis=1).max(axis=1)
+    df["ATR"] = tr.rolling(14).mean()
+
+    # Hacim ortalaması
+    df["Vol_MA5"] = df["Volume"].rolling(5).mean()
+
+    return df
+
+# ─────────────────────────────────────────────
+# PANEL MODU (tarih × hisse)
+# ─────────────────────────────────────────────
+
+def ema_alpha(span):
+    """pandas ewm(span=...) ile aynı alfa (com üzerinden)."""
+    com = (span - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+def ewm_mean(x: np.ndarray, span) -> np.ndarray:
+    """
+    Kolon bazlı ewm(span, adjust=False).mean(); zaman ekseninde döngü, hisse ekseninde vektörel.
+    span tek sayı veya kolon başına dizi olabilir. Her kolon ilk satırdan itibaren
+    kesintisiz olmalıdır (sondaki NaN'ler önemsizdir) - panel modu bunu sağlar.
+    """
+    alpha  = ema_alpha(np.asarray(span, dtype="f8"))
+    factor = 1.0 - alpha
+    denom  = factor + alpha          # pandas: old_wt + new_wt (tam olarak 1 olmayabilir)
+    out = np.empty(x.shape)
+    weighted = x[0].astype("f8")
+    out[0] = weighted
+    with np.errstate(invalid="ignore"):
+        for i in range(1, len(x)):
+            cur = x[i]
+            weighted = np.where(weighted != cur, (factor * weighted + alpha * cur) / denom, weighted)
+            out[i] = weighted
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Kolon bazlı rolling(window).mean(); pandas'ın Kahan düzeltmeli
+    ekle/çıkar toplamı ve aynı-değer düzeltmesi ile.
+    """
+    n_cols = x.shape[1:]
+    out     = np.empty_like(x, dtype="f8")
+    nobs    = np.zeros(n_cols, dtype="i8")
+    neg_ct  = np.zeros(n_cols, dtype="i8")
+    same_ct = np.zeros(n_cols, dtype="i8")
+    sum_x   = np.zeros(n_cols)
+    comp_add = np.zeros(n_cols)
+    comp_rem = np.zeros(n_cols)
+    prev = x[0].astype("f8")
+
+    for i in range(len(x)):
+        if i >= window:
+            val = x[i - window]
+            obs = val == val
+            y = -val - comp_rem
+            t = sum_x + y
+            comp_rem = np.where(obs, t - sum_x - y, comp_rem)
+            sum_x    = np.where(obs, t, sum_x)
+            nobs    -= obs
+            neg_ct  -= obs & np.signbit(val)
+
+        val = x[i]
+        obs = val == val
+        y = val - comp_add
+        t = sum_x + y
+        comp_add = np.where(obs, t - sum_x - y, comp_add)
+        sum_x    = np.where(obs, t, sum_x)
+        nobs    += obs
+        neg_ct  += obs & np.signbit(val)
+        same_ct  = np.where(obs, np.where(val == prev, same_ct + 1, 1), same_ct)
+        prev     = np.where(obs, val, prev)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sum_x / nobs
+        mean = np.where(same_ct >= nobs, prev, mean)
+        mean = np.where((neg_ct == 0) & (mean < 0), 0.0, mean)
+        mean = np.where((neg_ct == nobs) & (mean > 0), 0.0, mean)
+        out[i] = np.where((nobs >= window) & (nobs > 0), mean, np.nan)
+    return out
+
+
+def _pack(values: np.ndarray, order: np.ndarray) -> np.ndarray:
+    return np.take_along_axis(values, order, axis=0)
+
+
+def _unpack(packed: np.ndarray, order: np.ndarray) -> np.ndarray:
+    out = np.empty_like(packed)
+    np.put_along_axis(out, order, packed, axis=0)
+    return out
+
+
+def panel_arrays(close: pd.DataFrame, high: pd.DataFrame,
+                 low: pd.DataFrame, volume: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Hizalanmış tarih × hisse matrisleri için tüm indikatörleri tek geçişte hesaplar.
+    Close'u boş olan satırlar hisse bazında yok sayılır: her kolonun geçerli barları
+    üste toplanır, hesap yapılır ve sonuç eski yerine dağıtılır. Böylece farklı
+    tarihte başlayan veya boşluklu hisseler de calculate_indicators ile aynı sonucu verir.
+    """
+    c = close.to_numpy(dtype="f8")
+    valid = ~np.isnan(c)
+    order = np.argsort(~valid, axis=0, kind="stable")   # geçerli satırlar önce, sıra korunur
+    packed_valid = _pack(valid, order)
+
+    c = _pack(c, order)
+    h = _pack(high.reindex_like(close).to_numpy(dtype="f8"), order)
+    l = _pack(low.reindex_like(close).to_numpy(dtype="f8"), order)
+    v = _pack(volume.reindex_like(close).to_numpy(dtype="f8"), order)
+
+    n = c.shape[1]
+    prev_c = np.vstack([np.full((1, n), np.nan), c[:-1]])
+    delta  = c - prev_c
+    with np.errstate(invalid="ignore"):
+        tr = np.fmax(np.fmax(h - l, np.abs(h - prev_c)), np.abs(l - prev_c))
+
+    # Aynı pencereli seriler yan yana dizilip tek döngüde hesaplanır
+    spans = np.repeat([12.0, 26.0, 50.0, 200.0], n)
+    ema12, ema26, ema50, ema200 = np.split(ewm_mean(np.tile(c, 4), spans), 4, axis=1)
+    macd   = ema12 - ema26
+    signal = ewm_mean(macd, 9)
+
+    stacked = np.hstack([np.maximum(delta, 0), -np.minimum(delta, 0), tr])
+    gain, loss, atr = np.split(rolling_mean(stacked, 14), 3, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs  = gain / np.where(loss == 0, np.nan, loss)
+        rsi = 100 - (100 / (1 + rs))
+
+    result = {
+        "EMA50":       ema50,
+        "EMA200":      ema200,
+        "RSI":         rsi,
+        "MACD":        macd,
+        "MACD_Signal": signal,
+        "MACD_Hist":   macd - signal,
+        "ATR":         atr,
+        "Vol_MA5":     rolling_mean(v, 5),
+    }
+
+    return {name: _unpack(np.where(packed_valid, arr, np.nan), order) for name, arr in result.items()}
+
+
+def panel_indicators(close: pd.DataFrame, high: pd.DataFrame,
+                     low: pd.DataFrame, volume: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """panel_arrays'in DataFrame döndüren hali (indikatör adı -> tarih × hisse)."""
+    arrays = panel_arrays(close, high, low, volume)
+    return {name: pd.DataFrame(arr, index=close.index, columns=close.columns)
+            for name, arr in arrays.items()}
+
+
+def build_panel(frames: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Hisse başına fiyat DataFrame'lerini Close/High/Low/Volume matrislerine hizalar."""
+    fields = {}
+    for field in ("Close", "High", "Low", "Volume"):
+        fields[field] = pd.DataFrame({t: df[field] for t, df in frames.items()}).sort_index()
+    return fields
+
+
+def annotate_frames(frames: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """
+    Panel modu ile tüm hisselerin indikatörlerini hesaplayıp her DataFrame'e ekler.
+    Çıktı, her hisse için calculate_indicators(df) ile aynıdır.
+    """
+    if not frames:
+        return {}
+    panel = build_panel(frames)
+    close = panel["Close"]
+    arrays = panel_arrays(close, panel["High"], panel["Low"], panel["Volume"])
+    stacked = np.stack([arrays[name] for name in INDICATOR_COLUMNS], axis=-1)   # tarih × hisse × indikatör
+
+    annotated = {}
+    for t, df in frames.items():
+        j = close.columns.get_loc(t)
+        rows = close.index.get_indexer(df.index)
+        ind = pd.DataFrame(stacked[rows, j], index=df.index, columns=INDICATOR_COLUMNS)
+        annotated[t] = pd.concat([df, ind], axis=1)
+    return annotated
+
+# ─────────────────────────────────────────────
+# ARTIMLI (O(1)) GÜNCELLEME
+# ─────────────────────────────────────────────
+
+RSI_WINDOW   = 14
+ATR_WINDOW   = 14
+VOL_WINDOW   = 5
+HISTORY_BARS = 6     # score_ticker son iki satıra ve 6 barlık RSI penceresine bakar
+BAR_FIELDS   = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def ema_step(prev: float, value: float, span: int) -> float:
+    """ewm(span, adjust=False) tek adımı; pandas ile aynı işlem sırası."""
+    alpha  = ema_alpha(span)
+    factor = 1.0 - alpha
+    if prev == value:
+        return prev
+    return (factor * prev + alpha * value) / (factor + alpha)
+
+
+def _push(window: list, value: float, size: int):
+    window.append(value)
+    if len(window) > size:
+        del window[0]
+
+
+def _iso(date) -> str:
+    return date if isinstance(date, str) else pd.Timestamp(date).isoformat()
+
+
+def _window_mean(window: list, size: int) -> float:
+    return sum(window) / size if len(window) == size else float("nan")
+
+
+@dataclass
+class IndicatorState:
+    """
+    Tek hisse için artımlı indikatör durumu. Yeni bir bar sabit sürede işlenir;
+    tüm alanlar JSON'a yazılabilir. Pencere ortalamaları doğrudan toplandığı için
+    calculate_indicators ile farkı kayan nokta yuvarlaması düzeyindedir.
+    """
+    date:        str
+    close:       float
+    ema12:       float
+    ema26:       float
+    ema50:       float
+    ema200:      float
+    macd_signal: float
+    gains:       list = field(default_factory=list)
+    losses:      list = field(default_factory=list)
+    trs:         list = field(default_factory=list)
+    volumes:     list = field(default_factory=list)
+    history:     list = field(default_factory=list)   # son HISTORY_BARS satır (bar + indikatörler)
+    checkpoint:  dict | None = None                   # son bar uygulanmadan önceki durum
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """Fiyat geçmişinden durumu kurar (tek seferlik tam hesap)."""
+        if "EMA50" not in df.columns:
+            df = calculate_indicators(df)
+        close = df["Close"]
+        delta = close.diff()
+        prev_close = close.shift()
+        tr = pd.concat([df["High"] - df["Low"],
+                        (df["High"] - prev_close).abs(),
+                        (df["Low"] - prev_close).abs()], axis=1).max(axis=1)
+        tail = df[BAR_FIELDS + INDICATOR_COLUMNS].tail(HISTORY_BARS)
+        return cls(
+            date        = df.index[-1].isoformat(),
+            close       = float(close.iloc[-1]),
+            ema12       = float(close.ewm(span=12, adjust=False).mean().iloc[-1]),
+            ema26       = float(close.ewm(span=26, adjust=False).mean().iloc[-1]),
+            ema50       = float(df["EMA50"].iloc[-1]),
+            ema200      = float(df["EMA200"].iloc[-1]),
+            macd_signal = float(df["MACD_Signal"].iloc[-1]),
+            gains       = [float(x) for x in delta.clip(lower=0).tail(RSI_WINDOW)],
+            losses      = [float(x) for x in (-delta.clip(upper=0)).tail(RSI_WINDOW)],
+            trs         = [float(x) for x in tr.tail(ATR_WINDOW)],
+            volumes     = [float(x) for x in df["Volume"].tail(VOL_WINDOW)],
+            history     = [{"Date": idx.isoformat(), **{k: float(v) for k, v in row.items()}}
+                           for idx, row in tail.iterrows()],
+        )
+
+    def _snapshot(self) -> dict:
+        # Satırlar oluşturulduktan sonra değişmediği için listelerin sığ kopyası yeterli
+        data = {k: getattr(self, k) for k in _SCALAR_FIELDS}
+        data.update({k: list(getattr(self, k)) for k in _WINDOW_FIELDS})
+        return data
+
+    def update(self, bar: dict) -> dict:
+        """Yeni bir bar ekler ve o barın indikatör satırını döner."""
+        self.checkpoint = self._snapshot()
+        close, high, low = float(bar["Close"]), float(bar["High"]), float(bar["Low"])
+
+        delta = close - self.close
+        _push(self.gains,  max(delta, 0.0),   RSI_WINDOW)
+        _push(self.losses, -min(delta, 0.0),  RSI_WINDOW)
+        _push(self.trs, max(high - low, abs(high - self.close), abs(low - self.close)), ATR_WINDOW)
+        _push(self.volumes, float(bar["Volume"]), VOL_WINDOW)
+
+        self.ema12  = ema_step(self.ema12, close, 12)
+        self.ema26  = ema_step(self.ema26, close, 26)
+        self.ema50  = ema_step(self.ema50, close, 50)
+        self.ema200 = ema_step(self.ema200, close, 200)
+        macd = self.ema12 - self.ema26
+        self.macd_signal = ema_step(self.macd_signal, macd, 9)
+
+        gain = _window_mean(self.gains, RSI_WINDOW)
+        loss = _window_mean(self.losses, RSI_WINDOW)
+        rsi  = 100 - (100 / (1 + gain / loss)) if loss == loss and loss != 0 else float("nan")
+
+        date = _iso(bar["Date"])
+        row = {
+            "Date": date,
+            **{k: float(bar[k]) for k in BAR_FIELDS},
+            "EMA50":       self.ema50,
+            "EMA200":      self.ema200,
+            "RSI":         rsi,
+            "MACD":        macd,
+            "MACD_Signal": self.macd_signal,
+            "MACD_Hist":   macd - self.macd_signal,
+            "ATR":         _window_mean(self.trs, ATR_WINDOW),
+            "Vol_MA5":     _window_mean(self.volumes, VOL_WINDOW),
+        }
+        _push(self.history, row, HISTORY_BARS)
+        self.date, self.close = date, close
+        return row
+
+    def revise(self, bar: dict) -> dict:
+        """Son barı (ör. gün içi güncellenen günlük bar) yeni değerlerle değiştirir."""
+        if self.checkpoint is None:
+            raise ValueError("Geri alınacak bar yok")
+        checkpoint = self.checkpoint
+        for key, value in checkpoint.items():
+            setattr(self, key, value)
+        return self.update(bar)
+
+    def apply(self, bar: dict) -> dict | None:
+        """Bar tarihine göre update/revise seçer; eski tarihli barları yok sayar."""
+        date = _iso(bar["Date"])
+        if date == self.date and self.checkpoint is not None:
+            return self.revise(bar)
+        if date > self.date:
+            return self.update(bar)
+        return None
+
+    def tail_frame(self) -> pd.DataFrame:
+        """score_ticker'a verilebilecek kısa (HISTORY_BARS satırlık) DataFrame."""
+        df = pd.DataFrame(self.history)
+        df.index = pd.DatetimeIndex(df.pop("Date"))
+        return df
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        return cls(**data)
+
+
+_SCALAR_FIELDS = ["date", "close", "ema12", "ema26", "ema50", "ema200", "macd_signal"]
+_WINDOW_FIELDS = ["gains", "losses", "trs", "volumes", "history"]
+
+
+def save_states(path: str | os.PathLike, states: dict[str, IndicatorState]):
+    """Durumları tek JSON dosyasına atomik olarak yazar."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({t: s.to_dict() for t, s in states.items()}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_states(path: str | os.PathLike) -> dict[str, IndicatorState]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {t: IndicatorState.from_dict(s) for t, s in data.items()}
@@ -0,0 +1,271 @@
+"""
+Canlı gün içi mod - seans sırasında tüm evrenin son gün içi barları bir bar kaynağından
+(Yahoo yoklaması veya kayıttan tekrar) alınır, günün barına katlanır ve indikatör
+durumları artımlı güncellenir. Yalnızca günlük barı değişen hisseler yeniden puanlanır.
+
+Bar kaynağı arayüzü:  poll(tickers) -> {hisse: [gün içi bar sözlüğü, ...]}
+Bar sözlüğü: {"Date": zaman damgası, "Open", "High", "Low", "Close", "Volume"}
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dtime
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from data_sources import CHUNK_SIZE, default_source, fetch_chunked, to_yf_symbol
+from indicators import BAR_FIELDS, IndicatorState, annotate_frames
+from metrics import NULL_METRICS, ScanMetrics
+from results import DEFAULT_CONFIG, ScanResult, ScoreConfig
+from scoring import score_ticker
+
+BIST_TZ           = ZoneInfo("Europe/Istanbul")
+SESSION_OPEN      = dtime(10, 0)
+SESSION_CLOSE     = dtime(18, 10)   # Kapanış seansı dahil
+INTRADAY_INTERVAL = "5m"
+
+
+def market_open(now: datetime | None = None) -> bool:
+    """Borsa İstanbul pay piyasası seansı açık mı (hafta içi 10:00-18:10, resmi tatiller hariç)."""
+    now = now.astimezone(BIST_TZ) if now else datetime.now(BIST_TZ)
+    return now.weekday() < 5 and SESSION_OPEN <= now.time() < SESSION_CLOSE
+
+
+def session_date(ts) -> pd.Timestamp:
+    """Gün içi zaman damgasının ait olduğu işlem günü (günlük barlarla aynı, saat dilimsiz)."""
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(BIST_TZ).tz_localize(None)
+    return ts.normalize()
+
+
+def frame_bars(df: pd.DataFrame) -> list[dict]:
+    """Gün içi DataFrame'i bar sözlüklerine çevirir; Close'u boş satırlar atlanır."""
+    df = df.dropna(subset=["Close"])
+    return [{"Date": idx, **{k: float(row[k]) for k in BAR_FIELDS}}
+            for idx, row in df[BAR_FIELDS].iterrows()]
+
+
+# ─────────────────────────────────────────────
+# BAR KAYNAKLARI
+# ─────────────────────────────────────────────
+
+class PollingBarSource:
+    """
+    Fiyat kaynağını (YFinanceSource, ResilientSource...) gün içi aralıkla yoklar.
+    Her yoklama günün tüm barlarını döner; oluşmakta olan son bar da dahildir,
+    tekrarlar LiveSession'da ayıklanır.
+    """
+
+    def __init__(self, source=None, interval: str = INTRADAY_INTERVAL, chunk_size: int = CHUNK_SIZE,
+                 metrics: ScanMetrics = NULL_METRICS):
+        self.source = source or default_source()
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.metrics = metrics
+
+    def poll(self, tickers: list[str]) -> dict[str, list[dict]]:
+        symbols = {to_yf_symbol(t): t for t in tickers}
+        raw = fetch_chunked(list(symbols), self.source, self.chunk_size, metrics=self.metrics,
+                            period="1d", interval=self.interval)
+        return {symbols[sym]: frame_bars(df) for sym, df in raw.items() if df is not None and not df.empty}
+
+
+class ReplayBarSource:
+    """
+    Kaydedilmiş gün içi barları zaman sırasıyla akıtır (çevrimdışı deneme için).
+    Her poll çağrısı sıradaki step zaman damgasının barlarını döner; kayıt bitince boş döner.
+    Kayıt uzun formattadır: Date, Ticker, Open, High, Low, Close, Volume.
+    """
+
+    def __init__(self, bars: pd.DataFrame, step: int = 1):
+        bars = bars.copy()
+        bars["Date"] = pd.to_datetime(bars["Date"])
+        self._bars = bars.sort_values(["Date", "Ticker"], kind="stable")
+        self._times = self._bars["Date"].unique()
+        self.step = step
+        self.position = 0
+
+    @classmethod
+    def from_csv(cls, path: str | os.PathLike, step: int = 1) -> "ReplayBarSource":
+        return cls(pd.read_csv(path), step=step)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.position >= len(self._times)
+
+    def poll(self, tickers: list[str]) -> dict[str, list[dict]]:
+        if self.exhausted:
+            return {}
+        times = self._times[self.position:self.position + self.step]
+        self.position += len(times)
+        chunk = self._bars[self._bars["Date"].isin(times) & self._bars["Ticker"].isin(tickers)]
+        return {t: frame_bars(df.set_index("Date")) for t, df in chunk.groupby("Ticker", sort=False)}
+
+
+def record_bars(frames: dict[str, pd.DataFrame], path: str | os.PathLike):
+    """Hisse başına gün içi DataFrame'leri ReplayBarSource'un okuyacağı uzun formatta yazar."""
+    long = pd.concat([df[BAR_FIELDS].assign(Ticker=t) for t, df in frames.items()])
+    long.index.name = "Date"
+    long.reset_index()[["Date", "Ticker", *BAR_FIELDS]].to_csv(path, index=False)
+
+
+def default_bar_source(metrics: ScanMetrics = NULL_METRICS):
+    """BIST_LIVE_REPLAY bir kayıt dosyasını gösteriyorsa tekrar kaynağı, değilse Yahoo yoklaması."""
+    replay = os.environ.get("BIST_LIVE_REPLAY")
+    if replay:
+        return ReplayBarSource.from_csv(replay)
+    return PollingBarSource(metrics=metrics)
+
+
+# ─────────────────────────────────────────────
+# GÜNLÜK BAR BİRİKTİRME
+# ─────────────────────────────────────────────
+
+@dataclass(slots=True)
+class DayBar:
+    """
+    Gün içi barlardan oluşan günlük bar. Kapanmış barlar toplamda, oluşmakta olan
+    son bar ayrı tutulur; aynı zaman damgalı bar gelirse yalnızca o değiştirilir (O(1)).
+    """
+    date:    pd.Timestamp
+    open:    float
+    high:    float = float("-inf")
+    low:     float = float("inf")
+    volume:  float = 0.0
+    last_ts: pd.Timestamp | None = None
+    forming: dict | None = None
+
+    def add(self, ts: pd.Timestamp, bar: dict) -> bool:
+        """Barı ekler; eski tarihli veya aynı değerli tekrarlarda False döner."""
+        if self.last_ts is not None and ts < self.last_ts:
+            return False
+        if ts == self.last_ts:
+            if bar == self.forming:
+                return False
+        elif self.forming is not None:
+            self.high = max(self.high, self.forming["High"])
+            self.low = min(self.low, self.forming["Low"])
+            self.volume += self.forming["Volume"]
+        self.last_ts, self.forming = ts, bar
+        return True
+
+    def bar(self) -> dict:
+        f = self.forming
+        return {
+            "Date":   self.date,
+            "Open":   self.open,
+            "High":   max(self.high, f["High"]),
+            "Low":    min(self.low, f["Low"]),
+            "Close":  f["Close"],
+            "Volume": self.volume + f["Volume"],
+        }
+
+
+# ─────────────────────────────────────────────
+# CANLI OTURUM
+# ─────────────────────────────────────────────
+
+class LiveSession:
+    """
+    Hisse başına IndicatorState ve son ScanResult tutar. apply ile gelen barlar günlük
+    bara katlanır; günlük barı değişen hisselerin indikatörleri tek adımda güncellenip
+    yeniden puanlanır, diğerlerinin sonucu olduğu gibi kalır.
+    """
+
+    def __init__(self, states: dict[str, IndicatorState],
+                 get_fundamentals: Callable[[str], dict],
+                 config: ScoreConfig = DEFAULT_CONFIG,
+                 metrics: ScanMetrics = NULL_METRICS):
+        self.states = states
+        self.get_fundamentals = get_fundamentals
+        self.config = config
+        self.metrics = metrics
+        self.days: dict[str, DayBar] = {}
+        self.results: dict[str, ScanResult] = {}
+        self.updated_at: float | None = None
+        for ticker in states:
+            self._rescore(ticker)
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, pd.DataFrame], get_fundamentals: Callable[[str], dict],
+                    config: ScoreConfig = DEFAULT_CONFIG,
+                    metrics: ScanMetrics = NULL_METRICS) -> "LiveSession":
+        """
+        Günlük geçmişten oturum kurar. Son bar ayrıca uygulanır ki durumda geri alma noktası
+        olsun: geçmiş bugünün yarım barını içeriyorsa canlı barlar onu revize eder.
+        """
+        with metrics.timer("indicators"):
+            annotated = annotate_frames({t: df for t, df in frames.items() if len(df) > 1})
+        states = {}
+        for ticker, df in annotated.items():
+            state = IndicatorState.from_frame(df.iloc[:-1])
+            last = df.iloc[-1]
+            state.update({"Date": df.index[-1], **{k: last[k] for k in BAR_FIELDS}})
+            states[ticker] = state
+        return cls(states, get_fundamentals, config, metrics)
+
+    def _rescore(self, ticker: str):
+        with self.metrics.timer("score", ticker):
+            result = score_ticker(ticker, self.states[ticker].tail_frame(), self.get_fundamentals, self.config)
+        if result is None:
+            self.results.pop(ticker, None)
+        else:
+            self.results[ticker] = result
+
+    def _fold(self, ticker: str, bars: list[dict]) -> list[dict]:
+        """
+        Barları hissenin günlük barına katlar; değişen günlük barları tarih sırasıyla döner.
+        Yoklama gün dönümünü kapsıyorsa önceki günün son hali de listededir.
+        """
+        daily, changed = [], False
+        for bar in bars:
+            ts = pd.Timestamp(bar["Date"])
+            date = session_date(ts)
+            day = self.days.get(ticker)
+            if day is None or date > day.date:
+                if changed:
+                    daily.append(day.bar())
+                day = self.days[ticker] = DayBar(date=date, open=float(bar["Open"]))
+                changed = False
+            elif date < day.date:
+                continue
+            changed |= day.add(ts, {k: float(bar[k]) for k in BAR_FIELDS})
+        if changed:
+            daily.append(self.days[ticker].bar())
+        return daily
+
+    def apply(self, bars: dict[str, list[dict]]) -> set[str]:
+        """Gelen barları işler, yeniden puanlanan hisseleri döner."""
+        changed = set()
+        with self.metrics.timer("live_update"):
+            for ticker, ticker_bars in bars.items():
+                state = self.states.get(ticker)
+                if state is None or not ticker_bars:
+                    continue
+                rows = [state.apply(daily) for daily in self._fold(ticker, ticker_bars)]
+                if any(row is not None for row in rows):
+                    changed.add(ticker)
+        for ticker in changed:
+            self._rescore(ticker)
+        self.metrics.count("live_rescored", len(changed))
+        self.updated_at = time.time()
+        return changed
+
+    def step(self, bar_source) -> set[str]:
+        """Kaynağı bir kez yoklar ve gelen barları uygular."""
+        with self.metrics.timer("live_poll"):
+            bars = bar_source.poll(list(self.states))
+        return self.apply(bars)
+
+    def top(self, n: int | None = None, min_score: float = 0,
+            tickers: list[str] | None = None) -> list[ScanResult]:
+        """Güncel sıralama (Snapshot.select ile aynı filtreler)."""
+        allowed = set(tickers) if tickers is not None else None
+        matched = [r for r in self.results.values()
+                   if r.score_pct >= min_score and (allowed is None or r.ticker in allowed)]
+        matched.sort(key=lambda r: r.score_pct, reverse=True)
+        return matched[:n] if n else matched
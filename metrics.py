@@ -0,0 +1,169 @@
+"""
+Tarama ölçümleri - aşama/hisse bazında süreler ve olay sayaçları (önbellek isabeti,
+hata, zaman aşımı). Thread-safe'tir; JSON ve Prometheus metin formatında dışa aktarılır.
+Bu modül yalnızca standart kütüphaneyi kullanır.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+PROMETHEUS_PREFIX = "bist_scan"
+
+
+@dataclass(slots=True)
+class StageStats:
+    count: int = 0
+    total: float = 0.0   # saniye
+    max:   float = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ScanMetrics:
+    """
+    Aşamalar: fetch_prices, store_refresh, indicators, fundamentals, score, render...
+    Sayaçlar etiketlidir, ör. count("cache_requests", cache="price", result="hit").
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._stages: dict[str, StageStats] = {}
+        self._tickers: dict[str, dict[str, float]] = {}
+        self._counters: dict[tuple, int] = {}
+
+    def record(self, stage: str, seconds: float, ticker: str | None = None):
+        with self._lock:
+            self._stages.setdefault(stage, StageStats()).add(seconds)
+            if ticker is not None:
+                per = self._tickers.setdefault(ticker, {})
+                per[stage] = per.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, stage: str, ticker: str | None = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, ticker)
+
+    def count(self, name: str, n: int = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def counter(self, name: str, **labels) -> int:
+        """Etiketleri verilenlerle eşleşen sayaçların toplamı."""
+        wanted = set(labels.items())
+        with self._lock:
+            return sum(v for (n, lbl), v in self._counters.items()
+                       if n == name and wanted <= set(lbl))
+
+    def ticker_time(self, ticker: str, stage: str) -> float:
+        with self._lock:
+            return self._tickers.get(ticker, {}).get(stage, 0.0)
+
+    @property
+    def stages(self) -> dict[str, StageStats]:
+        with self._lock:
+            return {k: StageStats(v.count, v.total, v.max) for k, v in self._stages.items()}
+
+    def slowest(self, n: int = 10, stage: str | None = None) -> list[tuple[str, float]]:
+        """En yavaş hisseler (stage verilmezse tüm aşamaların toplamı)."""
+        with self._lock:
+            totals = [(t, per.get(stage, 0.0) if stage else sum(per.values()))
+                      for t, per in self._tickers.items()]
+        return sorted(totals, key=lambda x: x[1], reverse=True)[:n]
+
+    def merge(self, other: "ScanMetrics"):
+        """other'ın aşama ve sayaçlarını bu nesneye ekler."""
+        data = other.to_dict()
+        with self._lock:
+            for stage, st in data["stages"].items():
+                mine = self._stages.setdefault(stage, StageStats())
+                mine.count += st["count"]
+                mine.total += st["total"]
+                mine.max = max(mine.max, st["max"])
+            for c in data["counters"]:
+                key = (c["name"], tuple(sorted(c["labels"].items())))
+                self._counters[key] = self._counters.get(key, 0) + c["value"]
+
+    # ── Dışa aktarma ──────────────────────────
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "stages": {k: {"count": v.count, "total": v.total, "mean": v.mean, "max": v.max}
+                           for k, v in self._stages.items()},
+                "counters": [{"name": n, "labels": dict(lbl), "value": v}
+                             for (n, lbl), v in sorted(self._counters.items())],
+                "tickers": {t: dict(per) for t, per in self._tickers.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScanMetrics":
+        metrics = cls()
+        metrics.started_at = data.get("started_at", metrics.started_at)
+        for stage, s in data.get("stages", {}).items():
+            metrics._stages[stage] = StageStats(s["count"], s["total"], s["max"])
+        for c in data.get("counters", []):
+            metrics._counters[(c["name"], tuple(sorted(c["labels"].items())))] = c["value"]
+        metrics._tickers = {t: dict(per) for t, per in data.get("tickers", {}).items()}
+        return metrics
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Prometheus metin formatı (hisse bazındaki süreler kardinalite yüzünden dışarıda)."""
+        data = self.to_dict()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Aşama süreleri",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, s in sorted(data["stages"].items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {s["total"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        lines.append(f"# TYPE {prefix}_stage_seconds_max gauge")
+        for stage, s in sorted(data["stages"].items()):
+            lines.append(f'{prefix}_stage_seconds_max{{stage="{stage}"}} {s["max"]:.6f}')
+
+        names = sorted({c["name"] for c in data["counters"]})
+        for name in names:
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for c in data["counters"]:
+                if c["name"] == name:
+                    labels = ",".join(f'{k}="{v}"' for k, v in c["labels"].items())
+                    lines.append(f"{prefix}_{name}_total{{{labels}}} {c['value']}")
+        lines.append(f"# TYPE {prefix}_started_at_seconds gauge")
+        lines.append(f"{prefix}_started_at_seconds {data['started_at']:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str):
+        """Uzantı .prom/.txt ise Prometheus, değilse JSON yazar."""
+        text = self.to_prometheus() if str(path).endswith((".prom", ".txt")) else self.to_json(indent=2)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+class _NullMetrics(ScanMetrics):
+    """Ölçüm istenmediğinde kullanılır; kayıt tutmaz."""
+
+    def record(self, stage, seconds, ticker=None):
+        pass
+
+    def count(self, name, n=1, **labels):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
@@ -0,0 +1,210 @@
+"""
+Parametre taraması - ScoreConfig ağırlık/eşik kombinasyonlarını geçmiş test üzerinde
+değerlendirir. İndikatör matrisleri bir kez hesaplanır ve her worker sürecine
+başlangıçta bir kez aktarılır; aynı eşikleri paylaşan kombinasyonlar kriter
+matrislerini de paylaşır, yalnızca ağırlıklı toplam ve simülasyon tekrarlanır.
+
+Izgara kombinasyonları tembel üretilir; GRID_LIMIT'i aşan ızgaralar (ör. --with-fundamentals
+ile ~5,6 milyon) reddedilir, bunun yerine --random ile örnekleme yapılır.
+
+Kullanım:  python optimizer.py --random 2000 --objective sharpe -o sonuc.csv
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields, replace
+
+import pandas as pd
+
+from backtest import BacktestData, criteria_flags, load_history, score_matrix, simulate
+from results import DEFAULT_CONFIG, ScoreConfig
+
+# ScoreConfig alanı -> denenecek değerler
+SEARCH_SPACE = {
+    "w_ema_cross":     [5, 10, 15, 20],
+    "w_price_above":   [5, 10, 15],
+    "w_rsi_band":      [5, 10, 15],
+    "w_rsi_cross":     [5, 10, 15, 20],
+    "w_macd_turn":     [5, 10, 15],
+    "rsi_low":         [35, 40, 45],
+    "rsi_high":        [60, 65, 70],
+    "rsi_cross_level": [35, 40, 45],
+}
+
+# Temel veri kriterleri yalnızca --with-fundamentals ile anlamlı
+FUNDAMENTAL_SPACE = {
+    "w_pb":     [5, 10, 15],
+    "w_pe":     [5, 10, 15],
+    "w_mcap":   [5, 10],
+    "pb_max":   [1.0, 1.5, 2.0],
+    "pe_max":   [10, 15, 20],
+    "mcap_min": [500_000_000, 1_000_000_000, 5_000_000_000],
+}
+
+OBJECTIVES = ("sharpe", "total_return", "cagr", "hit_rate", "avg_trade")
+CHUNK_SIZE = 64         # Bir worker görevindeki kombinasyon sayısı
+GRID_LIMIT = 200_000    # Bundan büyük ızgaralar reddedilir (--random önerilir)
+THRESHOLD_KEYS = ("rsi_low", "rsi_high", "rsi_cross_level", "pb_max", "pe_max", "mcap_min")
+
+
+def _ordered_keys(space: dict[str, list]) -> list[str]:
+    """Eşik alanları önce: ürünün en yavaş değişen basamakları, aynı eşikler ardışık gelir."""
+    return sorted(space, key=lambda k: k not in THRESHOLD_KEYS)
+
+
+def grid_size(space: dict[str, list]) -> int:
+    return math.prod(len(values) for values in space.values())
+
+
+def grid_configs(space: dict[str, list], base: ScoreConfig = DEFAULT_CONFIG) -> Iterator[ScoreConfig]:
+    """Arama uzayının tüm kombinasyonları - bellekte liste kurulmaz, sırayla üretilir."""
+    keys = _ordered_keys(space)
+    for combo in itertools.product(*(space[k] for k in keys)):
+        yield replace(base, **dict(zip(keys, combo)))
+
+
+def random_configs(space: dict[str, list], n: int, seed: int = 0,
+                   base: ScoreConfig = DEFAULT_CONFIG) -> list[ScoreConfig]:
+    """Arama uzayından tekrarsız n rastgele kombinasyon (uzay küçükse tamamı), eşiklere göre sıralı."""
+    if n >= grid_size(space):
+        return list(grid_configs(space, base))
+    keys = _ordered_keys(space)
+    rng = random.Random(seed)
+    seen = set()
+    while len(seen) < n:
+        seen.add(tuple(rng.choice(space[k]) for k in keys))
+    return [replace(base, **dict(zip(keys, combo))) for combo in sorted(seen)]
+
+
+def _chunks(configs: Iterable[ScoreConfig], size: int) -> Iterator[list[ScoreConfig]]:
+    it = iter(configs)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+# ─────────────────────────────────────────────
+# Worker süreci
+# ─────────────────────────────────────────────
+_DATA: BacktestData | None = None
+_SIM_PARAMS: dict = {}
+
+
+def _init_worker(data: BacktestData, sim_params: dict):
+    """Her süreçte bir kez çalışır; matrisler görev başına tekrar gönderilmez."""
+    global _DATA, _SIM_PARAMS
+    _DATA, _SIM_PARAMS = data, sim_params
+
+
+def _evaluate_chunk(configs: list[ScoreConfig]) -> list[dict]:
+    rows = []
+    flags_key, flags = None, None
+    for config in configs:
+        # Parçalar eşiklere göre sıralı gelir; son kriter matrisleri yeterli
+        if config.thresholds != flags_key:
+            flags_key, flags = config.thresholds, criteria_flags(_DATA, config)
+        try:
+            stats = simulate(_DATA, score_matrix(flags, config), **_SIM_PARAMS).stats
+        except ValueError:
+            continue
+        rows.append({**asdict(config), **stats})
+    return rows
+
+
+def _bounded_map(pool, fn, items: Iterable, limit: int) -> Iterator:
+    """pool.map gibi sıralı sonuç verir, ancak aynı anda en fazla limit görev gönderir
+    (Executor.map tüm girdiyi baştan tüketir)."""
+    inflight: deque = deque()
+    for item in items:
+        inflight.append(pool.submit(fn, item))
+        if len(inflight) >= limit:
+            yield inflight.popleft().result()
+    while inflight:
+        yield inflight.popleft().result()
+
+
+def optimize(data: BacktestData, configs: Iterable[ScoreConfig], objective: str = "sharpe",
+             processes: int | None = None, min_trades: int = 20,
+             chunk_size: int = CHUNK_SIZE, **sim_params) -> pd.DataFrame:
+    """
+    Kombinasyonları süreç havuzunda değerlendirir, objective'e göre azalan sıralı tablo döner.
+    configs tembel bir üreteç olabilir; havuza chunk_size'lık parçalar halinde, sınırlı sayıda
+    bekleyen görevle aktarılır. Aynı eşikli kombinasyonlar ardışık gelirse kriter matrisleri
+    paylaşılır (grid_configs ve random_configs böyle üretir).
+    min_trades'ten az işlem üreten kombinasyonlar elenir. processes=1 havuz kurmaz.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Bilinmeyen hedef: {objective}")
+    chunks = _chunks(configs, chunk_size)
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        _init_worker(data, sim_params)
+        rows = [row for batch in map(_evaluate_chunk, chunks) for row in batch]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(data, sim_params)) as pool:
+            batches = _bounded_map(pool, _evaluate_chunk, chunks, limit=4 * processes)
+            rows = [row for batch in batches for row in batch]
+
+    columns = [f.name for f in fields(ScoreConfig)]
+    df = pd.DataFrame(rows, columns=columns + ["total_return", "cagr", "max_drawdown",
+                                               "sharpe", "trades", "hit_rate", "avg_trade"])
+    df = df[df["trades"] >= min_trades]
+    return df.sort_values(objective, ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Skor ağırlık/eşik optimizasyonu")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--random", type=int, metavar="N",
+                        help="Izgara yerine N rastgele kombinasyon dene")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="sharpe")
+    parser.add_argument("--processes", type=int, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--min-trades", type=int, default=20)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--min-score", type=float, default=30)
+    parser.add_argument("--hold", type=int, default=10, help="Tutma süresi (bar)")
+    parser.add_argument("--stop-atr", type=float, default=2.0)
+    parser.add_argument("--target-atr", type=float, default=3.0)
+    parser.add_argument("--cost", type=float, default=0.002)
+    parser.add_argument("--with-fundamentals", action="store_true",
+                        help="Temel veri ağırlık/eşiklerini de tara (ileriye bakma yanlılığı)")
+    parser.add_argument("--grid-limit", type=int, default=GRID_LIMIT,
+                        help="Izgara modunda izin verilen en fazla kombinasyon")
+    parser.add_argument("--show", type=int, default=10, help="Ekrana yazılacak satır sayısı")
+    parser.add_argument("-o", "--output", help="Tüm sonuçları CSV olarak yaz")
+    args = parser.parse_args(argv)
+
+    space = {**SEARCH_SPACE, **(FUNDAMENTAL_SPACE if args.with_fundamentals else {})}
+    total = min(args.random, grid_size(space)) if args.random else grid_size(space)
+    if not args.random and total > args.grid_limit:
+        parser.error(f"ızgara {total:,} kombinasyon (sınır {args.grid_limit:,}); "
+                     f"--random N ile örnekleyin ya da --grid-limit'i artırın")
+
+    data = load_history(args.years, args.with_fundamentals)
+    configs = (random_configs(space, args.random, args.seed) if args.random
+               else grid_configs(space))
+    print(f"{total} kombinasyon, {len(data.tickers)} hisse × {len(data.dates)} bar",
+          file=sys.stderr)
+
+    df = optimize(data, configs, objective=args.objective, processes=args.processes,
+                  min_trades=args.min_trades, top_n=args.top_n, min_score=args.min_score,
+                  hold_days=args.hold, stop_atr=args.stop_atr,
+                  target_atr=args.target_atr, cost=args.cost)
+    shown = list(space) + ["sharpe", "total_return", "max_drawdown", "trades", "hit_rate"]
+    print(df[shown].head(args.show).to_string(index=False))
+    if args.output:
+        df.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""
+Önbellek dizini - yalnızca standart kütüphane kullanır; snapshot okuma gibi hafif
+yollar pandas yüklemeden bu modülü import edebilir.
+"""
+
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """Kalıcı önbellek dizini (BIST_CACHE_DIR ile değiştirilebilir)."""
+    path = Path(os.environ.get("BIST_CACHE_DIR", Path.home() / ".cache" / "bist-swing"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
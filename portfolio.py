@@ -0,0 +1,201 @@
+"""
+Portföy aşaması - sıralamadan sonra pozisyon boyutlama. Adayların günlük log getirileri
+tek bir tarih × hisse matrisine dizilir; kovaryans ve korelasyon maskeli matris
+çarpımlarıyla (her çift yalnızca ortak günleriyle) tüm çiftler için birlikte hesaplanır. Matris snapshot başına bir
+kez kurulur, boyutlama her çizimde yalnızca sıralı listenin başından yürür.
+
+Boyutlama: pozisyon başına risk = sermaye × risk oranı, stop = fiyat - stop_atr × ATR,
+adet = risk / (stop mesafesi); ağırlık ve nakit sınırlarıyla kırpılır. Seçilmiş bir
+pozisyonla korelasyonu max_corr'u aşan aday elenir, sıradaki aday denenir. Getiri geçmişi
+bulunamayan aday da (require_corr) sınırsız boyutlanmak yerine nedeniyle elenir.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from results import ScanResult
+
+RETURN_BARS  = 120    # Korelasyon penceresi (≈ 6 ay)
+MIN_OBS      = 60     # Bu sayıdan az ortak getiri günü olan çiftlerin korelasyonu bilinmiyor sayılır
+TRADING_DAYS = 252
+
+
+@dataclass(frozen=True)
+class SizingConfig:
+    capital:        float = 100_000
+    risk_per_trade: float = 0.01    # Stop olursa sermayenin kaybedilecek oranı
+    stop_atr:       float = 2.0     # backtest.simulate ile aynı stop mesafesi
+    max_corr:       float = 0.7     # Seçilmiş pozisyonlarla izin verilen en yüksek korelasyon
+    max_weight:     float = 0.25    # Tek pozisyonun sermayeye oranı üst sınırı
+    max_positions:  int   = 5
+    require_corr:   bool  = True    # Getiri geçmişi olmayan aday korelasyon sınırsız alınmaz
+
+
+@dataclass
+class RiskModel:
+    """Günlük log getiri kovaryansı ve korelasyonu (hisse × hisse)."""
+    tickers: list[str]
+    cov:     np.ndarray
+    corr:    np.ndarray     # Ortak gözlemi MIN_OBS altındaki çiftler NaN
+
+    def __post_init__(self):
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+
+    def __contains__(self, ticker: str) -> bool:
+        """Hisse modelde ve en az MIN_OBS getirisi var (korelasyon sınırı uygulanabilir)."""
+        row = self.index.get(ticker)
+        return row is not None and not np.isnan(self.cov[row, row])
+
+    def pair(self, a: str, b: str) -> float | None:
+        if a not in self.index or b not in self.index:
+            return None
+        value = self.corr[self.index[a], self.index[b]]
+        return None if np.isnan(value) else float(value)
+
+    def volatility(self, weights: dict[str, float]) -> float | None:
+        """Ağırlıklı portföyün yıllık oynaklığı; modelde olmayan hisseler hesaba girmez."""
+        known = [(self.index[t], w) for t, w in weights.items() if t in self.index]
+        if not known:
+            return None
+        rows, w = np.array([i for i, _ in known]), np.array([w for _, w in known])
+        sub = np.nan_to_num(self.cov[np.ix_(rows, rows)])
+        return float(np.sqrt(max(w @ sub @ w, 0.0) * TRADING_DAYS))
+
+
+def returns_matrix(frames: dict[str, pd.DataFrame], bars: int = RETURN_BARS) -> tuple[list[str], np.ndarray]:
+    """Son bars günün log getirileri (tarih × hisse); hissenin işlem görmediği günler NaN."""
+    close = pd.DataFrame({t: df["Close"] for t, df in frames.items() if len(df)}).sort_index()
+    prices = close.tail(bars + 1).to_numpy(dtype="f8")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.diff(np.log(np.where(prices > 0, prices, np.nan)), axis=0)
+    return list(close.columns), returns
+
+
+def risk_model(frames: dict[str, pd.DataFrame], bars: int = RETURN_BARS, min_obs: int = MIN_OBS) -> RiskModel:
+    """
+    Eksik değerli getiri matrisinden ikili tam gözlemli (pairwise-complete) kovaryans ve
+    korelasyon - DataFrame.cov/corr(min_periods=min_obs) ile aynı. X eksikleri 0 yapılmış
+    getiriler, M geçerlilik maskesi olmak üzere her çiftin ortak satırlarındaki toplamlar
+    maskeli matris çarpımlarıyla tüm çiftler için birlikte hesaplanır:
+    n = M'M, Σx = X'M, Σx² = (X²)'M, Σxy = X'X.
+    """
+    tickers, x = returns_matrix(frames, bars)
+    if not tickers:
+        return RiskModel([], np.empty((0, 0)), np.empty((0, 0)))
+    valid = ~np.isnan(x)
+    # Kolon ortalamasına kaydırmak sonucu değiştirmez, toplamlardaki sayısal kaybı azaltır
+    with np.errstate(invalid="ignore"):
+        shift = np.nan_to_num(np.nanmean(x, axis=0))
+    x = np.where(valid, x - shift, 0.0)
+    mask = valid.astype("f8")
+
+    n   = mask.T @ mask
+    sx  = x.T @ mask                 # sx[i, j]: j'nin de geçerli olduğu satırlarda Σx_i
+    sxx = (x * x).T @ mask
+    sxy = x.T @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n_safe = np.where(n > 0, n, np.nan)
+        cxy = sxy - sx * sx.T / n_safe
+        cxx = sxx - sx ** 2 / n_safe
+        cov  = cxy / (n_safe - 1)
+        corr = np.clip(cxy / np.sqrt(cxx * cxx.T), -1.0, 1.0)
+    unknown = n < min_obs
+    cov[unknown] = np.nan
+    corr[unknown] = np.nan
+    return RiskModel(tickers, cov, corr)
+
+
+def store_frames(store, tickers: list[str], bars: int = RETURN_BARS) -> dict[str, pd.DataFrame]:
+    """Taramanın depoya yazdığı fiyatlardan son bars+1 bar (ağ isteği yok)."""
+    frames = {}
+    for t in tickers:
+        df = store.read(t)
+        if len(df) > 1:
+            frames[t] = df.tail(bars + 1)
+    return frames
+
+
+@dataclass(slots=True)
+class Position:
+    ticker:   str
+    score:    int
+    price:    float
+    atr:      float
+    stop:     float
+    shares:   int
+    value:    float           # TL
+    weight:   float           # Sermayeye oranı
+    risk:     float           # Stopta kayıp (TL)
+    max_corr: float | None    # Seçilmiş pozisyonlarla en yüksek korelasyon
+    peer:     str | None      # max_corr'un ait olduğu hisse
+    skipped:  str | None = None   # Elendiyse nedeni
+
+
+def size_positions(results: list[ScanResult], model: RiskModel,
+                   config: SizingConfig = SizingConfig()) -> list[Position]:
+    """
+    Sıralı sonuçların başından max_positions pozisyon dolana kadar yürür; elenen adaylar
+    da nedeniyle birlikte döner. Korelasyon kontrolü seçilenlerle tek vektör okumasıdır.
+    """
+    positions: list[Position] = []
+    picked: list[int] = []              # Seçilenlerin modeldeki satırları
+    cash = config.capital
+    risk_budget = config.capital * config.risk_per_trade
+    accepted = 0
+
+    for res in results:
+        if accepted >= config.max_positions:
+            break
+        atr, price = res.atr, res.last_price
+        if not atr or not price or math.isnan(atr) or math.isnan(price):
+            continue
+        stop = max(price - config.stop_atr * atr, 0.0)
+
+        max_corr, peer, row = None, None, model.index.get(res.ticker)
+        if res.ticker not in model and config.require_corr:
+            positions.append(Position(res.ticker, res.score, price, atr, round(stop, 2), 0, 0.0, 0.0,
+                                      0.0, None, None, skipped="getiri geçmişi yok"))
+            continue
+        if row is not None and picked:
+            corr = model.corr[row, picked]
+            if not np.isnan(corr).all():
+                j = int(np.nanargmax(corr))
+                max_corr, peer = round(float(corr[j]), 3), model.tickers[picked[j]]
+
+        shares = int(min(risk_budget / (price - stop), config.capital * config.max_weight / price,
+                         cash / price))
+        skipped = None
+        if max_corr is not None and max_corr > config.max_corr:
+            skipped = f"korelasyon {peer} ile {max_corr:.2f}"
+        elif shares <= 0:
+            skipped = "nakit yetersiz"
+
+        value = shares * price if skipped is None else 0.0
+        positions.append(Position(
+            ticker   = res.ticker,
+            score    = res.score,
+            price    = price,
+            atr      = atr,
+            stop     = round(stop, 2),
+            shares   = shares if skipped is None else 0,
+            value    = round(value, 2),
+            weight   = round(value / config.capital, 4),
+            risk     = round(shares * (price - stop), 2) if skipped is None else 0.0,
+            max_corr = max_corr,
+            peer     = peer,
+            skipped  = skipped,
+        ))
+        if skipped is None:
+            cash -= value
+            accepted += 1
+            if row is not None:
+                picked.append(row)
+    return positions
+
+
+def portfolio_volatility(positions: list[Position], model: RiskModel) -> float | None:
+    """Seçilen pozisyonların sermaye ağırlıklarıyla yıllık portföy oynaklığı."""
+    return model.volatility({p.ticker: p.weight for p in positions if p.skipped is None})
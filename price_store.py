@@ -0,0 +1,176 @@
+"""
+Kalıcı OHLCV deposu - her hisse için tek bir NumPy (.npy) dosyası.
+Dosyalar memory-map ile okunur; güncellemede yalnızca son kayıtlı tarihten
+sonraki barlar indirilip eklenir.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_sources import CHUNK_SIZE, PRICE_COLUMNS, fetch_chunked, to_yf_symbol
+from metrics import NULL_METRICS
+from paths import cache_dir
+
+INITIAL_PERIOD   = "5y"     # İlk dolumda indirilecek geçmiş
+REFRESH_INTERVAL = 3600     # Bu süreden yeni dosyalar için istek atılmaz (sn)
+ADJUST_TOLERANCE = 1e-4     # Geçmiş bar bu orandan fazla değiştiyse (temettü/bölünme) tam yükleme
+
+BAR_DTYPE = np.dtype([("Date", "M8[s]")] + [(c, "f8") for c in PRICE_COLUMNS])
+
+
+def _naive_index(df: pd.DataFrame) -> pd.DatetimeIndex:
+    idx = pd.DatetimeIndex(df.index)
+    return idx.tz_localize(None) if idx.tz is not None else idx
+
+
+def frame_to_records(df: pd.DataFrame) -> np.ndarray:
+    """DataFrame'i sabit tipli kayıt dizisine çevirir."""
+    rec = np.empty(len(df), dtype=BAR_DTYPE)
+    rec["Date"] = _naive_index(df).values.astype("M8[s]")
+    for c in PRICE_COLUMNS:
+        rec[c] = df[c].to_numpy(dtype="f8") if c in df.columns else np.nan
+    return rec
+
+
+def records_to_frame(rec: np.ndarray) -> pd.DataFrame:
+    index = pd.DatetimeIndex(rec["Date"].astype("M8[ns]"), name="Date")
+    return pd.DataFrame({c: np.asarray(rec[c]) for c in PRICE_COLUMNS}, index=index)
+
+
+class PriceStore:
+    """Hisse başına düzeltilmiş fiyat geçmişini diskte tutar."""
+
+    def __init__(self, root: str | os.PathLike | None = None,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        self.root = Path(root) if root else cache_dir() / "prices"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.refresh_interval = refresh_interval
+
+    def path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.removesuffix('.IS')}.npy"
+
+    def _records(self, ticker: str) -> np.ndarray | None:
+        path = self.path(ticker)
+        if not path.exists():
+            return None
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def read(self, ticker: str) -> pd.DataFrame:
+        rec = self._records(ticker)
+        if rec is None or len(rec) == 0:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        return records_to_frame(rec)
+
+    def last_dates(self, ticker: str) -> tuple[np.datetime64, np.datetime64] | None:
+        """Son iki kayıtlı barın tarihleri (yoksa None)."""
+        rec = self._records(ticker)
+        if rec is None or len(rec) < 2:
+            return None
+        return rec["Date"][-2], rec["Date"][-1]
+
+    def average_turnover(self, ticker: str, bars: int = 20, max_age: float | None = None) -> float | None:
+        """
+        Son bars barın ortalama işlem hacmi (Close × Volume, TL); kayıt yoksa ya da son bar
+        max_age saniyeden eskiyse None.
+        """
+        rec = self._records(ticker)
+        if rec is None or len(rec) == 0:
+            return None
+        if max_age is not None and time.time() - rec["Date"][-1].astype("M8[s]").astype("i8") > max_age:
+            return None
+        tail = rec[-bars:]
+        value = np.nanmean(tail["Close"] * tail["Volume"])
+        return None if np.isnan(value) else float(value)
+
+    def write(self, ticker: str, df: pd.DataFrame):
+        """Tüm geçmişi atomik olarak yazar."""
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        path = self.path(ticker)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npy")
+        np.save(tmp, frame_to_records(df))
+        os.replace(tmp, path)
+
+    def is_fresh(self, ticker: str) -> bool:
+        path = self.path(ticker)
+        return path.exists() and time.time() - path.stat().st_mtime < self.refresh_interval
+
+    def append(self, ticker: str, delta: pd.DataFrame) -> bool:
+        """
+        Yeni barları mevcut geçmişe ekler. Delta, kayıtlı sondan bir önceki bardan başlar;
+        o bar değişmişse geçmiş yeniden düzeltilmiş demektir ve False döner.
+        """
+        stored = self.read(ticker)
+        if stored.empty:
+            return False
+        delta = delta.dropna(subset=["Close"])
+        if delta.empty:
+            self.path(ticker).touch()
+            return True
+        delta.index = _naive_index(delta)
+
+        overlap = stored.index.intersection(delta.index)
+        if len(overlap):
+            first = overlap[0]
+            old, new = stored.at[first, "Close"], delta.at[first, "Close"]
+            if old and abs(new - old) / abs(old) > ADJUST_TOLERANCE:
+                return False
+
+        merged = pd.concat([stored[stored.index < delta.index[0]], delta[PRICE_COLUMNS]])
+        self.write(ticker, merged)
+        return True
+
+    def refresh(self, tickers: list[str], source, chunk_size: int = CHUNK_SIZE,
+                metrics=NULL_METRICS) -> dict[str, int]:
+        """
+        Depoyu günceller. Eksik hisseler INITIAL_PERIOD kadar, mevcutlar yalnızca
+        son bardan itibaren (delta) indirilir. Aynı başlangıç tarihli hisseler
+        tek istekte toplanır. Güncellenemeyen hisseler "stale" sayılır.
+        """
+        full, deltas = [], {}
+        for t in tickers:
+            if self.is_fresh(t):
+                continue
+            dates = self.last_dates(t)
+            if dates is None:
+                full.append(t)
+            else:
+                # Son bar gün içinde yazılmış olabilir; bir önceki tamamlanmış bardan başla
+                start = str(dates[0].astype("M8[D]"))
+                deltas.setdefault(start, []).append(t)
+
+        stats = {"fresh": len(tickers) - len(full) - sum(map(len, deltas.values())),
+                 "delta": 0, "full": 0, "stale": 0}
+
+        for start, group in deltas.items():
+            fetched = fetch_chunked([to_yf_symbol(t) for t in group], source, chunk_size,
+                                    metrics=metrics, start=start)
+            for t in group:
+                df = fetched.get(to_yf_symbol(t))
+                if df is None or df.empty:
+                    stats["stale"] += 1   # Güncellenemedi; diskteki son veri kullanılır
+                    continue
+                if self.append(t, df):
+                    stats["delta"] += 1
+                else:
+                    full.append(t)
+
+        if full:
+            fetched = fetch_chunked([to_yf_symbol(t) for t in full], source, chunk_size,
+                                    metrics=metrics, period=INITIAL_PERIOD)
+            for t in full:
+                df = fetched.get(to_yf_symbol(t))
+                if df is not None and not df.dropna(subset=["Close"]).empty:
+                    df = df.dropna(subset=["Close"])
+                    df.index = _naive_index(df)
+                    self.write(t, df)
+                    stats["full"] += 1
+
+        return stats
@@ -0,0 +1,101 @@
+"""
+Sektöre göre göreli puanlama - evren puanlandıktan sonra tek bir vektörel groupby geçişiyle
+sektör içi yüzdelikler ve z-skorları, fiyat geçmişinden de evren içi göreli güç sırası
+hesaplanır. PD/DD, F/K ve piyasa değeri kriterleri mutlak eşikler yerine sektör içi konuma
+göre yeniden değerlendirilir; küçük sektörlerde (min_sector_size altı) mutlak sonuç korunur.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from results import Criteria, ScanResult, ScoreConfig
+
+FUNDAMENTAL_COLUMNS = ["pb", "pe", "market_cap"]
+
+
+def relative_strength(frames: dict[str, pd.DataFrame], tickers: list[str], window: int) -> pd.Series:
+    """window barlık getirinin evren içi yüzdelik sırası (0-1); geçmişi kısa hisseler NaN."""
+    # Yalnızca son window+1 bar gerekir. Evren hisse koduyla etiketli tek uzun dizide toplanır,
+    # window bar önceki kapanış grup içinde kaydırılarak alınır ve her hissenin son satırı okunur.
+    present = [i for i, t in enumerate(tickers) if t in frames and len(frames[t]) > window]
+    closes = [frames[tickers[i]]["Close"].to_numpy(dtype="f8")[-window - 1:] for i in present]
+    returns = np.full(len(tickers), np.nan)
+    if present:
+        close = pd.Series(np.concatenate(closes))
+        group = np.repeat(present, [len(c) for c in closes])
+        past = close.groupby(group, sort=False).transform("shift", window)
+        last = np.cumsum([len(c) for c in closes]) - 1
+        returns[present] = (close / past - 1).to_numpy()[last]
+    return pd.Series(returns, index=tickers).rank(pct=True)
+
+
+def sector_stats(results: list[ScanResult]) -> pd.DataFrame:
+    """
+    Hisse başına sektör içi yüzdelik (*_pct), z-skoru (*_z) ve sektör büyüklüğü.
+    Sıfır/negatif çarpanlar (zarar eden şirketin F/K'sı gibi) karşılaştırmaya girmez.
+    """
+    df = pd.DataFrame({
+        "sector":     [r.sector or "Bilinmiyor" for r in results],
+        "pb":         [r.pb for r in results],
+        "pe":         [r.pe for r in results],
+        "market_cap": [r.market_cap for r in results],
+    }, index=[r.ticker for r in results])
+    values = df[FUNDAMENTAL_COLUMNS].astype("f8")
+    values = values.where(values > 0)
+
+    groups = values.groupby(df["sector"])
+    pct    = groups.rank(pct=True)
+    z      = (values - groups.transform("mean")) / groups.transform("std")
+    size   = df.groupby("sector")["sector"].transform("size")
+
+    stats = pd.concat([pct.add_suffix("_pct"), z.add_suffix("_z")], axis=1)
+    stats["sector_size"] = size
+    return stats
+
+
+def _value(x) -> float | None:
+    return None if pd.isna(x) else round(float(x), 3)
+
+
+def apply_relative(results: list[ScanResult], frames: dict[str, pd.DataFrame],
+                   config: ScoreConfig) -> list[ScanResult]:
+    """Sonuçları sektör içi konum ve göreli güçle yeniden puanlar (giriş sırası korunur)."""
+    if not results:
+        return results
+    tickers = [r.ticker for r in results]
+    stats = sector_stats(results)
+    rs = relative_strength(frames, tickers, config.rs_window)
+
+    big = (stats["sector_size"] >= config.min_sector_size).to_numpy()
+    flags = {
+        Criteria.PB_LOW:    (stats["pb_pct"] <= config.sector_pct).to_numpy(),
+        Criteria.PE_LOW:    (stats["pe_pct"] <= config.sector_pct).to_numpy(),
+        Criteria.MCAP_HIGH: (stats["market_cap_pct"] > config.mcap_pct).to_numpy(),
+    }
+    strong = (rs >= config.rs_min).to_numpy()
+    columns = {name: stats[name].to_numpy() for name in stats.columns}
+    rs_rank = rs.to_numpy()
+    points = config.points
+
+    rescored = []
+    for i, res in enumerate(results):
+        passed = Criteria(res.criteria) & ~Criteria.RS_STRONG
+        if big[i]:
+            for criterion, hit in flags.items():
+                passed = passed | criterion if hit[i] else passed & ~criterion
+        if strong[i]:
+            passed |= Criteria.RS_STRONG
+        rescored.append(replace(
+            res,
+            score    = sum(pts for crit, pts in points.items() if crit in passed),
+            criteria = int(passed),
+            pb_pct   = _value(columns["pb_pct"][i]),
+            pe_pct   = _value(columns["pe_pct"][i]),
+            mcap_pct = _value(columns["market_cap_pct"][i]),
+            pb_z     = _value(columns["pb_z"][i]),
+            pe_z     = _value(columns["pe_z"][i]),
+            rs_rank  = _value(rs_rank[i]),
+        ))
+    return rescored
@@ -0,0 +1,154 @@
+"""
+Tarama sonuç tipi - yalnızca skaler metrikler ve kriter bit maskesi tutulur.
+Fiyat geçmişi sonuçta taşınmaz; grafik verisi gösterilen hisseler için ayrıca yüklenir.
+Bu modül pandas/numpy import etmez.
+"""
+
+from dataclasses import asdict, dataclass
+from enum import IntFlag
+
+
+class Criteria(IntFlag):
+    EMA_CROSS   = 1 << 0   # EMA50 > EMA200
+    PRICE_ABOVE = 1 << 1   # Fiyat > EMA50 ve EMA200
+    RSI_BAND    = 1 << 2   # rsi_low <= RSI <= rsi_high
+    RSI_CROSS   = 1 << 3   # RSI son 5 barda rsi_cross_level'ı yukarı kesti
+    MACD_TURN   = 1 << 4   # MACD histogram pozitif
+    PB_LOW      = 1 << 5   # 0 < PD/DD < pb_max
+    PE_LOW      = 1 << 6   # 0 < F/K < pe_max
+    MCAP_HIGH   = 1 << 7   # Piyasa değeri > mcap_min
+    RS_STRONG   = 1 << 8   # Göreli güç sırası >= rs_min (yalnızca göreli modda)
+
+
+@dataclass(frozen=True)
+class ScoreConfig:
+    """Kriter ağırlıkları ve eşikleri - puanlama, geçmiş test ve arayüz aynı kaynaktan okur."""
+    # Ağırlıklar (puan)
+    w_ema_cross:   int = 15
+    w_price_above: int = 10
+    w_rsi_band:    int = 10
+    w_rsi_cross:   int = 15
+    w_macd_turn:   int = 10
+    w_pb:          int = 15
+    w_pe:          int = 15
+    w_mcap:        int = 10
+    w_rs:          int = 0
+    # Eşikler
+    rsi_low:         float = 40
+    rsi_high:        float = 65
+    rsi_cross_level: float = 40
+    pb_max:          float = 1.5
+    pe_max:          float = 15
+    mcap_min:        float = 1_000_000_000
+    # Göreli mod: PD/DD, F/K ve piyasa değeri sektör içi yüzdeliğe göre değerlendirilir
+    relative:        bool  = False
+    sector_pct:      float = 0.3    # PD/DD ve F/K sektörün en ucuz bu dilimindeyse
+    mcap_pct:        float = 0.5    # Piyasa değeri sektörde bu yüzdeliğin üstündeyse
+    min_sector_size: int   = 5      # Daha küçük sektörlerde mutlak eşikler kullanılır
+    rs_window:       int   = 63     # Göreli güç getiri penceresi (bar)
+    rs_min:          float = 0.7
+
+    @property
+    def points(self) -> dict[Criteria, int]:
+        return {
+            Criteria.EMA_CROSS:   self.w_ema_cross,
+            Criteria.PRICE_ABOVE: self.w_price_above,
+            Criteria.RSI_BAND:    self.w_rsi_band,
+            Criteria.RSI_CROSS:   self.w_rsi_cross,
+            Criteria.MACD_TURN:   self.w_macd_turn,
+            Criteria.PB_LOW:      self.w_pb,
+            Criteria.PE_LOW:      self.w_pe,
+            Criteria.MCAP_HIGH:   self.w_mcap,
+            Criteria.RS_STRONG:   self.w_rs,
+        }
+
+    @property
+    def thresholds(self) -> tuple:
+        return (self.rsi_low, self.rsi_high, self.rsi_cross_level, self.pb_max, self.pe_max, self.mcap_min)
+
+    def labels(self, rsi: float | None = None, pb: float | None = None,
+               pe: float | None = None) -> dict[Criteria, str]:
+        """Kriter etiketleri; değer verilirse "şu an" bilgisi eklenir. Puansız kriterler listelenmez."""
+        mcap = f"Piyasa Değeri > {self.mcap_min / 1e9:g}B TL"
+        rsi_band = f"RSI {self.rsi_low:g}-{self.rsi_high:g} Bandı"
+        pb_label = f"PD/DD < {self.pb_max:g}"
+        pe_label = f"F/K < {self.pe_max:g}"
+        if self.relative:
+            cheap = f"sektörde en ucuz %{self.sector_pct * 100:g} dilimde"
+            pb_label, pe_label = f"PD/DD {cheap}", f"F/K {cheap}"
+            mcap = f"Piyasa Değeri sektörde %{self.mcap_pct * 100:g} üstü"
+        if rsi is not None:
+            rsi_band = f"RSI Bandı (şu an: {rsi:.1f})"
+            pb_label += f" (şu an: {pb:.2f})" if pb else " (şu an: N/A)"
+            pe_label += f" (şu an: {pe:.1f})" if pe else " (şu an: N/A)"
+        labels = {
+            Criteria.EMA_CROSS:   "EMA Golden Cross",
+            Criteria.PRICE_ABOVE: "Fiyat > EMA50/200",
+            Criteria.RSI_BAND:    rsi_band,
+            Criteria.RSI_CROSS:   f"RSI {self.rsi_cross_level:g} Kesimi (Momentum)",
+            Criteria.MACD_TURN:   "MACD Pozitif Dönüş",
+            Criteria.PB_LOW:      pb_label,
+            Criteria.PE_LOW:      pe_label,
+            Criteria.MCAP_HIGH:   mcap,
+            Criteria.RS_STRONG:   f"Göreli Güç ilk %{(1 - self.rs_min) * 100:g}",
+        }
+        points = self.points
+        return {c: label for c, label in labels.items() if points[c]}
+
+
+DEFAULT_CONFIG = ScoreConfig()
+# Göreli mod ön ayarı: teknik 60p içinde 10p göreli güce ayrılır, toplam yine 100p
+RELATIVE_CONFIG = ScoreConfig(relative=True, w_rs=10, w_ema_cross=10, w_price_above=5)
+
+
+@dataclass(slots=True)
+class ScanResult:
+    ticker:     str
+    name:       str
+    sector:     str
+    score:      int
+    criteria:   int            # Criteria bit maskesi
+    last_price: float
+    rsi:        float
+    ema50:      float
+    ema200:     float
+    macd_hist:  float
+    atr:        float
+    pb:         float | None
+    pe:         float | None
+    market_cap: float | None
+    # Göreli mod alanları (sektör içi yüzdelik 0-1, z-skoru, evren içi göreli güç sırası)
+    pb_pct:     float | None = None
+    pe_pct:     float | None = None
+    mcap_pct:   float | None = None
+    pb_z:       float | None = None
+    pe_z:       float | None = None
+    rs_rank:    float | None = None
+
+    @property
+    def score_pct(self) -> float:
+        return round(self.score, 1)
+
+    def passed(self, criterion: Criteria) -> bool:
+        return bool(self.criteria & criterion)
+
+    @property
+    def detail(self) -> dict[str, tuple[int, int, bool]]:
+        """Kriter etiketi -> (kazanılan, azami puan, sağlandı mı); varsayılan ayarlarla."""
+        return self.details(DEFAULT_CONFIG)
+
+    def details(self, config: ScoreConfig) -> dict[str, tuple[int, int, bool]]:
+        points = config.points
+        detail = {}
+        for criterion, label in config.labels(self.rsi, self.pb, self.pe).items():
+            max_pts = points[criterion]
+            ok = self.passed(criterion)
+            detail[label] = (max_pts if ok else 0, max_pts, ok)
+        return detail
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScanResult":
+        return cls(**{k: data.get(k) for k in cls.__dataclass_fields__})
@@ -0,0 +1,224 @@
+"""
+Komut satırından tarama - Streamlit/Plotly import etmez.
+Örn. piyasa açılmadan cron ile çalıştırılıp sıralama dosyaya yazılır:
+
+    python scan_cli.py --min-score 30 --top-n 10 --format csv -o sonuc.csv
+    python scan_cli.py --snapshot -q -o /dev/null     # arayüz için snapshot üret
+                                                      # (BIST_CACHE_BACKEND varsa oraya da yayımlanır)
+    python scan_cli.py --metrics scan.prom            # aşama süreleri (Prometheus metni)
+    python scan_cli.py --from-snapshot --query "rsi in 40..50, price > ema200, pb < 1"
+    python scan_cli.py --from-snapshot --capital 250000 --max-corr 0.6   # pozisyon önerisi
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from data_sources import default_source, load_price_frames
+from metrics import ScanMetrics
+from portfolio import SizingConfig, portfolio_volatility, risk_model, size_positions, store_frames
+from price_store import PriceStore
+from results import DEFAULT_CONFIG, RELATIVE_CONFIG, Criteria
+from scanner import DEFAULT_TIMEOUT, DEFAULT_WORKERS, scan_universe
+from screener import Condition, QueryError, ScreenTable, parse_query
+from shared_cache import shared_cache
+from snapshot import Snapshot, latest_snapshot_path, load_snapshot, publish_snapshot
+from universe import DEFAULT_INDEX, MIN_MCAP, MIN_TURNOVER, index_tickers, prefilter
+
+FORMATS = ("json", "csv", "parquet")
+
+
+def load_universe(spec: str | None, index: str = DEFAULT_INDEX) -> list[str]:
+    """Virgüllü liste, satır başına bir hisse içeren dosya ya da boş (endeks üyeleri)."""
+    if not spec:
+        return index_tickers(index)
+    path = Path(spec)
+    if path.exists():
+        lines = path.read_text(encoding="utf-8").split()
+        return [t.strip().upper() for t in lines if t.strip()]
+    return [t.strip().upper() for t in spec.split(",") if t.strip()]
+
+
+def snapshot_universe(snapshot: Snapshot, args: argparse.Namespace) -> list[str]:
+    """
+    Snapshot'ın (ön elemeden geçmiş, likiditeye göre sıralı) evreni; --universe verildiyse
+    onunla kesişimi, --limit verildiyse en likit ilk N'i.
+    """
+    tickers = snapshot.universe
+    if args.universe:
+        allowed = set(load_universe(args.universe, args.index))
+        tickers = [t for t in tickers if t in allowed]
+    return tickers[:args.limit] if args.limit else tickers
+
+
+def result_rows(results: list) -> list[dict]:
+    rows = []
+    for rank, res in enumerate(results, 1):
+        row = {"rank": rank, **res.to_dict(), "score_pct": res.score_pct}
+        row["passed"] = ",".join(c.name for c in Criteria if res.passed(c))
+        rows.append(row)
+    return rows
+
+
+def position_rows(matched: list, store: PriceStore, sizing: SizingConfig) -> tuple[list[dict], dict]:
+    """Sıralı eşleşmelerden pozisyon önerisi; korelasyon tüm eşleşmeler üzerinden kurulur."""
+    tickers = [r.ticker for r in matched]
+    frames = store_frames(store, tickers)
+    missing = [t for t in tickers if t not in frames]
+    if missing:   # Snapshot başka makinede üretilmiş olabilir
+        frames.update(store_frames(store, list(load_price_frames(missing, store=store))))
+    model = risk_model(frames)
+    positions = size_positions(matched, model, sizing)
+    vol = portfolio_volatility(positions, model)
+    meta = {"capital": sizing.capital, "max_corr": sizing.max_corr,
+            "volatility": round(vol, 4) if vol is not None else None}
+    return [{"rank": rank, **asdict(p)} for rank, p in enumerate(positions, 1)], meta
+
+
+def write_results(rows: list[dict], fmt: str, output: str | None, meta: dict):
+    if fmt == "json":
+        payload = json.dumps({**meta, "results": rows}, ensure_ascii=False, indent=2)
+        if output:
+            Path(output).write_text(payload, encoding="utf-8")
+        else:
+            print(payload)
+        return
+
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    if fmt == "csv":
+        df.to_csv(output or sys.stdout, index=False)
+    else:
+        if not output:
+            raise SystemExit("parquet için --output gerekli")
+        df.to_parquet(output, index=False)
+
+
+def write_matches(matched: list, args: argparse.Namespace, store: PriceStore, meta: dict):
+    """İlk top_n sonuç ya da --capital verildiyse pozisyon önerisi."""
+    if not args.capital:
+        write_results(result_rows(matched[:args.top_n]), args.format, args.output, meta)
+        return
+    sizing = SizingConfig(capital=args.capital, risk_per_trade=args.risk,
+                          max_corr=args.max_corr, max_positions=args.top_n)
+    rows, portfolio = position_rows(matched, store, sizing)
+    write_results(rows, args.format, args.output, {**meta, "portfolio": portfolio})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="BIST Swing Trader - başsız tarama")
+    parser.add_argument("--universe", help="Virgüllü hisse listesi veya liste dosyası (varsayılan: tüm liste)")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="Üyelik dosyasındaki endeks")
+    parser.add_argument("--limit", type=int, help="Ön elemeyi geçenlerden en likit N hisseyi tara")
+    parser.add_argument("--min-turnover", type=float, default=MIN_TURNOVER,
+                        help="Ön eleme: 20 günlük ortalama işlem hacmi alt sınırı (TL)")
+    parser.add_argument("--min-mcap", type=float, default=MIN_MCAP,
+                        help="Ön eleme: piyasa değeri alt sınırı (TL)")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="Likidite ön elemesi yapma (listenin ilk N hissesi)")
+    parser.add_argument("--min-score", type=float, default=30)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("-o", "--output", help="Çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--relative", action="store_true",
+                        help="Sektöre göre göreli puanlama (RELATIVE_CONFIG)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Tüm sonuçları arayüzün okuyacağı snapshot olarak da kaydet")
+    parser.add_argument("--metrics", metavar="DOSYA",
+                        help="Tarama ölçümlerini yaz (.prom/.txt: Prometheus, diğer: JSON)")
+    parser.add_argument("--query", default="",
+                        help='Ek filtre, ör. "rsi in 40..50, price > ema200, sector = Energy"')
+    parser.add_argument("--sort-by", default="score", help="Sıralama alanı (varsayılan: score)")
+    parser.add_argument("--from-snapshot", action="store_true",
+                        help="Tarama yapma, son snapshot üzerinde sorgula")
+    parser.add_argument("--capital", type=float,
+                        help="Verilirse sonuç yerine ATR stopu ve korelasyon sınırıyla pozisyon önerisi yaz")
+    parser.add_argument("--risk", type=float, default=SizingConfig.risk_per_trade,
+                        help="İşlem başına risk oranı (varsayılan: %(default)s)")
+    parser.add_argument("--max-corr", type=float, default=SizingConfig.max_corr,
+                        help="Seçilmiş pozisyonlarla azami korelasyon (varsayılan: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="İlerleme bilgisini yazma")
+    args = parser.parse_args(argv)
+
+    try:
+        conditions = parse_query(args.query) + [Condition("score", ">=", args.min_score)]
+    except QueryError as exc:
+        raise SystemExit(f"Geçersiz sorgu: {exc}")
+
+    store = PriceStore()
+    if args.from_snapshot:
+        path = latest_snapshot_path()
+        snapshot = load_snapshot(path) if path else None
+        if snapshot is None:
+            raise SystemExit("Snapshot bulunamadı; önce --snapshot ile tarama yapın")
+        # Ön eleme yeniden yapılmaz: yerel önbellekler snapshot'ı üretenle aynı olmayabilir
+        tickers = snapshot_universe(snapshot, args)
+        saved = snapshot.load_metrics()
+        table = ScreenTable(snapshot.results)
+        matched = table.query(conditions, tickers=tickers, sort_by=args.sort_by)
+        meta = {
+            "generated_at": datetime.fromtimestamp(snapshot.created_at).isoformat(timespec="seconds"),
+            "scanned":      len(snapshot.results),
+            "prefiltered_out": ScanMetrics.from_dict(saved).counter("prefiltered_out") if saved else None,
+            "matched":      len(matched),
+            "min_score":    args.min_score,
+            "query":        args.query,
+            "top_n":        args.top_n,
+        }
+        write_matches(matched, args, store, meta)
+        return 0
+
+    tickers = load_universe(args.universe, args.index)
+    metrics = ScanMetrics()
+    if not args.no_prefilter:
+        tickers = prefilter(tickers, store=store, min_turnover=args.min_turnover,
+                            min_mcap=args.min_mcap, limit=args.limit, metrics=metrics)
+    elif args.limit:
+        tickers = tickers[:args.limit]
+    dropped = metrics.counter("prefiltered_out")
+
+    def on_progress(done: int, total: int, ticker: str):
+        if not args.quiet:
+            print(f"\r{done}/{total} {ticker:<8}", end="", file=sys.stderr, flush=True)
+
+    source = default_source()
+    config = RELATIVE_CONFIG if args.relative else DEFAULT_CONFIG
+    scanned = scan_universe(tickers, source=source, store=store, config=config, max_workers=args.workers,
+                            timeout=args.timeout, on_progress=on_progress, metrics=metrics)
+    if hasattr(source, "metrics"):
+        metrics.merge(source.metrics)   # Yeniden deneme, devre kesici, hız sınırı sayaçları
+    if not args.quiet:
+        print(file=sys.stderr)
+    if args.snapshot:
+        snapshot = Snapshot(created_at=time.time(), universe=tickers, results=scanned,
+                            config=asdict(config) if args.relative else None)
+        snapshot.save()
+        snapshot.save_metrics(metrics)
+        if shared_cache() is not None:
+            publish_snapshot(snapshot, shared_cache(), metrics)   # Tüm arayüz kopyaları için
+    if args.metrics:
+        metrics.save(args.metrics)
+
+    matched = ScreenTable(scanned).query(conditions, sort_by=args.sort_by)
+    meta = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "scanned":      len(tickers),
+        "prefiltered_out": dropped,
+        "matched":      len(matched),
+        "min_score":    args.min_score,
+        "query":        args.query,
+        "top_n":        args.top_n,
+    }
+    write_matches(matched, args, store, meta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
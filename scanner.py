@@ -0,0 +1,131 @@
+"""
+Tarama motoru - score fonksiyonunu sınırlı bir thread havuzunda çalıştırır.
+scan_universe tüm hattı (fiyat yükleme, indikatör, puanlama) Streamlit olmadan çalıştırır.
+Sonuçlar bittikçe toplanır; ilerleme bildirimi ana thread'den yapılır
+(Streamlit çağrıları worker thread'lerden yapılmamalı).
+Veri hattı modülleri (pandas) scan_universe ilk çağrıldığında import edilir.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable
+
+from metrics import NULL_METRICS, ScanMetrics
+from results import DEFAULT_CONFIG, ScoreConfig
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30.0   # Tek hisse için saniye
+POLL_INTERVAL   = 0.25   # Zaman aşımı kontrol aralığı
+
+
+def run_scan(tickers: list[str],
+             score_fn: Callable[[str], object],
+             max_workers: int = DEFAULT_WORKERS,
+             timeout: float = DEFAULT_TIMEOUT,
+             on_progress: Callable[[int, int, str], None] | None = None,
+             metrics: ScanMetrics = NULL_METRICS) -> list:
+    """
+    score_fn'i her hisse için paralel çalıştırır, None olmayan sonuçları giriş sırasıyla döner.
+    timeout saniyeden uzun süren hisseler beklenmez (sonuçsuz sayılır).
+    on_progress(tamamlanan, toplam, hisse) her hisse bittiğinde çağrılır.
+    Hata veren ve zaman aşımına uğrayan hisseler metrics'e sayılır.
+    """
+    results = {}
+    total   = len(tickers)
+    done    = 0
+    started = {}
+
+    def task(ticker):
+        started[ticker] = time.monotonic()
+        return score_fn(ticker)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="scan")
+    try:
+        futures = {pool.submit(task, t): t for t in tickers}
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+            # Çalışmaya başlamış ama süresi dolmuş işler
+            now = time.monotonic()
+            expired = {f for f in pending
+                       if futures[f] in started and now - started[futures[f]] > timeout}
+            pending -= expired
+
+            for f in finished | expired:
+                done += 1
+                if f in finished:
+                    try:
+                        result = f.result()
+                    except Exception:
+                        metrics.count("failures", stage="score")
+                        result = None
+                    if result is not None:
+                        results[futures[f]] = result
+                else:
+                    metrics.count("timeouts")
+                if on_progress:
+                    on_progress(done, total, futures[f])
+    finally:
+        # Zaman aşımına uğrayan thread'ler arka planda bitebilir, beklenmez
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # Eşit skorlu hisselerin sırası bitiş sırasına bağlı kalmasın
+    return [results[t] for t in tickers if t in results]
+
+
+def scan_universe(tickers: list[str],
+                  source=None,
+                  store=None,
+                  get_fundamentals: Callable[[str], dict] | None = None,
+                  period: str = "1y",
+                  config: ScoreConfig = DEFAULT_CONFIG,
+                  max_workers: int = DEFAULT_WORKERS,
+                  timeout: float = DEFAULT_TIMEOUT,
+                  on_progress: Callable[[int, int, str], None] | None = None,
+                  metrics: ScanMetrics = NULL_METRICS) -> list:
+    """
+    Tam tarama: fiyatları toplu yükler, indikatörleri panel modunda hesaplar,
+    hisseleri paralel puanlar. Streamlit gerektirmez.
+    get_fundamentals verilmezse diskteki temel veri önbelleği kullanılır ve sonda kaydedilir.
+    metrics verilirse aşama süreleri (fundamentals hariç "score" dahil) ve sayaçlar kaydedilir.
+    config.relative ise sonuçlar sonda sektör içi konuma göre toplu olarak yeniden puanlanır.
+    """
+    from data_sources import default_source, load_price_frames
+    from fundamentals import FundamentalsCache
+    from indicators import annotate_frames
+    from scoring import score_ticker
+
+    source = source or default_source()
+    cache  = None
+    if get_fundamentals is None:
+        cache = FundamentalsCache()
+        get_fundamentals = lambda t: cache.get(t, source.fetch_fundamentals, metrics)  # noqa: E731
+
+    def timed_fundamentals(ticker: str) -> dict:
+        with metrics.timer("fundamentals", ticker):
+            return get_fundamentals(ticker)
+
+    def score(ticker: str):
+        start = time.perf_counter()
+        try:
+            return score_ticker(ticker, frames.get(ticker), timed_fundamentals, config)
+        finally:
+            elapsed = time.perf_counter() - start - metrics.ticker_time(ticker, "fundamentals")
+            metrics.record("score", elapsed, ticker)
+
+    with metrics.timer("scan"):
+        frames = load_price_frames(tickers, source=source, period=period, store=store, metrics=metrics)
+        with metrics.timer("indicators"):
+            frames = annotate_frames(frames)
+        try:
+            results = run_scan(tickers, score, max_workers=max_workers, timeout=timeout,
+                               on_progress=on_progress, metrics=metrics)
+            if config.relative:
+                from relative import apply_relative
+                with metrics.timer("relative"):
+                    results = apply_relative(results, frames, config)
+            return results
+        finally:
+            if cache is not None:
+                cache.flush()
@@ -0,0 +1,103 @@
+"""
+Puanlama - Streamlit'ten bağımsız; hem arayüz hem komut satırı kullanır.
+"""
+
+from typing import Callable
+
+import pandas as pd
+
+from indicators import calculate_indicators
+from results import DEFAULT_CONFIG, Criteria, ScanResult, ScoreConfig
+
+# ─────────────────────────────────────────────
+# PUANLAMA SİSTEMİ (100 PUAN)
+# ─────────────────────────────────────────────
+
+def score_ticker(ticker: str, df: pd.DataFrame,
+                 get_fundamentals: Callable[[str], dict],
+                 config: ScoreConfig = DEFAULT_CONFIG) -> ScanResult | None:
+    """
+    Teknik (60p) + Temel (40p) = 100p (varsayılan ağırlıklarla)
+    İndikatörleri hesaplanmış df verilirse tekrar hesaplanmaz.
+    Temel veri yalnızca fiyat verisi olan hisseler için get_fundamentals ile istenir.
+    """
+    if df is None or df.empty:
+        return None
+
+    if "EMA50" not in df.columns:
+        df = calculate_indicators(df)
+    last = df.iloc[-1]
+    prev = df.iloc[-2] if len(df) > 1 else last
+
+    passed = Criteria(0)
+
+    # ── TEKNİK (60p) ──────────────────────────
+    # 1. Golden Cross bölgesi: EMA50 > EMA200 (15p)
+    if last["EMA50"] > last["EMA200"]:
+        passed |= Criteria.EMA_CROSS
+
+    # 2. Fiyat her iki EMA'nın üzerinde (10p)
+    if last["Close"] > last["EMA50"] and last["Close"] > last["EMA200"]:
+        passed |= Criteria.PRICE_ABOVE
+
+    # 3. RSI 40-65 bandı (10p)
+    rsi_val = float(last["RSI"])
+    if config.rsi_low <= rsi_val <= config.rsi_high:
+        passed |= Criteria.RSI_BAND
+
+    # 4. RSI yukarı yönlü 40'ı kesti (15p) — momentum başlangıcı
+    level = config.rsi_cross_level
+    rsi_cross = bool(float(prev["RSI"]) < level and rsi_val >= level)
+    # Eğer son 5 barda kestiyse de puan ver
+    if not rsi_cross and len(df) >= 6:
+        window = df.iloc[-6:-1]["RSI"].values
+        for i in range(len(window)-1):
+            if window[i] < level <= window[i+1]:
+                rsi_cross = True
+                break
+    if rsi_cross:
+        passed |= Criteria.RSI_CROSS
+
+    # 5. MACD histogram pozitife döndü (10p)
+    macd_turn = bool(float(last["MACD_Hist"]) > 0 and float(prev["MACD_Hist"]) <= 0)
+    if not macd_turn:
+        macd_turn = bool(float(last["MACD_Hist"]) > 0 and float(last["MACD"]) > float(last["MACD_Signal"]))
+    if macd_turn:
+        passed |= Criteria.MACD_TURN
+
+    # ── TEMEL (40p) ───────────────────────────
+    fund = get_fundamentals(ticker)
+
+    # 6. PD/DD < 1.5 (15p)
+    pb = fund["pb"]
+    if pb is not None and 0 < pb < config.pb_max:
+        passed |= Criteria.PB_LOW
+
+    # 7. F/K < 15 (15p)
+    pe = fund["pe"]
+    if pe is not None and 0 < pe < config.pe_max:
+        passed |= Criteria.PE_LOW
+
+    # 8. Piyasa değeri > 1 milyar TL (10p)
+    mc = fund["market_cap"]
+    if mc is not None and mc > config.mcap_min:
+        passed |= Criteria.MCAP_HIGH
+
+    score = sum(pts for crit, pts in config.points.items() if crit in passed)
+
+    return ScanResult(
+        ticker     = ticker,
+        name       = fund["name"],
+        sector     = fund["sector"],
+        score      = score,
+        criteria   = int(passed),
+        last_price = float(last["Close"]),
+        rsi        = round(rsi_val, 1),
+        ema50      = float(last["EMA50"]),
+        ema200     = float(last["EMA200"]),
+        macd_hist  = float(last["MACD_Hist"]),
+        atr        = float(last["ATR"]),
+        pb         = pb,
+        pe         = pe,
+        market_cap = mc,
+    )
@@ -0,0 +1,198 @@
+"""
+Tarayıcı sorguları - son snapshot'taki puanlanmış evren üzerinde çok kriterli filtreler.
+Sonuçlar kolon bazlı bir tabloya (alan -> NumPy dizisi) dökülür. Sayısal alanlarda sıralı
+indeks (aralık sorguları ikili arama ile), sektör ve kriter bayraklarında bitmap indeks
+tutulur; sorgu bu maskelerin kesişimidir ve yeniden tarama gerektirmez.
+
+Metin sorgusu virgülle ayrılmış koşullardır:
+
+    rsi in 40..50, last_price > ema200, pb < 1, sector = Financial Services, EMA_CROSS
+    sector in Energy | Industrials, !MACD_TURN, mcap >= 1.5b
+"""
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from results import Criteria, ScanResult
+
+NUMERIC_FIELDS = ["score", "last_price", "rsi", "ema50", "ema200", "macd_hist", "atr",
+                  "pb", "pe", "market_cap", "pb_pct", "pe_pct", "mcap_pct", "pb_z", "pe_z", "rs_rank"]
+TEXT_FIELDS    = ["ticker", "name", "sector"]
+BITMAP_FIELDS  = ["sector"]
+
+ALIASES = {"price": "last_price", "close": "last_price", "fiyat": "last_price",
+           "mcap": "market_cap", "pd_dd": "pb", "fk": "pe", "macd": "macd_hist", "rs": "rs_rank"}
+OPERATORS = ("<=", ">=", "!=", "==", "<", ">", "=")
+
+
+class QueryError(ValueError):
+    """Sorgu çözümlenemedi veya bilinmeyen alan/kriter içeriyor."""
+
+
+@dataclass(frozen=True)
+class Field:
+    """Sağ tarafı başka bir kolon olan koşullar için (ör. last_price > ema200)."""
+    name: str
+
+
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    op:    str                 # <, <=, >, >=, ==, !=, in, flag
+    value: object = None       # in: sayısal alanda (alt, üst), metin alanında değer demeti
+
+
+def field_name(name: str) -> str:
+    key = name.strip().lower()
+    key = ALIASES.get(key, key)
+    if key not in NUMERIC_FIELDS and key not in TEXT_FIELDS:
+        raise QueryError(f"Bilinmeyen alan: {name}")
+    return key
+
+
+def _number(text: str) -> float:
+    text = text.strip().lower().replace("_", "")
+    scale = {"k": 1e3, "m": 1e6, "b": 1e9}.get(text[-1:], 1)
+    try:
+        return float(text[:-1] if scale != 1 else text) * scale
+    except ValueError:
+        raise QueryError(f"Sayı bekleniyordu: {text}") from None
+
+
+def parse_clause(clause: str) -> Condition:
+    clause = clause.strip()
+    negate = clause.startswith(("!", "not "))
+    flag = clause.removeprefix("!").removeprefix("not ").strip().upper()
+    if flag in Criteria.__members__:
+        return Condition(flag, "flag", not negate)
+
+    m = re.fullmatch(r"(\w+)\s+in\s+(\S+?)\s*\.\.\s*(\S+)", clause, re.IGNORECASE)
+    if m:
+        return Condition(field_name(m[1]), "in", (_number(m[2]), _number(m[3])))
+    m = re.fullmatch(r"(\w+)\s+in\s+(.+)", clause, re.IGNORECASE)
+    if m and field_name(m[1]) in TEXT_FIELDS:
+        return Condition(field_name(m[1]), "in", tuple(v.strip().strip("'\"") for v in m[2].split("|")))
+
+    for op in OPERATORS:
+        left, sep, right = clause.partition(op)
+        if sep:
+            break
+    else:
+        raise QueryError(f"Koşul çözümlenemedi: {clause}")
+    name, right = field_name(left), right.strip().strip("'\"")
+    op = "==" if op == "=" else op
+    if name in TEXT_FIELDS:
+        if op not in ("==", "!="):
+            raise QueryError(f"{name} yalnızca = / != ile karşılaştırılabilir")
+        return Condition(name, op, right)
+    try:
+        return Condition(name, op, Field(field_name(right)))
+    except QueryError:
+        return Condition(name, op, _number(right))
+
+
+def parse_query(text: str) -> list[Condition]:
+    """Virgülle ayrılmış metin sorgusunu koşul listesine çevirir."""
+    return [parse_clause(c) for c in text.split(",") if c.strip()]
+
+
+class ScreenTable:
+    """Puanlanmış sonuçların kolon bazlı, indeksli hali (snapshot başına bir kez kurulur)."""
+
+    def __init__(self, results: list[ScanResult]):
+        self.results = list(results)
+        self.size = len(self.results)
+        self.row_of = {r.ticker: i for i, r in enumerate(self.results)}
+
+        self.columns: dict[str, np.ndarray] = {}
+        for name in NUMERIC_FIELDS:
+            self.columns[name] = np.array([np.nan if getattr(r, name) is None else getattr(r, name)
+                                           for r in self.results], dtype="f8")
+        for name in TEXT_FIELDS:
+            self.columns[name] = np.array([getattr(r, name) or "" for r in self.results], dtype=object)
+        self.criteria = np.array([r.criteria for r in self.results], dtype="i8")
+
+        # Sıralı indeks: değerler artan sırada, NaN'ler dışarıda
+        self._sorted: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for name in NUMERIC_FIELDS:
+            values = self.columns[name]
+            order = np.argsort(values, kind="stable")
+            valid = int(np.count_nonzero(~np.isnan(values)))
+            self._sorted[name] = (order[:valid], values[order[:valid]])
+
+        # Bitmap indeks: değer -> satır maskesi
+        self._bitmaps: dict[str, dict[str, np.ndarray]] = {}
+        for name in BITMAP_FIELDS:
+            column = self.columns[name]
+            self._bitmaps[name] = {v: column == v for v in np.unique(column)}
+        self._flags = {c.name: (self.criteria & c) != 0 for c in Criteria}
+
+    def values(self, name: str) -> list[str]:
+        """Bitmap indeksli alanın farklı değerleri (ör. sektör listesi)."""
+        return sorted(self._bitmaps[name])
+
+    def _range(self, name: str, lo: float, hi: float, lo_open=False, hi_open=False) -> np.ndarray:
+        order, values = self._sorted[name]
+        start = np.searchsorted(values, lo, side="right" if lo_open else "left")
+        stop  = np.searchsorted(values, hi, side="left" if hi_open else "right")
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def mask(self, cond: Condition) -> np.ndarray:
+        """Tek koşulun satır maskesi."""
+        name, op, value = cond.field, cond.op, cond.value
+        if op == "flag":
+            return self._flags[name] if value else ~self._flags[name]
+        if name in TEXT_FIELDS:
+            hit = np.zeros(self.size, dtype=bool)
+            bitmap = self._bitmaps.get(name)
+            for v in (value if op == "in" else (value,)):
+                hit |= bitmap[v] if bitmap and v in bitmap else self.columns[name] == v
+            return ~hit if op == "!=" else hit
+        if isinstance(value, Field):
+            left, right = self.columns[name], self.columns[value.name]
+            with np.errstate(invalid="ignore"):
+                return {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+                        "==": np.equal, "!=": np.not_equal}[op](left, right)
+        inf = float("inf")
+        if op == "in":
+            return self._range(name, *value)
+        if op == "<":
+            return self._range(name, -inf, value, hi_open=True)
+        if op == "<=":
+            return self._range(name, -inf, value)
+        if op == ">":
+            return self._range(name, value, inf, lo_open=True)
+        if op == ">=":
+            return self._range(name, value, inf)
+        if op == "==":
+            return self._range(name, value, value)
+        if op == "!=":
+            return ~self._range(name, value, value)
+        raise QueryError(f"Bilinmeyen operatör: {op}")
+
+    def query(self, conditions: str | list[Condition], tickers: list[str] | None = None,
+              sort_by: str = "score", descending: bool = True,
+              limit: int | None = None) -> list[ScanResult]:
+        """Koşulların kesişimi; tickers verilirse evren alt kümesiyle sınırlanır."""
+        if isinstance(conditions, str):
+            conditions = parse_query(conditions)
+        mask = np.ones(self.size, dtype=bool)
+        for cond in conditions:
+            mask &= self.mask(cond)
+        if tickers is not None:
+            allowed = np.zeros(self.size, dtype=bool)
+            allowed[[self.row_of[t] for t in tickers if t in self.row_of]] = True
+            mask &= allowed
+
+        rows = np.flatnonzero(mask)
+        key = self.columns[field_name(sort_by)][rows]
+        # Metin kolonu sıra koduna çevrilir; eşitler her iki yönde giriş sırasında, NaN'ler sonda kalır
+        if key.dtype == object:
+            key = np.unique(key, return_inverse=True)[1].astype("f8")
+        order = np.lexsort(((-key if descending else key), np.isnan(key)))
+        rows = rows[order]
+        return [self.results[i] for i in rows[:limit]]
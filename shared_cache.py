@@ -0,0 +1,419 @@
+"""
+Paylaşılan önbellek - birden çok Streamlit kopyasının fiyat, temel veri ve snapshot'ları
+ortak bir arka uçta tutması için. Arka uçlar: paylaşılan dizin, SQLite, Redis uyumlu sunucu.
+Aynı anahtar için eşzamanlı istekler tek bir yüklemeye indirgenir (single-flight): süreç
+içinde thread'ler lideri bekler, süreçler arasında arka ucun kilidi kullanılır.
+Taramanın fiyat deposu yenilemesi de (refresh_store) buradan geçer: bir kopyanın indirdiği
+geçmiş yayımlanır, diğer kopyalar kendi depolarını ondan doldurur.
+
+Arka uç BIST_CACHE_BACKEND ile seçilir:
+    dir:/mnt/paylasilan/bist     sqlite:/mnt/paylasilan/bist.db     redis://host:6379/0
+Bu modül yalnızca standart kütüphaneyi import eder; redis paketi yalnızca Redis için gerekir.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from metrics import NULL_METRICS
+
+LOCK_TTL         = 60.0        # Kilidi alan süreç ölürse kilit bu süre sonra düşer (sn)
+LOCK_WAIT        = 30.0        # Kilit için en fazla bekleme; sonra yine de yüklenir (sn)
+LOCK_POLL        = 0.05
+PRICE_TTL        = 3600        # st.cache_data(ttl=3600) ve PriceStore.refresh_interval ile aynı
+STORE_LOCK_TTL   = 600.0       # Tam evren fiyat yenilemesi kilidi (ilk dolum dakikalar sürebilir)
+FUNDAMENTALS_TTL = 24 * 3600   # Temel verinin en kısa alan TTL'i
+
+
+# ─────────────────────────────────────────────
+# ARKA UÇLAR
+# ─────────────────────────────────────────────
+
+class CacheBackend(ABC):
+    """get/set/delete bayt değerlerle çalışır; ttl saniye (None = süresiz)."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float | None = None): ...
+
+    @abstractmethod
+    def delete(self, key: str): ...
+
+    @abstractmethod
+    def try_lock(self, key: str, ttl: float) -> str | None:
+        """Kilidi almayı bir kez dener; alındıysa bırakmak için jeton döner."""
+
+    @abstractmethod
+    def unlock(self, key: str, token: str): ...
+
+    @contextmanager
+    def lock(self, key: str, ttl: float = LOCK_TTL, wait: float = LOCK_WAIT):
+        """Kilidi en fazla wait saniye bekler; alınamazsa kilitsiz devam edilir (yield False)."""
+        deadline = time.monotonic() + wait
+        token = self.try_lock(key, ttl)
+        while token is None and time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            token = self.try_lock(key, ttl)
+        try:
+            yield token is not None
+        finally:
+            if token is not None:
+                self.unlock(key, token)
+
+
+class DirectoryBackend(CacheBackend):
+    """
+    Paylaşılan dizin (NFS, ortak volume). Her anahtar tek dosyadır: son geçerlilik zamanı ve
+    değer uzunluğundan oluşan 16 baytlık başlık + değer. Yazma atomiktir; yine de kesik ya da
+    bozuk bir dosya (ör. NFS istemcisi çökmesi) ıska sayılır ve silinir. Kilit O_EXCL ile
+    oluşturulan .lock dosyasıdır.
+    """
+
+    _HEADER = struct.Struct("<dQ")
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.root / hashlib.sha1(key.encode()).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            data = self.path(key).read_bytes()
+        except OSError:
+            return None
+        try:
+            expires, size = self._HEADER.unpack_from(data)
+            if len(data) - self._HEADER.size != size:
+                raise ValueError("kesik kayıt")
+        except (struct.error, ValueError):
+            self.delete(key)
+            return None
+        if expires and expires < time.time():
+            return None
+        return data[self._HEADER.size:]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        path = self.path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(self._HEADER.pack(time.time() + ttl if ttl else 0.0, len(value)) + value)
+        os.replace(tmp, path)
+
+    def delete(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+    def _break_stale(self, path: Path, ttl: float):
+        """Sahibi ölmüş (ttl'den eski) kilidi kaldırır."""
+        try:
+            if time.time() - path.stat().st_mtime <= ttl:
+                return
+            token = path.read_text()
+        except OSError:
+            return
+        self._remove_lock(path, token)
+
+    def _remove_lock(self, path: Path, token: str):
+        """
+        Kilidi yalnızca hâlâ token'a aitse kaldırır. Doğrudan silmek yarış doğurur: iki süreç
+        kilidi bayat görür, biri kaldırıp yenisini alırken diğeri bu taze kilidi siler. Bu
+        yüzden kilit atomik olarak benzersiz bir ada taşınır ve jetonu doğrulanır; başkasının
+        taze kilidiyse yerine geri bağlanır.
+        """
+        moved = path.with_name(f"{path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(path, moved)
+        except OSError:
+            return
+        try:
+            if moved.read_text() != token:
+                os.link(moved, path)
+        except OSError:
+            pass
+        finally:
+            moved.unlink(missing_ok=True)
+
+    def try_lock(self, key: str, ttl: float) -> str | None:
+        path = self.path(key).with_suffix(".lock")
+        self._break_stale(path, ttl)
+        token = uuid.uuid4().hex
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, "w") as f:
+            f.write(token)
+        return token
+
+    def unlock(self, key: str, token: str):
+        self._remove_lock(self.path(key).with_suffix(".lock"), token)
+
+
+class SQLiteBackend(CacheBackend):
+    """Tek SQLite dosyası (WAL). Her çağrı kendi bağlantısını açar; thread ve süreç güvenlidir."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+            db.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, token TEXT, expires REAL)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get(self, key: str) -> bytes | None:
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                             (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                       (key, value, time.time() + ttl if ttl else None))
+
+    def delete(self, key: str):
+        with self._connect() as db:
+            db.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def try_lock(self, key: str, ttl: float) -> str | None:
+        token, now = uuid.uuid4().hex, time.time()
+        with self._connect() as db:
+            db.execute("DELETE FROM locks WHERE key = ? AND expires < ?", (key, now))
+            cur = db.execute("INSERT OR IGNORE INTO locks VALUES (?, ?, ?)", (key, token, now + ttl))
+        return token if cur.rowcount == 1 else None
+
+    def unlock(self, key: str, token: str):
+        with self._connect() as db:
+            db.execute("DELETE FROM locks WHERE key = ? AND token = ?", (key, token))
+
+
+class RedisBackend(CacheBackend):
+    """Redis uyumlu sunucu (Redis, Valkey, KeyDB...). redis paketini gerektirir."""
+
+    # Karşılaştır-ve-sil sunucuda tek adımda: GET ile DEL arasında kilit düşüp başka kopyaya
+    # geçerse onun kilidi silinmez
+    UNLOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, prefix: str = "bist:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._unlock = self.client.register_script(self.UNLOCK_SCRIPT)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def try_lock(self, key: str, ttl: float) -> str | None:
+        token = uuid.uuid4().hex
+        ok = self.client.set(f"{self.prefix}lock:{key}", token, nx=True, px=int(ttl * 1000))
+        return token if ok else None
+
+    def unlock(self, key: str, token: str):
+        self._unlock(keys=[f"{self.prefix}lock:{key}"], args=[token])
+
+
+def backend_from_spec(spec: str) -> CacheBackend:
+    """"dir:/yol", "sqlite:/yol.db", "redis://..." biçimindeki tanımdan arka uç kurar."""
+    kind, _, target = spec.partition(":")
+    if kind == "dir":
+        return DirectoryBackend(target)
+    if kind == "sqlite":
+        return SQLiteBackend(target)
+    if kind in ("redis", "rediss", "unix"):
+        return RedisBackend(spec)
+    raise ValueError(f"Bilinmeyen önbellek arka ucu: {spec}")
+
+
+# ─────────────────────────────────────────────
+# KODLAYICILAR
+# ─────────────────────────────────────────────
+
+def encode_json(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def decode_json(data: bytes):
+    return json.loads(data)
+
+
+def encode_frame(df) -> bytes:
+    """Fiyat DataFrame'i -> PriceStore ile aynı sabit tipli kayıtlar (.npy baytları)."""
+    import numpy as np
+    from price_store import frame_to_records
+
+    buf = io.BytesIO()
+    np.save(buf, frame_to_records(df), allow_pickle=False)
+    return buf.getvalue()
+
+
+def decode_frame(data: bytes):
+    import numpy as np
+    from price_store import records_to_frame
+
+    return records_to_frame(np.load(io.BytesIO(data), allow_pickle=False))
+
+
+# ─────────────────────────────────────────────
+# SINGLE-FLIGHT ÖNBELLEK
+# ─────────────────────────────────────────────
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class SharedCache:
+    """
+    get_or_load: önbellekte varsa döner; yoksa anahtar başına tek bir yükleyici çalışır.
+    Süreç içindeki diğer istekler lideri bekler, diğer süreçler arka uç kilidini bekler ve
+    kilit bırakıldığında önbellekten okur.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def get(self, key: str, decode: Callable[[bytes], object] = decode_json):
+        data = self.backend.get(key)
+        return None if data is None else decode(data)
+
+    def set(self, key: str, value, ttl: float | None = None,
+            encode: Callable[[object], bytes] = encode_json):
+        self.backend.set(key, encode(value), ttl)
+
+    def _load(self, key: str, loader: Callable[[], object], ttl: float | None,
+              encode, decode, keep, metrics):
+        with self.backend.lock(key):
+            data = self.backend.get(key)    # Kilidi beklerken başka kopya doldurmuş olabilir
+            if data is not None:
+                metrics.count("cache_requests", cache="shared", result="peer")
+                return decode(data)
+            metrics.count("cache_requests", cache="shared", result="miss")
+            value = loader()
+            if value is not None and (keep is None or keep(value)):
+                self.backend.set(key, encode(value), ttl)
+            return value
+
+    def get_or_load(self, key: str, loader: Callable[[], object], ttl: float | None = None,
+                    encode: Callable[[object], bytes] = encode_json,
+                    decode: Callable[[bytes], object] = decode_json,
+                    keep: Callable[[object], bool] | None = None,
+                    metrics=NULL_METRICS):
+        """keep verilirse yalnızca keep(değer) doğru olan sonuçlar (ör. boş olmayanlar) yazılır."""
+        data = self.backend.get(key)
+        if data is not None:
+            metrics.count("cache_requests", cache="shared", result="hit")
+            return decode(data)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            metrics.count("cache_requests", cache="shared", result="coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._load(key, loader, ttl, encode, decode, keep, metrics)
+            return call.value
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+@lru_cache(maxsize=None)
+def _shared_cache(spec: str) -> SharedCache:
+    return SharedCache(backend_from_spec(spec))
+
+
+def shared_cache() -> SharedCache | None:
+    """BIST_CACHE_BACKEND tanımlıysa süreç başına tek SharedCache, değilse None."""
+    spec = os.environ.get("BIST_CACHE_BACKEND")
+    return _shared_cache(spec) if spec else None
+
+
+# ─────────────────────────────────────────────
+# FİYAT DEPOSU PAYLAŞIMI
+# ─────────────────────────────────────────────
+
+def _pull_store(cache: SharedCache, store, tickers: list[str]) -> list[str]:
+    """Paylaşılan geçmişi yerel depoya yazar; önbellekte olmayanları döner."""
+    missing = []
+    for t in tickers:
+        data = cache.backend.get(f"store:{t}")
+        if data is None:
+            missing.append(t)
+        else:
+            store.write(t, decode_frame(data))
+    return missing
+
+
+def refresh_store(cache: SharedCache, store, tickers: list[str], source, chunk_size: int,
+                  metrics=NULL_METRICS) -> dict[str, int]:
+    """
+    PriceStore.refresh'in kopyalar arası hali. Yerelde bayat hisseler önce paylaşılan
+    önbellekten alınır; kalanları kilidi alan tek kopya indirir ve PRICE_TTL boyunca yayımlar.
+    Dönen istatistik PriceStore.refresh'inkine "shared" (önbellekten alınan) eklenmiş halidir.
+    """
+    stale = [t for t in tickers if not store.is_fresh(t)]
+    missing = _pull_store(cache, store, stale)
+    stats = {"fresh": len(tickers) - len(stale), "shared": len(stale) - len(missing),
+             "delta": 0, "full": 0, "stale": 0}
+    if not missing:
+        return stats
+
+    with cache.backend.lock("store_refresh", ttl=STORE_LOCK_TTL, wait=STORE_LOCK_TTL):
+        left = _pull_store(cache, store, missing)   # Kilidi beklerken başka kopya yayımlamış olabilir
+        stats["shared"] += len(missing) - len(left)
+        for result, n in store.refresh(left, source, chunk_size=chunk_size, metrics=metrics).items():
+            stats[result] += n
+        for t in left:
+            if store.is_fresh(t):
+                cache.set(f"store:{t}", store.read(t), PRICE_TTL, encode=encode_frame)
+    return stats
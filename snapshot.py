@@ -0,0 +1,155 @@
+"""
+Tarama snapshot'ları - tüm evren bir kez puanlanır, filtreler snapshot'ı dilimler.
+Snapshot'lar JSON olarak yazılır; okumak için pandas gerekmez.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from paths import cache_dir
+from results import DEFAULT_CONFIG, ScanResult, ScoreConfig
+
+SNAPSHOT_VERSION = 1
+REFRESH_INTERVAL = 3600   # Bu süreden eski snapshot "bayat" sayılır (sn)
+KEEP_SNAPSHOTS   = 5      # Diskte tutulacak eski snapshot sayısı
+
+
+def snapshot_dir() -> Path:
+    path = cache_dir() / "snapshots"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@dataclass
+class Snapshot:
+    created_at: float                       # epoch saniye
+    universe:   list[str]
+    results:    list[ScanResult] = field(default_factory=list)
+    version:    int = SNAPSHOT_VERSION
+    config:     dict | None = None          # Taramada kullanılan ScoreConfig (asdict); None = varsayılan
+
+    @property
+    def score_config(self) -> ScoreConfig:
+        return ScoreConfig(**self.config) if self.config else DEFAULT_CONFIG
+
+    @property
+    def id(self) -> str:
+        return datetime.fromtimestamp(self.created_at).strftime("%Y%m%d-%H%M%S")
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age > REFRESH_INTERVAL
+
+    def select(self, tickers: list[str] | None = None, min_score: float = 0,
+               top_n: int | None = None) -> list[ScanResult]:
+        """Evren alt kümesi + min. skor filtresi, skora göre sıralı ilk top_n."""
+        allowed = set(tickers) if tickers is not None else None
+        matched = [r for r in self.results
+                   if r.score_pct >= min_score and (allowed is None or r.ticker in allowed)]
+        matched.sort(key=lambda r: r.score_pct, reverse=True)
+        return matched[:top_n] if top_n else matched
+
+    def to_dict(self) -> dict:
+        return {
+            "version":    self.version,
+            "created_at": self.created_at,
+            "universe":   self.universe,
+            "results":    [r.to_dict() for r in self.results],
+            "config":     self.config,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Snapshot":
+        return cls(
+            created_at = data["created_at"],
+            universe   = data["universe"],
+            results    = [ScanResult.from_dict(r) for r in data["results"]],
+            version    = data.get("version", SNAPSHOT_VERSION),
+            config     = data.get("config"),
+        )
+
+    def save(self, directory: str | os.PathLike | None = None) -> Path:
+        """snapshot-<id>.json olarak atomik yazar, eski snapshot'ları temizler."""
+        directory = Path(directory) if directory else snapshot_dir()
+        path = directory / f"snapshot-{self.id}.json"
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        for old in sorted(directory.glob("snapshot-*.json"))[:-KEEP_SNAPSHOTS]:
+            old.unlink(missing_ok=True)
+            old.with_name(old.name.replace("snapshot-", "metrics-", 1)).unlink(missing_ok=True)
+        return path
+
+    def save_metrics(self, metrics, directory: str | os.PathLike | None = None) -> Path:
+        """Taramanın ölçümlerini snapshot'ın yanına metrics-<id>.json olarak yazar."""
+        directory = Path(directory) if directory else snapshot_dir()
+        path = directory / f"metrics-{self.id}.json"
+        path.write_text(metrics.to_json(), encoding="utf-8")
+        return path
+
+    def load_metrics(self, directory: str | os.PathLike | None = None) -> dict | None:
+        directory = Path(directory) if directory else snapshot_dir()
+        try:
+            return json.loads((directory / f"metrics-{self.id}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+
+def latest_snapshot_path(directory: str | os.PathLike | None = None) -> Path | None:
+    directory = Path(directory) if directory else snapshot_dir()
+    paths = sorted(directory.glob("snapshot-*.json"))
+    return paths[-1] if paths else None
+
+
+def load_snapshot(path: str | os.PathLike) -> Snapshot | None:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        return None
+    return Snapshot.from_dict(data)
+
+
+def publish_snapshot(snapshot: Snapshot, cache, metrics=None):
+    """Snapshot'ı (ve ölçümlerini) paylaşılan önbelleğe yazar; "en yeni" işaretçisi en son güncellenir."""
+    cache.set(f"snapshot:{snapshot.id}", snapshot.to_dict())
+    if metrics is not None:
+        cache.set(f"snapshot-metrics:{snapshot.id}", metrics.to_dict())
+    cache.set("snapshot:latest", snapshot.id)
+
+
+def latest_shared_id(cache) -> str | None:
+    return cache.get("snapshot:latest")
+
+
+def load_shared_snapshot(cache, snapshot_id: str) -> Snapshot | None:
+    data = cache.get(f"snapshot:{snapshot_id}")
+    if data is None or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    return Snapshot.from_dict(data)
+
+
+def load_shared_metrics(cache, snapshot_id: str) -> dict | None:
+    return cache.get(f"snapshot-metrics:{snapshot_id}")
+
+
+def format_age(seconds: float) -> str:
+    """Snapshot yaşını okunur biçimde verir (ör. "12 dk", "3 sa 5 dk")."""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "az önce"
+    if minutes < 60:
+        return f"{minutes} dk"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours} sa {minutes} dk"
+    return f"{hours // 24} gün"
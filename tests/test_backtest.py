@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from backtest import criteria_flags, prepare_data, score_matrix, simulate
+from data_sources import FakeSource
+from results import Criteria
+from scoring import score_ticker
+
+FUNDAMENTALS = {
+    "AAA": {"pb": 1.0, "pe": 10.0, "market_cap": 5e9, "sector": "Energy", "name": "AAA"},
+    "BBB": {"pb": 3.0, "pe": None, "market_cap": 5e8, "sector": "Energy", "name": "BBB"},
+    "CCC": {"pb": None, "pe": 12.0, "market_cap": 2e9, "sector": "Industrials", "name": "CCC"},
+}
+
+
+@pytest.fixture(scope="module")
+def frames():
+    raw = FakeSource(seed=7, bars=320).fetch_prices([f"{t}.IS" for t in FUNDAMENTALS])
+    return {sym.removesuffix(".IS"): df for sym, df in raw.items()}
+
+
+def test_signals_match_score_ticker(frames):
+    data = prepare_data(frames, FUNDAMENTALS)
+    flags = criteria_flags(data)
+    score = score_matrix(flags)
+    for j, ticker in enumerate(data.tickers):
+        for row in (210, 260, len(data.dates) - 1):
+            res = score_ticker(ticker, frames[ticker].iloc[:row + 1], FUNDAMENTALS.get)
+            expected = {c for c in Criteria if res.passed(c)}
+            actual = {c for c, flag in flags.items() if flag[row, j]}
+            assert actual == expected, (ticker, row)
+            assert score[row, j] == res.score
+
+
+def test_simulate_produces_trades(frames):
+    data = prepare_data(frames, FUNDAMENTALS)
+    result = simulate(data, score_matrix(criteria_flags(data)), top_n=2, min_score=0, hold_days=10)
+    assert len(result.trades) > 0
+    assert np.isfinite(result.equity.to_numpy()).all()
@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from data_sources import MIN_BARS, FixtureSource, fetch_chunked, load_price_frames
+from metrics import ScanMetrics
+
+
+def write_fixture(directory, bars: dict[str, int]):
+    """Hisse başına bars kadar günlük bar içeren <HİSSE>.csv dosyaları."""
+    for ticker, n in bars.items():
+        index = pd.bdate_range(end="2024-06-28", periods=n, name="Date")
+        close = np.linspace(10, 20, n)
+        pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                      "Volume": 1e6}, index=index).to_csv(directory / f"{ticker}.csv")
+    (directory / "fundamentals.json").write_text(json.dumps({"AAA": {"pb": 1.5, "pe": 8.0}}))
+
+
+class CountingSource:
+    def __init__(self, source):
+        self.source = source
+        self.requests: list[list[str]] = []
+
+    def fetch_prices(self, symbols, **kwargs):
+        self.requests.append(list(symbols))
+        if "BOOM.IS" in symbols:
+            raise ConnectionError("parça düştü")
+        return self.source.fetch_prices(symbols, **kwargs)
+
+
+def test_fetch_chunked_splits_and_counts_failed_chunks(tmp_path):
+    write_fixture(tmp_path, {t: 100 for t in ("AAA", "BBB", "CCC", "DDD")})
+    source = CountingSource(FixtureSource(tmp_path))
+    metrics = ScanMetrics()
+
+    frames = fetch_chunked(["AAA.IS", "BBB.IS", "CCC.IS", "BOOM.IS", "DDD.IS"], source,
+                           chunk_size=2, metrics=metrics, period="max")
+
+    assert source.requests == [["AAA.IS", "BBB.IS"], ["CCC.IS", "BOOM.IS"], ["DDD.IS"]]
+    assert set(frames) == {"AAA.IS", "BBB.IS", "DDD.IS"}
+    assert metrics.counter("failures", stage="fetch_prices") == 2
+
+
+def test_load_price_frames_drops_short_history(tmp_path):
+    write_fixture(tmp_path, {"AAA": 100, "SHORT": MIN_BARS - 1, "EDGE": MIN_BARS})
+    metrics = ScanMetrics()
+
+    frames = load_price_frames(["AAA", "SHORT", "EDGE", "NONE"], FixtureSource(tmp_path),
+                               period="max", chunk_size=2, metrics=metrics)
+
+    assert set(frames) == {"AAA", "EDGE"}
+    assert list(frames["AAA"].columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert metrics.counter("failures", stage="prices") == 2
+
+
+def test_fixture_fundamentals(tmp_path):
+    write_fixture(tmp_path, {})
+    source = FixtureSource(tmp_path)
+    assert source.fetch_fundamentals("AAA.IS")["pb"] == 1.5
+    assert source.fetch_fundamentals("BBB.IS")["pe"] is None
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import fetch
+from fetch import CircuitBreaker, FetchError, ResilientSource, RetryPolicy, TokenBucket, rate_from_env
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_burst_then_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    with pytest.raises(FetchError):
+        bucket.acquire(timeout=0.1)
+
+
+def test_rate_from_env(monkeypatch):
+    assert rate_from_env("BIST_TEST_RATE", 2.0, 5) == (2.0, 5)
+    monkeypatch.setenv("BIST_TEST_RATE", "20:40")
+    assert rate_from_env("BIST_TEST_RATE", 2.0, 5) == (20.0, 40.0)
+    monkeypatch.setenv("BIST_TEST_RATE", "20")
+    assert rate_from_env("BIST_TEST_RATE", 2.0, 5) == (20.0, 20.0)
+
+
+class StubSource:
+    def __init__(self):
+        self.fail = False
+
+    def fetch_prices(self, symbols, **kwargs):
+        if self.fail:
+            raise ConnectionError("down")
+        return {s: pd.DataFrame({"Close": [1.0]}) for s in symbols}
+
+    def fetch_fundamentals(self, symbol):
+        return {"pb": 1.0}
+
+
+def make_source(**kwargs):
+    return ResilientSource(StubSource(), retry=RetryPolicy(attempts=1), sleep=lambda s: None,
+                           breaker=CircuitBreaker(failure_threshold=100), **kwargs)
+
+
+def test_fundamentals_have_their_own_bucket():
+    source = make_source(rate=0.001, burst=1, fundamentals_rate=1000, fundamentals_burst=100)
+    source.fetch_prices(["A"])
+    for _ in range(50):
+        source.fetch_fundamentals("A")
+    assert "rate_limit_wait_fundamentals" not in source.metrics.stages
+
+
+def test_stale_prices_are_served_and_bounded(monkeypatch):
+    monkeypatch.setattr(fetch, "STALE_PRICE_ENTRIES", 3)
+    source = make_source(rate=1000, burst=1000)
+    for day in range(5):
+        source.fetch_prices(["A"], start=f"2024-01-0{day + 1}")
+    assert len(source._last_prices) == 3
+
+    source.source.fail = True
+    assert "A" in source.fetch_prices(["A"], start="2024-01-05")
+    with pytest.raises(FetchError):
+        source.fetch_prices(["A"], start="2024-01-01")   # LRU'dan düşmüş
@@ -0,0 +1,74 @@
+import time
+
+from fundamentals import FundamentalsCache
+
+
+class CountingFetch:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def __call__(self, symbol):
+        self.calls += 1
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return dict(self.payload)
+
+
+FULL = {"pb": 1.2, "pe": 8.0, "market_cap": 5e9, "sector": "Energy", "name": "Test A.Ş."}
+
+
+def test_hit_within_ttl_and_refetch_after(tmp_path):
+    cache = FundamentalsCache(tmp_path / "f.json", field_ttl={"pb": 60})
+    fetch = CountingFetch(FULL)
+    assert cache.get("AAA", fetch)["pb"] == 1.2
+    assert cache.get("AAA", fetch)["pe"] == 8.0
+    assert fetch.calls == 1
+
+    cache._entries["AAA"]["fetched"]["pb"] -= 120      # Yalnızca pb'nin süresi dolar
+    cache.get("AAA", fetch)
+    assert fetch.calls == 2
+
+
+def test_missing_permanent_field_is_negative_cached(tmp_path):
+    cache = FundamentalsCache(tmp_path / "f.json", negative_ttl=3600)
+    fetch = CountingFetch({**FULL, "sector": None})
+    assert cache.get("AAA", fetch)["sector"] == "Bilinmiyor"
+    cache.get("AAA", fetch)
+    assert fetch.calls == 1
+
+    cache._entries["AAA"]["missing"]["sector"] -= 7200
+    cache.get("AAA", fetch)
+    assert fetch.calls == 2
+
+
+def test_permanent_field_keeps_old_value_when_empty(tmp_path):
+    cache = FundamentalsCache(tmp_path / "f.json", field_ttl={"pb": 0})
+    cache.get("AAA", CountingFetch(FULL))
+    time.sleep(0.01)
+    values = cache.get("AAA", CountingFetch({**FULL, "sector": None}))
+    assert values["sector"] == "Energy"
+    assert "missing" not in cache._entries["AAA"]
+
+
+def test_empty_result_negative_cached_but_errors_are_not(tmp_path):
+    cache = FundamentalsCache(tmp_path / "f.json")
+    empty = CountingFetch({})
+    cache.get("AAA", empty)
+    cache.get("AAA", empty)
+    assert empty.calls == 1
+
+    failing = CountingFetch(RuntimeError("429"))
+    cache.get("BBB", failing)
+    cache.get("BBB", failing)
+    assert failing.calls == 2
+
+
+def test_flush_round_trip(tmp_path):
+    path = tmp_path / "f.json"
+    cache = FundamentalsCache(path)
+    cache.get("AAA", CountingFetch(FULL))
+    cache.flush()
+    fetch = CountingFetch(FULL)
+    assert FundamentalsCache(path).get("AAA", fetch)["name"] == "Test A.Ş."
+    assert fetch.calls == 0
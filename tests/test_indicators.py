@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from data_sources import FakeSource
+from indicators import BAR_FIELDS, INDICATOR_COLUMNS, IndicatorState, annotate_frames, calculate_indicators
+
+
+@pytest.fixture(scope="module")
+def frames():
+    """Farklı tarihte başlayan ve boşluklu sentetik geçmişler."""
+    source = FakeSource(seed=3, bars=400)
+    raw = source.fetch_prices(["AAA.IS", "BBB.IS", "CCC.IS", "DDD.IS"])
+    frames = {sym.removesuffix(".IS"): df for sym, df in raw.items()}
+    frames["BBB"] = frames["BBB"].iloc[120:]                          # Geç başlayan
+    frames["CCC"] = frames["CCC"].drop(frames["CCC"].index[200:210])  # Boşluklu
+    return frames
+
+
+def test_panel_matches_calculate_indicators(frames):
+    annotated = annotate_frames(frames)
+    for ticker, df in frames.items():
+        expected = calculate_indicators(df)
+        assert annotated[ticker].index.equals(df.index)
+        np.testing.assert_allclose(annotated[ticker][INDICATOR_COLUMNS].to_numpy(),
+                                   expected[INDICATOR_COLUMNS].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=ticker)
+
+
+def test_annotate_empty():
+    assert annotate_frames({}) == {}
+
+
+def bar(df, i):
+    row = df.iloc[i]
+    return {"Date": df.index[i], **{k: float(row[k]) for k in BAR_FIELDS}}
+
+
+def test_indicator_state_matches_recomputation(frames):
+    df = frames["AAA"]
+    state = IndicatorState.from_frame(df.iloc[:-20])
+    for i in range(len(df) - 20, len(df)):
+        row = state.apply(bar(df, i))
+    expected = calculate_indicators(df).iloc[-1]
+    for column in INDICATOR_COLUMNS:
+        assert row[column] == pytest.approx(expected[column], rel=1e-9), column
+
+
+def test_indicator_state_revise_and_round_trip(frames):
+    df = frames["AAA"]
+    state = IndicatorState.from_frame(df.iloc[:-1])
+    last = bar(df, len(df) - 1)
+    state.apply({**last, "Close": last["Close"] * 1.05})      # Gün içi ara değer
+    state = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+    row = state.apply(last)                                   # Aynı tarih: revise
+
+    expected = calculate_indicators(df).iloc[-1]
+    assert row["RSI"] == pytest.approx(expected["RSI"], rel=1e-9)
+    assert row["EMA200"] == pytest.approx(expected["EMA200"], rel=1e-9)
+    assert state.apply(bar(df, len(df) - 2)) is None          # Eski bar yok sayılır
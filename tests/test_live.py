@@ -0,0 +1,114 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_sources import FakeSource
+from indicators import BAR_FIELDS, calculate_indicators
+from live import BIST_TZ, LiveSession, ReplayBarSource, market_open, record_bars
+from scoring import score_ticker
+
+TICKERS = ["AAA", "BBB"]
+FUNDAMENTALS = {"AAA": {"pb": 1.0, "pe": 8.0, "market_cap": 5e9, "sector": "Energy", "name": "AAA"},
+                "BBB": {"pb": 2.5, "pe": 30.0, "market_cap": 5e8, "sector": "Energy", "name": "BBB"}}
+
+
+def intraday(day: pd.Timestamp, prev_close: float, seed: int, bars: int = 12) -> pd.DataFrame:
+    """day için 10:00'dan başlayan 5 dakikalık barlar (İstanbul saati)."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(day + pd.Timedelta(hours=10), periods=bars, freq="5min", tz=BIST_TZ, name="Date")
+    close = prev_close * np.exp(np.cumsum(rng.normal(0, 0.004, bars)))
+    return pd.DataFrame({"Open": np.r_[prev_close, close[:-1]], "High": close * 1.002,
+                         "Low": close * 0.998, "Close": close,
+                         "Volume": rng.integers(1_000, 50_000, bars).astype(float)}, index=index)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Günlük geçmiş + sonraki iki işlem gününün kaydedilmiş gün içi barları."""
+    raw = FakeSource(seed=11, bars=320).fetch_prices([f"{t}.IS" for t in TICKERS], period="max")
+    daily = {s.removesuffix(".IS"): df.iloc[:-2] for s, df in raw.items()}
+    days = list(next(iter(raw.values())).index[-2:])
+    frames = {}
+    for i, (ticker, df) in enumerate(daily.items()):
+        parts, close = [], df["Close"].iloc[-1]
+        for j, day in enumerate(days):
+            part = intraday(day, close, seed=10 * i + j)
+            parts.append(part)
+            close = part["Close"].iloc[-1]
+        frames[ticker] = pd.concat(parts)
+    # Oluşmakta olan son bar revize edilmiş halde bir kez daha gelir
+    revised = frames["AAA"].iloc[[-1]].assign(Close=lambda d: d["Close"] * 1.01,
+                                               High=lambda d: d["Close"] * 1.02)
+    frames["AAA"] = pd.concat([frames["AAA"], revised])
+    path = tmp_path / "bars.csv"
+    record_bars(frames, path)
+    return daily, frames, path
+
+
+def expected_daily(frame: pd.DataFrame, upto: pd.Timestamp) -> pd.DataFrame:
+    """Gün içi barlardan pandas ile günlük barlar (aynı zaman damgasında son gelen geçerli)."""
+    seen = frame[frame.index <= upto]
+    seen = seen[~seen.index.duplicated(keep="last")]
+    grouped = seen.groupby(seen.index.tz_localize(None).normalize())
+    return pd.DataFrame({"Open": grouped["Open"].first(), "High": grouped["High"].max(),
+                         "Low": grouped["Low"].min(), "Close": grouped["Close"].last(),
+                         "Volume": grouped["Volume"].sum()})
+
+
+def test_replay_matches_full_recomputation(recording):
+    daily, frames, path = recording
+    session = LiveSession.from_frames(daily, FUNDAMENTALS.get)
+    # 12 bar/gün ve step=5: üçüncü yoklama önceki günün son barlarını ve ertesi günü birlikte getirir
+    source = ReplayBarSource.from_csv(path, step=5)
+    times = source._times
+
+    steps = 0
+    while not source.exhausted:
+        upto = pd.Timestamp(times[min(source.position + source.step, len(times)) - 1])
+        changed = session.step(source)
+        steps += 1
+        assert changed == set(TICKERS)
+        for ticker in TICKERS:
+            days = expected_daily(frames[ticker], upto)
+            folded = session.days[ticker].bar()
+            assert folded["Date"] == days.index[-1]
+            for key in BAR_FIELDS:
+                assert folded[key] == pytest.approx(days[key].iloc[-1], rel=1e-12), (ticker, key)
+
+            full = pd.concat([daily[ticker], days])
+            expected = score_ticker(ticker, calculate_indicators(full), FUNDAMENTALS.get)
+            actual = session.results[ticker]
+            assert (actual.score, actual.criteria) == (expected.score, expected.criteria), (ticker, upto)
+            for field in ("last_price", "ema50", "ema200", "macd_hist", "atr"):
+                assert getattr(actual, field) == pytest.approx(getattr(expected, field), rel=1e-9)
+    assert steps == 5                                   # 24 zaman damgası / 5
+    assert session.step(source) == set()                # Kayıt bitti
+
+
+def test_repeated_poll_does_not_rescore(recording):
+    daily, _, path = recording
+    session = LiveSession.from_frames(daily, FUNDAMENTALS.get)
+    bars = ReplayBarSource.from_csv(path, step=3).poll(TICKERS)
+    assert session.apply(bars) == set(TICKERS)
+    assert session.apply(bars) == set()
+
+
+@pytest.mark.parametrize("when, expected", [
+    (datetime(2024, 6, 3, 9, 59), False),      # Pazartesi, açılıştan önce
+    (datetime(2024, 6, 3, 10, 0), True),       # Açılış
+    (datetime(2024, 6, 3, 18, 9, 59), True),   # Kapanış seansı
+    (datetime(2024, 6, 3, 18, 10), False),     # Kapanış
+    (datetime(2024, 6, 7, 12, 0), True),       # Cuma
+    (datetime(2024, 6, 8, 12, 0), False),      # Cumartesi
+    (datetime(2024, 6, 9, 12, 0), False),      # Pazar
+])
+def test_market_open_boundaries(when, expected):
+    assert market_open(when.replace(tzinfo=BIST_TZ)) is expected
+
+
+def test_market_open_converts_timezone():
+    # 07:30 UTC = 10:30 İstanbul
+    assert market_open(pd.Timestamp("2024-06-03 07:30", tz="UTC").to_pydatetime())
+    assert not market_open(pd.Timestamp("2024-06-03 06:59", tz="UTC").to_pydatetime())
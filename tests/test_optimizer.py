@@ -0,0 +1,52 @@
+import types
+
+import pandas as pd
+import pytest
+
+import optimizer
+from backtest import prepare_data
+from data_sources import FakeSource
+from optimizer import FUNDAMENTAL_SPACE, SEARCH_SPACE, grid_configs, grid_size, optimize, random_configs
+
+SMALL_SPACE = {"w_ema_cross": [5, 15], "rsi_low": [35, 45], "w_rsi_band": [5, 15], "rsi_high": [60, 70]}
+
+
+def threshold_runs(configs) -> int:
+    """Ardışık aynı-eşik bloklarının sayısı."""
+    runs, last = 0, None
+    for config in configs:
+        if config.thresholds != last:
+            runs, last = runs + 1, config.thresholds
+    return runs
+
+
+def test_grid_is_lazy_and_grouped_by_thresholds():
+    configs = grid_configs(SMALL_SPACE)
+    assert isinstance(configs, types.GeneratorType)
+    configs = list(configs)
+    assert len(configs) == grid_size(SMALL_SPACE) == 16
+    assert len({(c.w_ema_cross, c.rsi_low, c.w_rsi_band, c.rsi_high) for c in configs}) == 16
+    assert threshold_runs(configs) == 4
+
+    sample = random_configs(SMALL_SPACE, 10, seed=3)
+    assert len(set(sample)) == 10
+    assert threshold_runs(sample) == len({c.thresholds for c in sample})
+
+
+def test_huge_grid_is_refused_before_loading(monkeypatch):
+    assert grid_size({**SEARCH_SPACE, **FUNDAMENTAL_SPACE}) > optimizer.GRID_LIMIT
+    monkeypatch.setattr(optimizer, "load_history", lambda *a: pytest.fail("veri yüklenmemeli"))
+    with pytest.raises(SystemExit):
+        optimizer.main(["--with-fundamentals"])
+
+
+def test_pool_matches_single_process():
+    raw = FakeSource(seed=5, bars=320).fetch_prices(["AAA.IS", "BBB.IS", "CCC.IS"])
+    data = prepare_data({s.removesuffix(".IS"): df for s, df in raw.items()})
+    kwargs = dict(objective="total_return", min_trades=0, chunk_size=3, top_n=2, min_score=0)
+
+    single = optimize(data, grid_configs(SMALL_SPACE), processes=1, **kwargs)
+    pooled = optimize(data, grid_configs(SMALL_SPACE), processes=2, **kwargs)
+
+    assert len(single) == 16
+    pd.testing.assert_frame_equal(single, pooled)
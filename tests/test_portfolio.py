@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import MIN_OBS, RiskModel, SizingConfig, returns_matrix, risk_model, size_positions
+from results import ScanResult
+
+
+def gapped_frames(n_tickers=25, bars=300, seed=1):
+    """Farklı tarihte başlayan ve rastgele boşluklu kapanış serileri."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=bars)
+    market = rng.normal(0, 0.01, bars)
+    frames = {}
+    for i in range(n_tickers):
+        close = pd.Series(10 * np.exp(np.cumsum(market * rng.uniform(0, 2) + rng.normal(0, 0.02, bars))),
+                          index=index)
+        close = close.iloc[rng.integers(0, 220):]
+        close[rng.random(len(close)) < 0.1] = np.nan
+        frames[f"S{i:02d}"] = pd.DataFrame({"Close": close.dropna()})
+    return frames
+
+
+def test_risk_model_matches_pandas_pairwise():
+    frames = gapped_frames()
+    model = risk_model(frames)
+    tickers, returns = returns_matrix(frames)
+    df = pd.DataFrame(returns, columns=tickers)
+
+    expected_corr = df.corr(min_periods=MIN_OBS).to_numpy()
+    expected_cov = df.cov(min_periods=MIN_OBS).to_numpy()
+    np.testing.assert_array_equal(np.isnan(model.corr), np.isnan(expected_corr))
+    np.testing.assert_allclose(model.corr, expected_corr, atol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(model.cov, expected_cov, atol=1e-15, equal_nan=True)
+
+
+def result(ticker, score=80, price=10.0, atr=0.5):
+    return ScanResult(ticker, ticker, "Test", score, 0, price, 50.0, price, price, 0.0, atr, None, None, None)
+
+
+def test_size_positions_skips_correlated_and_uncovered():
+    corr = np.array([[1.0, 0.9, 0.1], [0.9, 1.0, 0.2], [0.1, 0.2, 1.0]])
+    model = RiskModel(["A", "B", "C"], corr * 1e-4, corr)
+    config = SizingConfig(capital=100_000, risk_per_trade=0.01, stop_atr=2.0, max_corr=0.7,
+                          max_weight=1.0, max_positions=2)
+    positions = size_positions([result("A"), result("X"), result("B"), result("C")], model, config)
+
+    assert [(p.ticker, p.skipped is None) for p in positions] == \
+        [("A", True), ("X", False), ("B", False), ("C", True)]
+    a = positions[0]
+    assert a.stop == 9.0 and a.shares == 1000 and a.risk == 1000.0
+    assert positions[1].skipped == "getiri geçmişi yok"
+    assert positions[2].peer == "A"
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_sources import FakeSource
+from price_store import ADJUST_TOLERANCE, PriceStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(tmp_path, refresh_interval=0)    # Her refresh istek atar
+
+
+def assert_same_bars(actual: pd.DataFrame, expected: pd.DataFrame):
+    assert list(actual.index) == list(expected.index)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy())
+
+
+def scaled(df: pd.DataFrame, factor: float) -> pd.DataFrame:
+    """Fiyat kolonları factor ile çarpılmış (geriye dönük düzeltilmiş) geçmiş."""
+    prices = ["Open", "High", "Low", "Close"]
+    return df.assign(**{c: df[c] * factor for c in prices})
+
+
+def test_first_refresh_is_full_then_fresh(tmp_path):
+    source = FakeSource(bars=300)
+    store = PriceStore(tmp_path)
+    assert store.refresh(["AAA"], source) == {"fresh": 0, "delta": 0, "full": 1, "stale": 0}
+    assert_same_bars(store.read("AAA"), source._frame("AAA.IS"))
+
+    calls = source.calls
+    assert store.refresh(["AAA"], source) == {"fresh": 1, "delta": 0, "full": 0, "stale": 0}
+    assert source.calls == calls
+
+
+def test_delta_appends_new_bars(store):
+    source = FakeSource(bars=300)
+    full = source._frame("AAA.IS")
+    store.write("AAA", full.iloc[:-10])
+
+    stats = store.refresh(["AAA"], source)
+
+    assert stats == {"fresh": 0, "delta": 1, "full": 0, "stale": 0}
+    assert_same_bars(store.read("AAA"), full)
+
+
+def test_adjusted_overlap_bar_triggers_full_refetch(store):
+    source = FakeSource(bars=300)
+    full = source._frame("AAA.IS")
+    store.write("AAA", full.iloc[:-10])
+    # Temettü düzeltmesi: sağlayıcı tüm geçmişi tolerans üstünde ölçekledi
+    adjusted = source._frames["AAA.IS"] = scaled(full, 1 - 10 * ADJUST_TOLERANCE)
+
+    stats = store.refresh(["AAA"], source)
+
+    assert stats == {"fresh": 0, "delta": 0, "full": 1, "stale": 0}
+    assert_same_bars(store.read("AAA"), adjusted)
+
+
+def test_change_within_tolerance_is_appended(store):
+    source = FakeSource(bars=300)
+    full = source._frame("AAA.IS")
+    store.write("AAA", full.iloc[:-10])
+    source._frames["AAA.IS"] = scaled(full, 1 + ADJUST_TOLERANCE / 10)
+
+    assert store.refresh(["AAA"], source)["delta"] == 1
+
+
+def test_failed_fetch_keeps_stale_history(store):
+    history = FakeSource(bars=300)._frame("AAA.IS").iloc[:-10]
+    store.write("AAA", history)
+
+    stats = store.refresh(["AAA", "NEW"], FakeSource(error_rate=1.0))
+
+    assert stats == {"fresh": 0, "delta": 0, "full": 0, "stale": 1}
+    assert_same_bars(store.read("AAA"), history)
+    assert store.read("NEW").empty
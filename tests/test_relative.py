@@ -0,0 +1,77 @@
+from statistics import mean, stdev
+
+import pandas as pd
+import pytest
+
+from relative import apply_relative, relative_strength, sector_stats
+from results import Criteria, ScanResult, ScoreConfig
+
+CONFIG = ScoreConfig(relative=True, w_rs=10, min_sector_size=3, sector_pct=0.5, mcap_pct=0.5,
+                     rs_window=2, rs_min=0.6)
+BASE = Criteria.EMA_CROSS | Criteria.MCAP_HIGH
+
+
+def result(ticker, sector, pb, pe, mcap, criteria=BASE):
+    return ScanResult(ticker, ticker, sector, 0, int(criteria), 10.0, 50.0, 9.0, 8.0, 0.1, 0.3, pb, pe, mcap)
+
+
+@pytest.fixture
+def panel():
+    results = [
+        result("AAA", "Banka", 0.5, 4.0, 1e9),
+        result("BBB", "Banka", 1.0, -2.0, 3e9),     # Negatif F/K karşılaştırmaya girmez
+        result("CCC", "Banka", 2.0, 8.0, 2e9),
+        result("DDD", "Enerji", 0.9, 3.0, 5e8, BASE | Criteria.PB_LOW),   # Tek üyeli sektör
+    ]
+    closes = {"AAA": [10, 11, 12], "BBB": [10, 10, 9], "CCC": [10, 12, 15], "DDD": [10, 10]}
+    frames = {t: pd.DataFrame({"Close": c}, index=pd.bdate_range("2024-01-01", periods=len(c)))
+              for t, c in closes.items()}
+    return results, frames
+
+
+def test_relative_strength_ranks_window_returns(panel):
+    _, frames = panel
+    frames = {**frames, "BOS": pd.DataFrame({"Close": []}, dtype="f8")}
+    rs = relative_strength(frames, ["AAA", "BOS", "BBB", "CCC", "DDD", "YOK"], window=2)
+    # Getiriler: AAA 12/10-1 = 0.2, BBB -0.1, CCC 0.5; DDD, BOS ve YOK'un geçmişi yetersiz
+    nan = float("nan")
+    assert rs.to_dict() == pytest.approx({"AAA": 2 / 3, "BOS": nan, "BBB": 1 / 3, "CCC": 1.0,
+                                          "DDD": nan, "YOK": nan}, nan_ok=True)
+
+
+def test_sector_stats_by_hand(panel):
+    results, _ = panel
+    stats = sector_stats(results)
+
+    assert stats.loc[["AAA", "BBB", "CCC"], "pb_pct"].tolist() == pytest.approx([1 / 3, 2 / 3, 1.0])
+    assert stats.loc[["AAA", "CCC"], "pe_pct"].tolist() == pytest.approx([0.5, 1.0])
+    assert pd.isna(stats.loc["BBB", "pe_pct"])
+    assert stats.loc[["AAA", "BBB", "CCC"], "market_cap_pct"].tolist() == pytest.approx([1 / 3, 1.0, 2 / 3])
+    pb = [0.5, 1.0, 2.0]
+    assert stats.loc["CCC", "pb_z"] == pytest.approx((2.0 - mean(pb)) / stdev(pb))
+    assert stats.loc["AAA", "pe_z"] == pytest.approx((4.0 - 6.0) / stdev([4.0, 8.0]))
+
+    # Tek üyeli sektör: yüzdelik 1, z-skoru tanımsız
+    assert stats.loc["DDD", ["pb_pct", "pe_pct", "market_cap_pct"]].tolist() == [1.0, 1.0, 1.0]
+    assert stats.loc["DDD", ["pb_z", "pe_z", "market_cap_z"]].isna().all()
+    assert stats["sector_size"].tolist() == [3, 3, 3, 1]
+
+
+def test_apply_relative_rescores_by_sector_position(panel):
+    results, frames = panel
+    rescored = {r.ticker: r for r in apply_relative(results, frames, CONFIG)}
+    expected = {
+        # PD/DD ve F/K sektörün ucuz yarısında, piyasa değeri alt yarıda, güçlü
+        "AAA": Criteria.EMA_CROSS | Criteria.PB_LOW | Criteria.PE_LOW | Criteria.RS_STRONG,
+        "BBB": Criteria.EMA_CROSS | Criteria.MCAP_HIGH,
+        "CCC": Criteria.EMA_CROSS | Criteria.MCAP_HIGH | Criteria.RS_STRONG,
+        # Küçük sektörde mutlak sonuç korunur; göreli güç geçmişi yok
+        "DDD": BASE | Criteria.PB_LOW,
+    }
+    for ticker, criteria in expected.items():
+        res = rescored[ticker]
+        assert Criteria(res.criteria) == criteria, ticker
+        assert res.score == sum(pts for c, pts in CONFIG.points.items() if c in criteria), ticker
+    assert rescored["AAA"].pb_pct == 0.333 and rescored["AAA"].rs_rank == 0.667
+    assert rescored["DDD"].pb_z is None and rescored["DDD"].rs_rank is None
+    assert [r.ticker for r in apply_relative(results, frames, CONFIG)] == ["AAA", "BBB", "CCC", "DDD"]
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import scan_cli
+from metrics import ScanMetrics
+from results import ScanResult
+from snapshot import Snapshot
+
+
+def result(ticker, score):
+    return ScanResult(ticker, ticker, "Banka", score, 0, 10.0, 50.0, 9.0, 8.0, 0.1, 0.3, 1.0, 5.0, 1e10)
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIST_CACHE_DIR", str(tmp_path / "cache"))
+    snap = Snapshot(created_at=1_700_000_000.0, universe=["AAA", "BBB", "CCC"],
+                    results=[result("AAA", 60), result("BBB", 80), result("CCC", 40)])
+    snap.save()
+    metrics = ScanMetrics()
+    metrics.count("prefiltered_out", 4, reason="turnover")
+    metrics.count("prefiltered_out", 1, reason="mcap")
+    snap.save_metrics(metrics)
+    return snap
+
+
+def run(tmp_path, *args) -> dict:
+    out = tmp_path / "out.json"
+    assert scan_cli.main(["--from-snapshot", "--min-score", "0", "--top-n", "10", "-o", str(out), *args]) == 0
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+def test_from_snapshot_uses_snapshot_universe_without_prefilter(snapshot, tmp_path, monkeypatch):
+    monkeypatch.setattr(scan_cli, "prefilter", lambda *a, **k: pytest.fail("ön eleme çalışmamalı"))
+    data = run(tmp_path)
+    assert [r["ticker"] for r in data["results"]] == ["BBB", "AAA", "CCC"]
+    assert data["prefiltered_out"] == 5
+
+
+def test_from_snapshot_intersects_universe_and_limit(snapshot, tmp_path):
+    assert [r["ticker"] for r in run(tmp_path, "--universe", "CCC,AAA,ZZZ")["results"]] == ["AAA", "CCC"]
+    assert [r["ticker"] for r in run(tmp_path, "--limit", "2")["results"]] == ["BBB", "AAA"]
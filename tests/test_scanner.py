@@ -0,0 +1,36 @@
+import scanner
+from data_sources import FakeSource
+from metrics import ScanMetrics
+from scanner import run_scan
+
+
+def test_run_scan_times_out_slow_ticker_and_keeps_input_order(monkeypatch):
+    monkeypatch.setattr(scanner, "POLL_INTERVAL", 0.01)
+    tickers = ["A", "B", "SLOW", "C", "D"]
+    # Önce verilen hisseler daha geç biter; bitiş sırası giriş sırasının tersidir
+    sources = {t: FakeSource(latency=0.02 * (len(tickers) - i), bars=5) for i, t in enumerate(tickers)}
+    sources["SLOW"] = FakeSource(latency=1.0, bars=5)
+
+    def score(ticker):
+        frame = sources[ticker].fetch_prices([ticker], period="max")[ticker]
+        return ticker, len(frame)
+
+    metrics = ScanMetrics()
+    progress = []
+    results = run_scan(tickers, score, max_workers=len(tickers), timeout=0.3, metrics=metrics,
+                       on_progress=lambda done, total, t: progress.append(t))
+
+    assert results == [("A", 5), ("B", 5), ("C", 5), ("D", 5)]
+    assert metrics.counter("timeouts") == 1
+    assert progress[-1] == "SLOW" and len(progress) == len(tickers)
+
+
+def test_run_scan_counts_failures_and_drops_none():
+    def score(ticker):
+        if ticker == "ERR":
+            raise ValueError(ticker)
+        return None if ticker == "NONE" else ticker
+
+    metrics = ScanMetrics()
+    assert run_scan(["B", "ERR", "NONE", "A"], score, max_workers=2, metrics=metrics) == ["B", "A"]
+    assert metrics.counter("failures", stage="score") == 1
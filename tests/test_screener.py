@@ -0,0 +1,117 @@
+import operator
+import random
+
+import pytest
+
+from results import Criteria, ScanResult
+from screener import Condition, Field, QueryError, ScreenTable, parse_query
+
+SECTORS = ["Financial Services", "Energy", "Industrials", "Technology"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("rsi in 40..50",            [Condition("rsi", "in", (40.0, 50.0))]),
+    ("mcap in 1.5b .. 2e10",     [Condition("market_cap", "in", (1.5e9, 2e10))]),
+    ("price > ema200",           [Condition("last_price", ">", Field("ema200"))]),
+    ("pb<=pe, fiyat != 10",      [Condition("pb", "<=", Field("pe")), Condition("last_price", "!=", 10.0)]),
+    ("sector = Financial Services", [Condition("sector", "==", "Financial Services")]),
+    ("ticker != 'AKBNK'",        [Condition("ticker", "!=", "AKBNK")]),
+    ("sector in Energy | Industrials", [Condition("sector", "in", ("Energy", "Industrials"))]),
+    ("EMA_CROSS, !macd_turn, not PB_LOW", [Condition("EMA_CROSS", "flag", True),
+                                           Condition("MACD_TURN", "flag", False),
+                                           Condition("PB_LOW", "flag", False)]),
+    (" , ",                      []),
+])
+def test_parse_query(text, expected):
+    assert parse_query(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "volume > 5",           # Bilinmeyen alan
+    "rsi > abc",            # Sayı değil, alan da değil
+    "sector < Energy",      # Metin alanında sıralama
+    "rsi ~ 40",             # Operatör yok
+    "rsi in 40..x",         # Aralık ucu sayı değil
+    "price in 1|2",         # Sayısal alanda küme
+    "UNKNOWN_FLAG",
+])
+def test_parse_query_errors(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+
+def make_results(n: int = 60, seed: int = 1) -> list[ScanResult]:
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        price = round(rng.uniform(5, 50), 1)
+        results.append(ScanResult(
+            ticker=f"T{i:02d}", name=f"Şirket {i}", sector=rng.choice(SECTORS),
+            score=rng.choice([20, 40, 55, 55, 70, 85]), criteria=rng.getrandbits(9),
+            last_price=price, rsi=round(rng.uniform(20, 80)), ema50=round(price * rng.uniform(0.9, 1.1), 1),
+            ema200=round(price * rng.uniform(0.85, 1.15), 1), macd_hist=rng.uniform(-1, 1),
+            atr=rng.uniform(0.1, 2), pb=rng.choice([None, 0.5, 1.0, 1.5, 3.0]),
+            pe=rng.choice([None, 4.0, 8.0, 15.0]), market_cap=rng.choice([None, 5e8, 2e9, 1e10])))
+    return results
+
+
+OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+       "==": operator.eq, "!=": operator.ne}
+
+
+def matches(r: ScanResult, cond: Condition) -> bool:
+    """Koşulun düz Python karşılığı; None (NaN) sayısal karşılaştırmaları yalnızca != sağlar."""
+    if cond.op == "flag":
+        return bool(r.criteria & Criteria[cond.field]) == cond.value
+    left = getattr(r, cond.field)
+    if cond.op == "in":
+        if isinstance(cond.value[0], str):
+            return left in cond.value
+        return left is not None and cond.value[0] <= left <= cond.value[1]
+    right = getattr(r, cond.value.name) if isinstance(cond.value, Field) else cond.value
+    if left is None or right is None:
+        return cond.op == "!="
+    return OPS[cond.op](left, right)
+
+
+def reference(results, text, tickers=None, sort_by="score", descending=True, limit=None):
+    conditions = parse_query(text)
+    rows = [r for r in results if all(matches(r, c) for c in conditions)
+            and (tickers is None or r.ticker in tickers)]
+    present = [r for r in rows if getattr(r, sort_by) is not None]
+    present.sort(key=lambda r: getattr(r, sort_by), reverse=descending)
+    return (present + [r for r in rows if getattr(r, sort_by) is None])[:limit]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "rsi in 40..60",
+    "last_price > ema200, pb < 1.5",
+    "pb <= 1, pe >= 8, mcap > 1b",
+    "pb != 1",
+    "price >= ema50, ema50 != ema200",
+    "score == 55, sector = Energy",
+    "sector in Energy | Technology, !MACD_TURN",
+    "sector != Energy, EMA_CROSS, RSI_BAND",
+    "ticker = T07",
+])
+@pytest.mark.parametrize("sort_by, descending", [("score", True), ("pb", False), ("pe", True),
+                                                 ("sector", True), ("ticker", False)])
+def test_query_matches_python_filter(text, sort_by, descending):
+    results = make_results()
+    table = ScreenTable(results)
+    actual = table.query(text, sort_by=sort_by, descending=descending)
+    assert actual == reference(results, text, sort_by=sort_by, descending=descending)
+
+
+def test_query_universe_subset_and_limit():
+    results = make_results()
+    tickers = [f"T{i:02d}" for i in range(0, 60, 3)] + ["YOK"]
+    actual = ScreenTable(results).query("rsi > 35", tickers=tickers, limit=5)
+    assert actual == reference(results, "rsi > 35", tickers=set(tickers), limit=5)
+
+
+def test_bitmap_values():
+    table = ScreenTable(make_results())
+    assert table.values("sector") == sorted(SECTORS)
+    assert ScreenTable([]).query("rsi > 10") == []
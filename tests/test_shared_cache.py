@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from data_sources import FakeSource
+from metrics import ScanMetrics
+from price_store import PriceStore
+from shared_cache import CacheBackend, DirectoryBackend, SharedCache, SQLiteBackend, refresh_store
+
+
+@pytest.fixture(params=["dir", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "dir":
+        return DirectoryBackend(tmp_path / "cache")
+    return SQLiteBackend(tmp_path / "cache.db")
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoUnlock(CacheBackend):
+        def get(self, key): ...
+        def set(self, key, value, ttl=None): ...
+        def delete(self, key): ...
+        def try_lock(self, key, ttl): ...
+
+    with pytest.raises(TypeError):
+        NoUnlock()
+
+
+def test_single_flight_coalesces_concurrent_loads(backend):
+    cache = SharedCache(backend)
+    calls = []
+    metrics = ScanMetrics()
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader, metrics=metrics)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 42}] * 8
+    assert metrics.counter("cache_requests", result="coalesced") == 7
+    assert cache.get_or_load("k", loader) == {"value": 42} and len(calls) == 1
+
+
+def test_keep_filters_what_is_shared(backend):
+    cache = SharedCache(backend)
+    assert cache.get_or_load("empty", dict, keep=bool) == {}
+    assert backend.get("empty") is None
+
+
+def test_lock_is_exclusive_and_released(backend):
+    token = backend.try_lock("k", ttl=60)
+    assert token is not None
+    assert backend.try_lock("k", ttl=60) is None
+    backend.unlock("k", token)
+    assert backend.try_lock("k", ttl=60) is not None
+
+
+def test_directory_stale_lock_is_broken_but_fresh_lock_is_kept(tmp_path):
+    backend = DirectoryBackend(tmp_path)
+    stale = backend.try_lock("k", ttl=60)
+    path = backend.path("k").with_suffix(".lock")
+    os.utime(path, (time.time() - 120, time.time() - 120))
+
+    fresh = backend.try_lock("k", ttl=60)
+    assert fresh is not None and fresh != stale
+    # Eski kilidi bayat görmüş ikinci süreç geç kalırsa taze kilidi kaldırmamalı
+    backend._remove_lock(path, stale)
+    assert path.read_text() == fresh
+    assert backend.try_lock("k", ttl=60) is None
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:3],                      # Başlık kesik
+    lambda data: data[:-4],                     # Değer kesik
+    lambda data: data + b"artik",               # Sonuna fazladan yazılmış
+])
+def test_directory_corrupt_entry_is_a_miss_and_removed(tmp_path, damage):
+    backend = DirectoryBackend(tmp_path)
+    cache = SharedCache(backend)
+    cache.set("k", {"value": 1})
+    path = backend.path("k")
+    path.write_bytes(damage(path.read_bytes()))
+
+    assert backend.get("k") is None
+    assert not path.exists()
+    assert cache.get_or_load("k", lambda: {"value": 2}) == {"value": 2}
+    assert cache.get("k") == {"value": 2}
+
+
+def test_refresh_store_downloads_once_across_replicas(tmp_path):
+    cache = SharedCache(DirectoryBackend(tmp_path / "shared"))
+    tickers = ["AAA", "BBB", "CCC"]
+    first, second = FakeSource(bars=200), FakeSource(bars=200)
+
+    stats = refresh_store(cache, PriceStore(tmp_path / "a"), tickers, first, chunk_size=50)
+    assert stats["full"] == 3 and first.calls == 1
+
+    replica = PriceStore(tmp_path / "b")
+    stats = refresh_store(cache, replica, tickers, second, chunk_size=50)
+    assert stats["shared"] == 3 and second.calls == 0
+    np.testing.assert_allclose(replica.read("AAA")["Close"], PriceStore(tmp_path / "a").read("AAA")["Close"])
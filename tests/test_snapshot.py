@@ -0,0 +1,40 @@
+from dataclasses import asdict
+
+import snapshot
+from results import ScanResult, ScoreConfig
+from snapshot import Snapshot, latest_snapshot_path, load_snapshot
+
+
+def result(ticker, score, pb=None):
+    return ScanResult(ticker, f"{ticker} A.S.", "Banka", score, 0b1011, 12.5, 55.0, 12.0, 11.0,
+                      0.1, 0.4, pb, 6.5, 1e10, pb_pct=0.25, rs_rank=0.8)
+
+
+def test_save_load_round_trip(tmp_path):
+    config = ScoreConfig(w_pb=20, pb_max=1.2, relative=True)
+    snap = Snapshot(created_at=1_700_000_000.0, universe=["AAA", "BBB", "CCC"],
+                    results=[result("AAA", 80, pb=0.9), result("BBB", 55)], config=asdict(config))
+
+    loaded = load_snapshot(snap.save(tmp_path))
+
+    assert loaded.universe == snap.universe
+    assert loaded.results == snap.results
+    assert loaded.score_config == config
+    assert loaded.id == snap.id
+
+
+def test_latest_snapshot_path_and_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "KEEP_SNAPSHOTS", 2)
+    assert latest_snapshot_path(tmp_path) is None
+    # Kayıt sırası oluşturulma sırasından farklı
+    for created_at in (1_700_000_200.0, 1_700_000_000.0, 1_700_000_100.0):
+        Snapshot(created_at=created_at, universe=[]).save(tmp_path)
+
+    assert load_snapshot(latest_snapshot_path(tmp_path)).created_at == 1_700_000_200.0
+    assert len(list(tmp_path.glob("snapshot-*.json"))) == 2
+
+
+def test_load_rejects_other_versions(tmp_path):
+    snap = Snapshot(created_at=1_700_000_000.0, universe=[], version=snapshot.SNAPSHOT_VERSION + 1)
+    assert load_snapshot(snap.save(tmp_path)) is None
+    assert load_snapshot(tmp_path / "missing.json") is None
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from metrics import ScanMetrics
+from price_store import PriceStore
+from universe import Liquidity, prefilter, rank_by_liquidity
+
+
+class StubFundamentals:
+    def __init__(self, mcaps):
+        self.mcaps = mcaps
+
+    def peek(self, ticker, max_age=None):
+        return {"market_cap": self.mcaps[ticker]} if ticker in self.mcaps else None
+
+
+def write_bars(store, ticker, turnover, end):
+    index = pd.bdate_range(end=end, periods=30)
+    store.write(ticker, pd.DataFrame({"Open": 10.0, "High": 10.0, "Low": 10.0, "Close": 10.0,
+                                      "Volume": turnover / 10}, index=index))
+
+
+def test_prefilter_ranks_drops_and_counts(tmp_path):
+    store = PriceStore(tmp_path)
+    today = pd.Timestamp.today().normalize()
+    write_bars(store, "BIG", 5e7, today)
+    write_bars(store, "MID", 1e7, today)
+    write_bars(store, "THIN", 1e5, today)
+    write_bars(store, "SMALL", 2e7, today)
+    fundamentals = StubFundamentals({"BIG": 1e10, "MID": 1e9, "THIN": 1e9, "SMALL": 1e6})
+    metrics = ScanMetrics()
+
+    selected = prefilter(["THIN", "MID", "NEW", "SMALL", "BIG"], store, fundamentals,
+                         min_turnover=5e6, min_mcap=2.5e8, metrics=metrics)
+
+    assert selected == ["BIG", "MID", "NEW"]        # Verisi olmayan NEW elenmez, sona eklenir
+    assert metrics.counter("prefiltered_out", reason="turnover") == 1
+    assert metrics.counter("prefiltered_out", reason="mcap") == 1
+    assert metrics.counter("prefilter_unknown") == 1
+
+
+def test_stale_turnover_does_not_drop(tmp_path):
+    store = PriceStore(tmp_path)
+    write_bars(store, "OLD", 1e5, pd.Timestamp.today().normalize() - pd.Timedelta(days=30))
+    fundamentals = StubFundamentals({})
+
+    assert prefilter(["OLD"], store, fundamentals, min_turnover=5e6) == ["OLD"]
+    assert prefilter(["OLD"], store, fundamentals, min_turnover=5e6, max_age=None) == []
+
+
+def test_rank_by_liquidity_keeps_unknown_order():
+    rows = [Liquidity("A", None, None), Liquidity("B", 1.0, None), Liquidity("C", None, None),
+            Liquidity("D", 3.0, None)]
+    assert [r.ticker for r in rank_by_liquidity(rows)] == ["D", "B", "A", "C"]
@@ -0,0 +1,139 @@
+"""
+Hisse evreni - endeks üyelikleri sürümlü yerel dosyadan (data/index_membership.json) okunur.
+Tam taramadan önce ucuz bir ön eleme yapılır: diskteki fiyat deposundan ortalama işlem hacmi,
+temel veri önbelleğinden piyasa değeri okunur (ağ isteği yok) ve likit olmayan hisseler
+indikatör/temel veri işine girmeden elenir. Önbellekte verisi olmayan ya da verisi
+MAX_INPUT_AGE'den eski hisseler elenmez: elenen hissenin verisi taranmadığı için
+yenilenmez, böylece en geç bu süre sonra yeniden taranıp güncel veriyle değerlendirilir.
+Modül import edildiğinde yalnızca standart kütüphane yüklenir.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from metrics import NULL_METRICS
+
+MEMBERSHIP_FILE    = Path(__file__).resolve().parent / "data" / "index_membership.json"
+MEMBERSHIP_VERSION = 1
+DEFAULT_INDEX      = "SWING"
+
+MIN_TURNOVER  = 5_000_000     # 20 günlük ortalama işlem hacmi alt sınırı (TL)
+MIN_MCAP      = 250_000_000   # Piyasa değeri alt sınırı (TL)
+TURNOVER_BARS = 20
+MAX_INPUT_AGE = 7 * 86400     # Bundan eski hacim/piyasa değeri ön elemede bilinmiyor sayılır (sn)
+
+
+@dataclass(frozen=True)
+class Membership:
+    version: int
+    as_of:   str                          # Üyeliklerin geçerli olduğu tarih (YYYY-AA-GG)
+    indices: dict[str, tuple[str, ...]]
+
+    def tickers(self, index: str = DEFAULT_INDEX) -> list[str]:
+        if index not in self.indices:
+            raise KeyError(f"Bilinmeyen endeks: {index} (mevcut: {', '.join(sorted(self.indices))})")
+        return list(self.indices[index])
+
+
+def membership_path() -> Path:
+    """BIST_UNIVERSE_FILE tanımlıysa o dosya, değilse depodaki üyelik dosyası."""
+    return Path(os.environ.get("BIST_UNIVERSE_FILE", MEMBERSHIP_FILE))
+
+
+@lru_cache(maxsize=4)
+def _load_membership(path: str, mtime: float) -> Membership:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != MEMBERSHIP_VERSION:
+        raise ValueError(f"Desteklenmeyen üyelik dosyası sürümü: {data.get('version')}")
+    return Membership(
+        version = data["version"],
+        as_of   = data["as_of"],
+        indices = {name: tuple(t.strip().upper() for t in tickers)
+                   for name, tickers in data["indices"].items()},
+    )
+
+
+def load_membership(path: str | os.PathLike | None = None) -> Membership:
+    """Üyelik dosyasını okur (dosya değişmedikçe yeniden ayrıştırılmaz)."""
+    path = Path(path) if path else membership_path()
+    return _load_membership(str(path), path.stat().st_mtime)
+
+
+def index_tickers(index: str = DEFAULT_INDEX) -> list[str]:
+    return load_membership().tickers(index)
+
+
+# Eski import yolu: tüm modüller varsayılan endeksi bu adla kullanır
+BIST100_TICKERS = index_tickers()
+
+
+# ─────────────────────────────────────────────
+# LİKİDİTE ÖN ELEMESİ
+# ─────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Liquidity:
+    ticker:     str
+    turnover:   float | None   # TL/gün, fiyat deposundan
+    market_cap: float | None   # TL, temel veri önbelleğinden
+
+    def reason(self, min_turnover: float, min_mcap: float) -> str | None:
+        """Elenme nedeni ("turnover" / "mcap"); geçiyorsa None."""
+        if self.turnover is not None and self.turnover < min_turnover:
+            return "turnover"
+        if self.market_cap is not None and self.market_cap < min_mcap:
+            return "mcap"
+        return None
+
+    def passes(self, min_turnover: float, min_mcap: float) -> bool:
+        """Bilinmeyen değerler elemez; veri önbelleğe girince bir sonraki taramada değerlendirilir."""
+        return self.reason(min_turnover, min_mcap) is None
+
+
+def liquidity(tickers: list[str], store=None, fundamentals=None,
+              max_age: float | None = MAX_INPUT_AGE) -> list[Liquidity]:
+    """Önbelleklerden hisse başına likidite bilgisi (istek atmaz); max_age'den eski veri None."""
+    if store is None:
+        from price_store import PriceStore
+        store = PriceStore()
+    if fundamentals is None:
+        from fundamentals import FundamentalsCache
+        fundamentals = FundamentalsCache()
+    rows = []
+    for t in tickers:
+        cached = fundamentals.peek(t, max_age)
+        rows.append(Liquidity(t, store.average_turnover(t, TURNOVER_BARS, max_age),
+                              cached.get("market_cap") if cached else None))
+    return rows
+
+
+def rank_by_liquidity(rows: list[Liquidity]) -> list[Liquidity]:
+    """Hacme göre azalan; hacmi bilinmeyenler sonda, kendi sıralarıyla."""
+    known = sorted((r for r in rows if r.turnover is not None), key=lambda r: r.turnover, reverse=True)
+    return known + [r for r in rows if r.turnover is None]
+
+
+def prefilter(tickers: list[str], store=None, fundamentals=None,
+              min_turnover: float = MIN_TURNOVER, min_mcap: float = MIN_MCAP,
+              limit: int | None = None, max_age: float | None = MAX_INPUT_AGE,
+              metrics=NULL_METRICS) -> list[str]:
+    """
+    Tarama adayları: eşikleri geçen hisseler likiditeye göre sıralı, en fazla limit tane.
+    Tam taramadan önce çağrılır; maliyeti hisse başına bir mmap okuması ve bir sözlük erişimidir.
+    Elenenler "prefiltered_out" (reason etiketiyle), verisi bilinmediği için elenmeyenler
+    "prefilter_unknown" olarak sayılır.
+    """
+    ranked = rank_by_liquidity(liquidity(tickers, store, fundamentals, max_age))
+    selected = []
+    for r in ranked:
+        reason = r.reason(min_turnover, min_mcap)
+        if reason is not None:
+            metrics.count("prefiltered_out", reason=reason)
+            continue
+        if r.turnover is None or r.market_cap is None:
+            metrics.count("prefilter_unknown")
+        selected.append(r.ticker)
+    return selected[:limit] if limit else selected